@@ -0,0 +1,63 @@
+"""
+Alembic environment.
+Uses the app's engine and model metadata, so migrations run against
+DATABASE_URL with the same connection settings as the API.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.config.database import Base, DATABASE_URL, engine
+import app.models  # noqa: F401  (register every model on Base.metadata)
+
+config = context.config
+
+# In-process callers (app/config/migrations.py) keep the app's logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running it (alembic upgrade head --sql)."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on a connection from the app's primary engine."""
+    # run_migrations() can hand over its own connection (tests, other engines)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_on_connection(connection)
+        return
+
+    with engine.connect() as connection:
+        _run_on_connection(connection)
+
+
+def _run_on_connection(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite can't ALTER most constraints; batch mode recreates tables
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,197 @@
+"""initial schema
+
+Every table in app/models as it stood before migrations were introduced.
+
+Databases created by the old create_all() startup are adopted in place:
+existing tables are kept and only missing columns and indexes are added
+(as nullable, since old rows have no value), so `alembic upgrade head`
+works on both empty and pre-Alembic databases.
+
+Revision ID: 3f9e2a7c1b04
+Revises:
+Create Date: 2026-10-19 08:00:00.000000
+
+"""
+import logging
+from typing import List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9e2a7c1b04'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _tables() -> List[Tuple[str, list, list]]:
+    """(table name, columns and constraints, [(index name, columns, unique)]) in dependency order."""
+    return [
+        ('users', [
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('password_hash', sa.String(), nullable=False),
+            sa.Column('subscription_tier', sa.Enum('FREE', 'PREMIUM', 'PRO', name='subscriptiontier'), nullable=False),
+            sa.Column('subscription_expires', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        ], [
+            ('ix_users_email', ['email'], True),
+        ]),
+        ('user_profiles', [
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('device_id', sa.String(length=255), nullable=False),
+            sa.Column('user_id', sa.String(), nullable=True),
+            sa.Column('first_name', sa.String(length=100), nullable=False),
+            sa.Column('date_of_birth', sa.String(), nullable=False),
+            sa.Column('life_seal', sa.Integer(), nullable=True),
+            sa.Column('life_stage', sa.String(length=20), nullable=True),
+            sa.Column('spiritual_preference', sa.String(length=30), nullable=True),
+            sa.Column('communication_style', sa.String(length=20), nullable=True),
+            sa.Column('interests', sa.JSON(), nullable=True),
+            sa.Column('notification_style', sa.String(length=20), nullable=True),
+            sa.Column('readings_count', sa.Integer(), nullable=True),
+            sa.Column('last_reading_date', sa.DateTime(), nullable=True),
+            sa.Column('pdf_exports_count', sa.Integer(), nullable=True),
+            sa.Column('pdf_exports_month', sa.String(length=7), nullable=True),
+            sa.Column('has_completed_onboarding', sa.Boolean(), nullable=True),
+            sa.Column('has_seen_dashboard_intro', sa.Boolean(), nullable=True),
+            sa.Column('calculations', sa.JSON(), nullable=True),
+            sa.Column('calculations_version', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        ], [
+            ('ix_user_profiles_device_id', ['device_id'], False),
+            ('ix_user_profiles_life_seal', ['life_seal'], False),
+            ('ix_user_profiles_user_id', ['user_id'], True),
+        ]),
+        ('daily_precompute', [
+            sa.Column('profile_id', sa.String(), nullable=False),
+            sa.Column('target_date', sa.Date(), nullable=False),
+            sa.Column('power_number', sa.SmallInteger(), nullable=False),
+            sa.Column('is_blessed_day', sa.Boolean(), nullable=False),
+            sa.Column('personal_year', sa.SmallInteger(), nullable=False),
+            sa.Column('personal_month', sa.SmallInteger(), nullable=False),
+            sa.Column('computed_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['profile_id'], ['user_profiles.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('profile_id', 'target_date'),
+        ], [
+            ('ix_daily_precompute_target_date', ['target_date'], False),
+        ]),
+        ('devices', [
+            sa.Column('device_id', sa.String(length=255), nullable=False),
+            sa.Column('user_id', sa.String(), nullable=True),
+            sa.Column('fcm_token', sa.String(length=500), nullable=False),
+            sa.Column('device_type', sa.String(length=50), nullable=False),
+            sa.Column('active', sa.Boolean(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('last_active', sa.DateTime(), nullable=False),
+            sa.Column('topics', sa.String(length=500), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+            sa.PrimaryKeyConstraint('device_id'),
+        ], [
+            ('ix_devices_device_id', ['device_id'], False),
+            ('ix_devices_fcm_token', ['fcm_token'], True),
+            ('ix_devices_user_id', ['user_id'], False),
+        ]),
+        ('readings', [
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('full_data', sa.JSON(), nullable=False),
+            sa.Column('life_seal', sa.String(), nullable=True),
+            sa.Column('person_name', sa.String(), nullable=True),
+            sa.Column('birth_date', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        ], []),
+        ('subscription_history', [
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('tier', sa.String(), nullable=False),
+            sa.Column('status', sa.Enum('ACTIVE', 'EXPIRED', 'CANCELLED', 'REFUNDED', 'TRIAL', name='subscriptionstatus'), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('cancelled_at', sa.DateTime(), nullable=True),
+            sa.Column('platform', sa.String(), nullable=False),
+            sa.Column('transaction_id', sa.String(), nullable=True),
+            sa.Column('original_transaction_id', sa.String(), nullable=True),
+            sa.Column('price_usd', sa.String(), nullable=True),
+            sa.Column('currency', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('transaction_id'),
+        ], []),
+        ('notification_preferences', [
+            sa.Column('device_id', sa.String(length=255), nullable=False),
+            sa.Column('blessed_day_alerts', sa.Boolean(), nullable=False),
+            sa.Column('daily_insights', sa.Boolean(), nullable=False),
+            sa.Column('lunar_phase_alerts', sa.Boolean(), nullable=False),
+            sa.Column('motivational_quotes', sa.Boolean(), nullable=False),
+            sa.Column('quiet_hours_enabled', sa.Boolean(), nullable=False),
+            sa.Column('quiet_hours_start', sa.String(length=5), nullable=False),
+            sa.Column('quiet_hours_end', sa.String(length=5), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('device_id'),
+        ], []),
+        ('share_logs', [
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('device_id', sa.String(length=255), nullable=False),
+            sa.Column('life_seal_number', sa.Integer(), nullable=False),
+            sa.Column('platform', sa.String(length=50), nullable=False),
+            sa.Column('share_text', sa.String(length=500), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        ], [
+            ('ix_share_logs_created_at', ['created_at'], False),
+            ('ix_share_logs_device_id', ['device_id'], False),
+            ('ix_share_logs_id', ['id'], False),
+            ('ix_share_logs_life_seal_number', ['life_seal_number'], False),
+            ('ix_share_logs_platform', ['platform'], False),
+        ]),
+    ]
+
+
+def _adopt_existing_table(inspector, table: str, elements: list, indexes: list) -> None:
+    """Bring a create_all-era table up to this revision without touching its data."""
+    existing_columns = {column["name"] for column in inspector.get_columns(table)}
+    for element in elements:
+        if isinstance(element, sa.Column) and element.name not in existing_columns:
+            logger.warning(f"Adding missing column {table}.{element.name}")
+            op.add_column(table, sa.Column(element.name, element.type, nullable=True))
+            existing_columns.add(element.name)
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes(table)}
+    for name, columns, unique in indexes:
+        if name not in existing_indexes and set(columns) <= existing_columns:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, elements, indexes in _tables():
+        if inspector.has_table(table):
+            _adopt_existing_table(inspector, table, elements, indexes)
+            continue
+        op.create_table(table, *elements)
+        for name, columns, unique in indexes:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for table, _elements, indexes in reversed(_tables()):
+        for name, _columns, _unique in indexes:
+            op.drop_index(name, table_name=table)
+        op.drop_table(table)
@@ -0,0 +1,87 @@
+"""hot query indexes
+
+Composite indexes for the quota check, share stats and subscription history,
+a partial index over active devices, and removal of the single-column share
+log indexes the composites now cover.
+
+Idempotent: databases created by create_all after the model change already
+have the new indexes.
+
+Revision ID: b7c1e2d4f5a6
+Revises: 3f9e2a7c1b04
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1e2d4f5a6'
+down_revision: Union[str, None] = '3f9e2a7c1b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+NEW_INDEXES = [
+    ("ix_readings_user_id_created_at", "readings", ["user_id", "created_at"], {}),
+    ("ix_share_logs_created_at_life_seal", "share_logs", ["created_at", "life_seal_number"], {}),
+    ("ix_subscription_history_user_id_created_at", "subscription_history", ["user_id", "created_at"], {}),
+    (
+        "ix_devices_active_user_id",
+        "devices",
+        ["user_id"],
+        {"postgresql_where": sa.text("active"), "sqlite_where": sa.text("active = 1")},
+    ),
+]
+
+# Covered by the composites above (and the life seal one misleads the planner)
+REDUNDANT_INDEXES = [
+    ("ix_share_logs_created_at", "share_logs", ["created_at"]),
+    ("ix_share_logs_life_seal_number", "share_logs", ["life_seal_number"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _has_columns(table: str, columns: list) -> bool:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+    return set(columns) <= existing
+
+
+def upgrade() -> None:
+    for name, table, columns, kwargs in NEW_INDEXES:
+        existing = _existing_indexes(table)
+        if existing is None or name in existing:
+            continue
+        if not _has_columns(table, columns):
+            logger.warning(f"Skipping {name}: {table} is missing one of {columns}")
+            continue
+        op.create_index(name, table, columns, **kwargs)
+
+    for name, table, _columns in REDUNDANT_INDEXES:
+        existing = _existing_indexes(table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, columns in REDUNDANT_INDEXES:
+        existing = _existing_indexes(table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+    for name, table, _columns, _kwargs in NEW_INDEXES:
+        existing = _existing_indexes(table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
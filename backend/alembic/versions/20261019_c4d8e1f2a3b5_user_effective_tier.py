@@ -0,0 +1,56 @@
+"""user effective tier
+
+Denormalized users.effective_tier (the tier in force, FREE once a
+subscription lapses) plus the index the expiry sweeper scans. Backfilled
+from subscription_tier/subscription_expires.
+
+Idempotent: databases created by create_all after the model change already
+have the column and index.
+
+Revision ID: c4d8e1f2a3b5
+Revises: b7c1e2d4f5a6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e1f2a3b5'
+down_revision: Union[str, None] = 'b7c1e2d4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_users_effective_tier_expires"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    if "effective_tier" not in columns:
+        op.add_column("users", sa.Column(
+            "effective_tier",
+            # Reuses the subscriptiontier type created for subscription_tier
+            sa.Enum("FREE", "PREMIUM", "PRO", name="subscriptiontier"),
+            server_default="FREE",
+            nullable=False,
+        ))
+        op.execute(
+            sa.text(
+                "UPDATE users SET effective_tier = subscription_tier "
+                "WHERE subscription_expires > :now"
+            ).bindparams(now=datetime.utcnow())
+        )
+
+    if INDEX_NAME not in {index["name"] for index in inspector.get_indexes("users")}:
+        op.create_index(INDEX_NAME, "users", ["effective_tier", "subscription_expires"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("effective_tier")
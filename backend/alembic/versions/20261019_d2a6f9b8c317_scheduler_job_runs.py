@@ -0,0 +1,53 @@
+"""scheduler job runs
+
+History of notification scheduler job runs, written by the elected
+scheduler leader.
+
+Idempotent: databases created by create_all after the model change already
+have the table.
+
+Revision ID: d2a6f9b8c317
+Revises: c4d8e1f2a3b5
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6f9b8c317'
+down_revision: Union[str, None] = 'c4d8e1f2a3b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "scheduler_job_runs" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "scheduler_job_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("scheduled_for", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_scheduler_job_runs_job_id_finished_at", "scheduler_job_runs", ["job_id", "finished_at"]
+    )
+    op.create_index("ix_scheduler_job_runs_finished_at", "scheduler_job_runs", ["finished_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduler_job_runs_finished_at", table_name="scheduler_job_runs")
+    op.drop_index("ix_scheduler_job_runs_job_id_finished_at", table_name="scheduler_job_runs")
+    op.drop_table("scheduler_job_runs")
@@ -0,0 +1,63 @@
+"""scheduler job store
+
+APScheduler's apscheduler_jobs table, so scheduled jobs survive restarts,
+and run keys on scheduler_job_runs: a unique "<job_id>:<date>" claimed
+before a notification job sends. finished_at becomes nullable because a
+claimed run is recorded before it finishes.
+
+Idempotent: databases created by create_all after the model change already
+have the table, column and index.
+
+Revision ID: e5b3c9a1d7f2
+Revises: d2a6f9b8c317
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b3c9a1d7f2'
+down_revision: Union[str, None] = 'd2a6f9b8c317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RUN_KEY_INDEX = "ux_scheduler_job_runs_run_key"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if "apscheduler_jobs" not in inspector.get_table_names():
+        op.create_table(
+            "apscheduler_jobs",
+            sa.Column("id", sa.Unicode(length=191), nullable=False),
+            sa.Column("next_run_time", sa.Float(precision=25), nullable=True),
+            sa.Column("job_state", sa.LargeBinary(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_apscheduler_jobs_next_run_time", "apscheduler_jobs", ["next_run_time"])
+
+    columns = {column["name"]: column for column in inspector.get_columns("scheduler_job_runs")}
+    if "run_key" not in columns or not columns["finished_at"]["nullable"]:
+        # SQLite can't alter a column's nullability in place
+        with op.batch_alter_table("scheduler_job_runs") as batch_op:
+            if "run_key" not in columns:
+                batch_op.add_column(sa.Column("run_key", sa.String(length=150), nullable=True))
+            batch_op.alter_column("finished_at", existing_type=sa.DateTime(), nullable=True)
+
+    if RUN_KEY_INDEX not in {index["name"] for index in inspector.get_indexes("scheduler_job_runs")}:
+        op.create_index(RUN_KEY_INDEX, "scheduler_job_runs", ["run_key"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(RUN_KEY_INDEX, table_name="scheduler_job_runs")
+    op.execute("DELETE FROM scheduler_job_runs WHERE finished_at IS NULL")
+    with op.batch_alter_table("scheduler_job_runs") as batch_op:
+        batch_op.drop_column("run_key")
+        batch_op.alter_column("finished_at", existing_type=sa.DateTime(), nullable=False)
+    op.drop_index("ix_apscheduler_jobs_next_run_time", table_name="apscheduler_jobs")
+    op.drop_table("apscheduler_jobs")
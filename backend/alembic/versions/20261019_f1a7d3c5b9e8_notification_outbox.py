@@ -0,0 +1,63 @@
+"""notification outbox
+
+Durable queue of outbound push notifications, drained by the scheduler
+leader with retries, backoff and dead-lettering.
+
+Idempotent: databases created by create_all after the model change already
+have the table.
+
+Revision ID: f1a7d3c5b9e8
+Revises: e5b3c9a1d7f2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7d3c5b9e8'
+down_revision: Union[str, None] = 'e5b3c9a1d7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "notification_outbox" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("dedupe_key", sa.String(length=200), nullable=True),
+        sa.Column("provider", sa.String(length=20), nullable=False),
+        sa.Column("target_type", sa.String(length=20), nullable=False),
+        sa.Column("target", sa.Text(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("data", sa.Text(), nullable=True),
+        sa.Column("image_url", sa.String(length=500), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("locked_by", sa.String(length=255), nullable=True),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("dedupe_key"),
+    )
+    op.create_index(
+        "ix_notification_outbox_status_next_attempt_at",
+        "notification_outbox",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_status_next_attempt_at", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
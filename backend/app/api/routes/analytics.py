@@ -1,10 +1,10 @@
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from collections import Counter, defaultdict
+from functools import lru_cache
 import json
 import os
 
@@ -16,7 +16,14 @@ TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__f
 SHARE_EVENTS_PATH = os.path.join(DATA_DIR, "analytics_share_events.jsonl")
 REFERRAL_CLICKS_PATH = os.path.join(DATA_DIR, "referral_clicks.jsonl")
 
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
+
+@lru_cache(maxsize=None)
+def get_templates():
+    """Dashboard templates, built on first use so workers don't import jinja2 at startup."""
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory=TEMPLATES_DIR)
+
 
 class ShareEvent(BaseModel):
     event_type: str = Field(..., description="life_seal | article | reading")
@@ -124,7 +131,7 @@ async def analytics_dashboard(request: Request):
         for (label, content_type), count in content_counts.most_common(10)
     ]
     
-    return templates.TemplateResponse("analytics_dashboard.html", {
+    return get_templates().TemplateResponse("analytics_dashboard.html", {
         "request": request,
         "total_shares": total_shares,
         "total_clicks": total_clicks,
@@ -9,7 +9,7 @@ from ...services.interpretation_service import (
     get_personality_number_interpretation,
     get_personal_year_interpretation,
 )
-from ...services.compatibility_pdf_service import generate_compatibility_pdf
+from ...core.metrics import track_pdf_render
 from ...core.compatibility import evaluate_compatibility
 
 router = APIRouter()
@@ -250,7 +250,10 @@ async def export_compatibility_pdf(request: CompatibilityRequest):
     }
     
     # Generate PDF
-    pdf_buffer = generate_compatibility_pdf(person_a_pdf, person_b_pdf, compatibility_pdf)
+    from ...services.compatibility_pdf_service import generate_compatibility_pdf  # reportlab, loaded on first export
+
+    with track_pdf_render("compatibility"):
+        pdf_buffer = generate_compatibility_pdf(person_a_pdf, person_b_pdf, compatibility_pdf)
     
     filename = f"compatibility-{person_a_input['full_name'].replace(' ', '-')}-{person_b_input['full_name'].replace(' ', '-')}.pdf"
     
@@ -3,7 +3,7 @@ Daily Insights API Routes
 Provides endpoints for daily power numbers, blessed days, and personalized daily guidance.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Path, Response, status
 from datetime import date, datetime
 from typing import List
 
@@ -16,13 +16,19 @@ from ..schemas import (
     BlessedDaysRequest,
     BlessedDaysResponse,
     PersonalMonthRequest,
-    PersonalMonthResponse
+    PersonalMonthResponse,
+    DailyRangeRequest,
+    DailyRangeResponse,
+    CalendarYearRequest,
+    CalendarYearResponse
 )
 from ...services.daily_insights_service import (
-    get_daily_insight_full,
+    get_daily_insight_cache,
     get_weekly_power_numbers,
     get_monthly_blessed_days,
-    get_personal_month_guidance
+    get_personal_month_guidance,
+    calculate_calendar_range,
+    get_calendar_year
 )
 
 router = APIRouter(
@@ -66,15 +72,17 @@ async def get_daily_insight(request: DailyInsightRequest):
                     detail="Invalid date format. Use ISO format: YYYY-MM-DD"
                 )
         
-        # Get daily insight
-        insight_data = get_daily_insight_full(
+        # Serve the pre-serialized payload for (date, power number, blessed)
+        payload = get_daily_insight_cache().get_payload(
             life_seal=request.life_seal,
             day_of_birth=request.day_of_birth,
             target_date=target_date_obj
         )
         
-        return DailyInsightResponse(**insight_data)
+        return Response(content=payload, media_type="application/json")
     
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -227,3 +235,92 @@ async def get_personal_month(request: PersonalMonthRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error calculating personal month: {str(e)}"
         )
+
+
+
+@router.post("/range", response_model=DailyRangeResponse)
+async def get_daily_range(request: DailyRangeRequest):
+    """
+    Get power numbers, blessed days and personal months for a date range.
+    Returns compact arrays instead of per-day objects (ranges up to ~10 years).
+    
+    **Parameters:**
+    - life_seal: User's life seal number (1-9)
+    - day_of_birth: User's birth day (1-31)
+    - month_of_birth: Optional birth month (enables personal month/year arrays)
+    - start_date, end_date: ISO date strings (inclusive range)
+    
+    **Returns:**
+    - power_numbers / blessed: one entry per day starting at start_date
+    - months / personal_years / personal_months: one entry per calendar month
+    """
+    try:
+        try:
+            start_date_obj = datetime.fromisoformat(request.start_date).date()
+            end_date_obj = datetime.fromisoformat(request.end_date).date()
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid date format. Use ISO format: YYYY-MM-DD"
+            )
+        
+        range_data = calculate_calendar_range(
+            life_seal=request.life_seal,
+            day_of_birth=request.day_of_birth,
+            start_date=start_date_obj,
+            end_date=end_date_obj,
+            month_of_birth=request.month_of_birth
+        )
+        
+        return DailyRangeResponse(**range_data)
+    
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error calculating date range: {str(e)}"
+        )
+
+
+@router.post("/calendar/{year}", response_model=CalendarYearResponse)
+async def get_calendar(
+    request: CalendarYearRequest,
+    year: int = Path(..., ge=1, le=9999, description="Calendar year (YYYY)")
+):
+    """
+    Get the full-year calendar for the mobile calendar view.
+    
+    **Parameters:**
+    - year: Calendar year in the path
+    - life_seal, day_of_birth: User's numbers
+    - month_of_birth: Optional birth month (enables personal month/year arrays)
+    
+    **Returns:**
+    - Compact per-day and per-month arrays for Jan 1 - Dec 31 of the year
+    """
+    try:
+        calendar_data = get_calendar_year(
+            life_seal=request.life_seal,
+            day_of_birth=request.day_of_birth,
+            year=year,
+            month_of_birth=request.month_of_birth
+        )
+        
+        return CalendarYearResponse(**calendar_data)
+    
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error calculating calendar: {str(e)}"
+        )
@@ -9,7 +9,7 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from ..schemas import DestinyRequest, DestinyResponse
 from ...services.destiny_service import calculate_destiny
-from ...services.pdf_service import generate_report_pdf
+from ...core.metrics import track_pdf_render
 
 router = APIRouter()
 
@@ -109,7 +109,10 @@ async def post_export_report_pdf(request: DestinyRequest):
     date_of_birth = f"{input_data['year_of_birth']}-{input_data['month_of_birth']:02d}-{input_data['day_of_birth']:02d}"
     
     # Generate PDF from report
-    pdf_buffer = generate_report_pdf(full_name, date_of_birth, core["report"])
+    from ...services.pdf_service import generate_report_pdf  # reportlab, loaded on first export
+
+    with track_pdf_render("report"):
+        pdf_buffer = generate_report_pdf(full_name, date_of_birth, core["report"])
     
     # Return as downloadable file
     return StreamingResponse(
@@ -5,10 +5,9 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 import logging
 
-from ...services.pdf_export import PDFExportService
+from ...core.metrics import track_pdf_render
 
 router = APIRouter(prefix="/export", tags=["export"])
-pdf_service = PDFExportService()
 logger = logging.getLogger(__name__)
 
 
@@ -39,8 +38,11 @@ async def export_pdf(request: ExportRequest):
         if not request.decode_data or 'input' not in request.decode_data:
             raise ValueError("Invalid decode_data structure: missing 'input' key")
         
-        # Generate PDF
-        pdf_buffer = pdf_service.generate_full_reading_pdf(request.decode_data)
+        # Generate PDF (reportlab and the stylesheets load on the first export)
+        from ...services.pdf_export import get_pdf_export_service
+
+        with track_pdf_render("reading"):
+            pdf_buffer = get_pdf_export_service().generate_full_reading_pdf(request.decode_data)
         
         # Create filename
         safe_name = request.full_name.replace(' ', '_')[:30]
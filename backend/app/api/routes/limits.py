@@ -3,14 +3,14 @@ Reading limit checking endpoint.
 Enforces subscription-based reading limits (3/month for free, unlimited for premium).
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
 from app.config.database import get_db
 from app.models.user import User, SubscriptionTier
 from app.models.reading import Reading
-from app.core.feature_gates import check_reading_limit, get_user_from_request
+from app.core.feature_gates import check_reading_limit, require_user
 
 router = APIRouter(
     prefix="/api/limits",
@@ -20,8 +20,8 @@ router = APIRouter(
 
 @router.get("/reading-check")
 async def check_reading_limit_endpoint(
-    request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: User = Depends(require_user)
 ):
     """
     Check if user has remaining readings in their monthly quota.
@@ -37,19 +37,11 @@ async def check_reading_limit_endpoint(
     - 401: Not authenticated
     - 402: Payment required (quota exceeded, needs upgrade)
     """
-    # Get user from request
-    user = get_user_from_request(request, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
-    
     # Check reading limit
     is_allowed, remaining = check_reading_limit(user, db)
     
     # Calculate reset date (30 days from now if free tier)
-    if user.subscription_tier == SubscriptionTier.FREE:
+    if user.effective_tier == SubscriptionTier.FREE:
         month_ago = datetime.utcnow() - timedelta(days=30)
         reset_date = (month_ago + timedelta(days=30)).isoformat()
         limit = 3
@@ -58,7 +50,7 @@ async def check_reading_limit_endpoint(
         limit = 999
     
     # If quota exceeded and free tier, return 402 Payment Required
-    if not is_allowed and user.subscription_tier == SubscriptionTier.FREE:
+    if not is_allowed and user.effective_tier == SubscriptionTier.FREE:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
             detail="Reading quota exceeded. Upgrade to Premium for unlimited readings.",
@@ -74,9 +66,9 @@ async def check_reading_limit_endpoint(
         "remaining": remaining,
         "limit": limit,
         "reset_date": reset_date,
-        "tier": user.subscription_tier.value,
+        "tier": user.effective_tier.value,
         "message": (
-            "Readings unlimited" if user.subscription_tier != SubscriptionTier.FREE
+            "Readings unlimited" if user.effective_tier != SubscriptionTier.FREE
             else f"You have {remaining} reading(s) left this month"
         )
     }
@@ -84,17 +76,10 @@ async def check_reading_limit_endpoint(
 
 @router.get("/status")
 async def get_limit_status(
-    request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: User = Depends(require_user)
 ):
     """Get current subscription and reading limit status."""
-    user = get_user_from_request(request, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
-    
     is_allowed, remaining = check_reading_limit(user, db)
     
     return {
@@ -4,12 +4,12 @@ API routes for push notifications, FCM tokens, and notification preferences.
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import logging
 import re
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.models.device import Device
 from app.models.notification_preference import NotificationPreference
 
@@ -302,14 +302,24 @@ async def send_test_notification(request: TestNotificationRequest) -> dict:
 
 
 @router.get("/scheduler/status")
-async def get_scheduler_status() -> dict:
+async def get_scheduler_status(
+    limit: int = 20,
+    job_id: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+) -> dict:
     """
     Get the current status of the notification scheduler.
     
+    Args:
+        limit: Number of recent runs to return (max 200)
+        job_id: Only return runs of this job
+    
     Returns:
-        Dict with scheduler status and list of scheduled jobs
+        Dict with scheduler status, list of scheduled jobs and the recent
+        run history (from every leader, not just this worker)
     """
     try:
+        from app.services.job_run_service import get_recent_job_runs
         from app.services.notification_scheduler import get_notification_scheduler
         
         scheduler = get_notification_scheduler()
@@ -318,11 +328,58 @@ async def get_scheduler_status() -> dict:
         return {
             "success": True,
             "scheduler": status,
+            "recent_runs": get_recent_job_runs(db, limit=max(1, min(limit, 200)), job_id=job_id),
         }
     except Exception as e:
         logger.error(f"Error getting scheduler status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.get("/outbox")
+async def get_outbox_status(db: Session = Depends(get_read_db)) -> dict:
+    """
+    Get the state of the outbound notification queue.
+    
+    Returns:
+        Dict with entry counts by status, the oldest pending entry's age
+        and the latest dead letters
+    """
+    try:
+        from app.services.notification_outbox import get_outbox_stats
+        
+        return {
+            "success": True,
+            "outbox": get_outbox_stats(db),
+        }
+    except Exception as e:
+        logger.error(f"Error getting outbox status: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class OutboxRequeueRequest(BaseModel):
+    """Dead letters to retry; all of them when ids is omitted."""
+    ids: Optional[List[int]] = None
+
+
+@router.post("/outbox/requeue")
+async def requeue_outbox_dead_letters(request: OutboxRequeueRequest, db: Session = Depends(get_db)) -> dict:
+    """
+    Give dead-lettered notifications a fresh set of delivery attempts.
+    
+    Returns:
+        {"success": bool, "requeued": int}
+    """
+    try:
+        from app.services.notification_outbox import requeue_dead_notifications
+        
+        return {
+            "success": True,
+            "requeued": requeue_dead_notifications(db, request.ids),
+        }
+    except Exception as e:
+        logger.error(f"Error requeueing dead letters: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/preferences")
 async def save_notification_preferences(request: dict, db: Session = Depends(get_db)) -> dict:
     """
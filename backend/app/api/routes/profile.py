@@ -6,11 +6,12 @@ Supports device-based (anonymous) and user-based (authenticated) profiles.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
 import uuid
 from typing import Optional
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
+from app.core.feature_gates import AuthContext, get_auth_context
 from app.models.user_profile import UserProfile, LifeStage, SpiritualPreference, CommunicationStyle
 from app.api.schemas import (
     CreateUserProfileRequest,
@@ -18,45 +19,68 @@ from app.api.schemas import (
     UserProfileResponse,
     UserProfileWithCalculationsResponse,
 )
-from app.core.life_seal import calculate_life_seal
-from app.core.name_numbers import calculate_soul_number, calculate_personality_number
 from app.core.personal_year import calculate_personal_year
-from app.core.cycles import calculate_blessed_days
+from app.services.daily_insights_service import calculate_daily_power_number, check_blessed_day
+from app.services.daily_precompute_service import get_precomputed_day
+from app.services.profile_service import (
+    NUMEROLOGY_ENGINE_VERSION,
+    compute_profile_snapshot,
+    current_pdf_month,
+    effective_pdf_exports,
+    get_profile_snapshot,
+    increment_pdf_exports_count,
+    increment_readings_count,
+    refresh_profile_snapshot,
+)
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
 
-def _current_month() -> str:
-    return datetime.utcnow().strftime("%Y-%m")
+def _profile_response_data(profile: UserProfile) -> dict:
+    """Profile dict for read responses, with PDF counters rolled over in memory only."""
+    data = profile.to_dict()
+    data["pdf_exports_count"], data["pdf_exports_month"] = effective_pdf_exports(profile)
+    return data
 
 
-def _ensure_pdf_month(profile: UserProfile) -> None:
-    current_month = _current_month()
-    if profile.pdf_exports_month != current_month:
-        profile.pdf_exports_month = current_month
-        profile.pdf_exports_count = 0
+def _scoped_user_id(auth: AuthContext, user_id: Optional[str]) -> Optional[str]:
+    """
+    user_id to look profiles up by: the token's user when authenticated
+    (a different user_id is refused), otherwise the client-supplied one.
+    """
+    if not auth.authenticated:
+        return user_id
+    if user_id and user_id != auth.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="user_id does not match the authenticated user"
+        )
+    return auth.user_id
 
 
 def _get_profile_query(db: Session, user_id: Optional[str], device_id: Optional[str]) -> Optional[UserProfile]:
+    # Same row the counter increments update (profile_service._atomic_profile_update): the oldest match
+    oldest_first = (UserProfile.created_at, UserProfile.id)
     if user_id:
-        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).order_by(*oldest_first).first()
         if profile:
             return profile
     if device_id:
-        return db.query(UserProfile).filter(UserProfile.device_id == device_id).first()
+        return db.query(UserProfile).filter(UserProfile.device_id == device_id).order_by(*oldest_first).first()
     return None
 
 
 @router.post("/create", response_model=UserProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     request: CreateUserProfileRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> UserProfileResponse:
     """
     Create a new user profile during onboarding.
     
-    Device-based profile creation for anonymous users.
-    Future: Will support user_id for authenticated profiles.
+    Device-based profile creation for anonymous users; authenticated
+    requests attach the profile to the token's user.
     
     Args:
         request: Profile creation request with name, DOB, preferences
@@ -70,6 +94,8 @@ async def create_profile(
         HTTPException 400: If invalid data provided
     """
     try:
+        request.user_id = _scoped_user_id(auth, request.user_id)
+        
         # Check if profile already exists for this user or device
         if request.user_id:
             existing = db.query(UserProfile).filter(UserProfile.user_id == request.user_id).first()
@@ -86,14 +112,8 @@ async def create_profile(
                     detail=f"Profile already exists for device {request.device_id}"
                 )
         
-        # Calculate life seal from DOB
-        date_parts = request.date_of_birth.split("-")
-        year = int(date_parts[0])
-        month = int(date_parts[1])
-        day = int(date_parts[2])
-        
-        life_seal_data = calculate_life_seal(day, month, year)
-        life_seal_number = life_seal_data["number"]
+        # Calculate life seal and the rest of the derived numbers from name/DOB
+        snapshot = compute_profile_snapshot(request.first_name, request.date_of_birth)
         
         # Create new profile
         profile = UserProfile(
@@ -102,14 +122,16 @@ async def create_profile(
             user_id=request.user_id,
             first_name=request.first_name,
             date_of_birth=request.date_of_birth,
-            life_seal=life_seal_number,
+            life_seal=snapshot["life_seal"],
+            calculations=snapshot,
+            calculations_version=NUMEROLOGY_ENGINE_VERSION,
             life_stage=request.life_stage or LifeStage.UNKNOWN,
             spiritual_preference=request.spiritual_preference or SpiritualPreference.NOT_SPECIFIED,
             communication_style=request.communication_style or CommunicationStyle.NOT_SPECIFIED,
             interests=request.interests or [],
             notification_style=request.notification_style or "motivational",
             pdf_exports_count=0,
-            pdf_exports_month=_current_month(),
+            pdf_exports_month=current_pdf_month(),
             has_completed_onboarding=True,
         )
         
@@ -119,6 +141,8 @@ async def create_profile(
         
         return UserProfileResponse(**profile.to_dict())
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -136,7 +160,8 @@ async def create_profile(
 async def get_profile(
     device_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> UserProfileResponse:
     """
     Get current user's profile.
@@ -151,7 +176,7 @@ async def get_profile(
     Raises:
         HTTPException 404: If profile not found
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    profile = _get_profile_query(db, _scoped_user_id(auth, user_id), device_id)
     
     if not profile:
         raise HTTPException(
@@ -159,18 +184,15 @@ async def get_profile(
             detail="Profile not found for this user"
         )
 
-    _ensure_pdf_month(profile)
-    db.commit()
-    db.refresh(profile)
-
-    return UserProfileResponse(**profile.to_dict())
+    return UserProfileResponse(**_profile_response_data(profile))
 
 
 @router.get("/me/with-calculations", response_model=UserProfileWithCalculationsResponse)
 async def get_profile_with_calculations(
     device_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> UserProfileWithCalculationsResponse:
     """
     Get user profile with calculated daily numbers.
@@ -185,7 +207,7 @@ async def get_profile_with_calculations(
     Returns:
         Profile with calculated daily numbers
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    profile = _get_profile_query(db, _scoped_user_id(auth, user_id), device_id)
     
     if not profile:
         raise HTTPException(
@@ -193,35 +215,29 @@ async def get_profile_with_calculations(
             detail="Profile not found for this user"
         )
 
-    _ensure_pdf_month(profile)
-    db.commit()
-    db.refresh(profile)
-
-    # Calculate additional numbers for today
-    date_parts = profile.date_of_birth.split("-")
-    year = int(date_parts[0])
-    month = int(date_parts[1])
-    day = int(date_parts[2])
+    # Name/DOB-derived numbers come from the stored snapshot
+    snapshot = get_profile_snapshot(profile)
     
-    soul_number = calculate_soul_number(profile.first_name)
-    personality_number = calculate_personality_number(profile.first_name)
-    personal_year = calculate_personal_year(day, month, year)
-    
-    # Get today's power number (simplified - just use personal year for now)
-    today = datetime.now()
-    today_power = personal_year  # Simplified calculation
-    daily_power = personal_year  # Simplified calculation
-    
-    # Check if today is a blessed day
-    blessed_days = calculate_blessed_days(day)
-    is_blessed = today.day in blessed_days
+    # Today's numbers come from the nightly precompute job when available
+    today = date.today()
+    precomputed = get_precomputed_day(db, profile.id, today)
+    if precomputed:
+        personal_year = precomputed.personal_year
+        today_power = precomputed.power_number
+        is_blessed = precomputed.is_blessed_day
+    else:
+        personal_year = calculate_personal_year(
+            snapshot["day_of_birth"], snapshot["month_of_birth"], today.year
+        )
+        today_power = calculate_daily_power_number(today, snapshot["life_seal"])
+        is_blessed = check_blessed_day(today, snapshot["day_of_birth"])
     
-    response_data = profile.to_dict()
+    response_data = _profile_response_data(profile)
     response_data.update({
-        "soul_number": soul_number,
-        "personality_number": personality_number,
+        "soul_number": snapshot["soul_number"],
+        "personality_number": snapshot["personality_number"],
         "personal_year": personal_year,
-        "daily_power_number": daily_power,
+        "daily_power_number": today_power,
         "today_power_number": today_power,
         "is_blessed_day_today": is_blessed,
     })
@@ -234,7 +250,8 @@ async def update_profile(
     request: UpdateUserProfileRequest,
     device_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> UserProfileResponse:
     """
     Update user profile preferences.
@@ -250,7 +267,7 @@ async def update_profile(
     Raises:
         HTTPException 404: If profile not found
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    profile = _get_profile_query(db, _scoped_user_id(auth, user_id), device_id)
     
     if not profile:
         raise HTTPException(
@@ -264,6 +281,7 @@ async def update_profile(
         if value is not None:
             setattr(profile, field, value)
     
+    refresh_profile_snapshot(profile)
     profile.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(profile)
@@ -275,7 +293,8 @@ async def update_profile(
 async def increment_readings(
     device_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> dict:
     """
     Increment readings count and update last reading date.
@@ -288,22 +307,17 @@ async def increment_readings(
     Returns:
         Updated readings count
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    result = increment_readings_count(db, user_id=_scoped_user_id(auth, user_id), device_id=device_id)
     
-    if not profile:
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found for this user"
         )
     
-    profile.readings_count += 1
-    profile.last_reading_date = datetime.utcnow()
-    db.commit()
-    db.refresh(profile)
-    
     return {
-        "readings_count": profile.readings_count,
-        "last_reading_date": profile.last_reading_date.isoformat(),
+        "readings_count": result["readings_count"],
+        "last_reading_date": result["last_reading_date"].isoformat(),
     }
 
 
@@ -311,36 +325,30 @@ async def increment_readings(
 async def increment_pdf_exports(
     device_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> dict:
     """
     Increment monthly PDF export count.
     Resets the count when a new month starts.
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    result = increment_pdf_exports_count(db, user_id=_scoped_user_id(auth, user_id), device_id=device_id)
 
-    if not profile:
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found for this user"
         )
 
-    _ensure_pdf_month(profile)
-    profile.pdf_exports_count += 1
-    db.commit()
-    db.refresh(profile)
-
-    return {
-        "pdf_exports_count": profile.pdf_exports_count,
-        "pdf_exports_month": profile.pdf_exports_month,
-    }
+    return result
 
 
 @router.post("/me/mark-dashboard-seen")
 async def mark_dashboard_seen(
     device_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> dict:
     """
     Mark dashboard intro as seen (don't show again).
@@ -352,7 +360,7 @@ async def mark_dashboard_seen(
     Returns:
         Success status
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    profile = _get_profile_query(db, _scoped_user_id(auth, user_id), device_id)
     
     if not profile:
         raise HTTPException(
@@ -370,7 +378,8 @@ async def mark_dashboard_seen(
 async def delete_profile(
     device_id: str | None = None,
     user_id: str | None = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context)
 ) -> dict:
     """
     Delete user profile (for testing/cleanup purposes).
@@ -382,7 +391,7 @@ async def delete_profile(
     Returns:
         Success status
     """
-    profile = _get_profile_query(db, user_id, device_id)
+    profile = _get_profile_query(db, _scoped_user_id(auth, user_id), device_id)
     
     if not profile:
         raise HTTPException(
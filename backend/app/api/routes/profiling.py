@@ -0,0 +1,44 @@
+"""
+Admin-only profiling endpoints (see app.core.profiling).
+Hidden (404) unless PROFILING_TOKEN is set; callers send it in X-Profile.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+
+from app.core import profiling
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["admin"],
+    include_in_schema=False,
+)
+
+
+def require_profiling_token(x_profile: Optional[str] = Header(None)) -> None:
+    """Dependency: 404 when profiling is off, 403 without the right token."""
+    if not profiling.PROFILING_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not profiling.is_profiling_token(x_profile):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+
+
+@router.post("/flamegraph", dependencies=[Depends(require_profiling_token)])
+async def capture_flamegraph(
+    seconds: float = Query(10.0, gt=0, le=300, description="How long to sample"),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Sampling interval"),
+):
+    """
+    Sample this worker's stacks for `seconds` and write a folded flame graph
+    to PROFILING_DIR. Send load while it runs; only the worker that serves
+    this request is sampled.
+    """
+    path, samples = await profiling.capture_flame_graph(seconds, interval_ms / 1000)
+    return {"path": path, "samples": samples, "format": "folded"}
+
+
+@router.get("/dumps", dependencies=[Depends(require_profiling_token)])
+async def list_profile_dumps():
+    """Per-request .prof files and .folded flame graphs on this host, newest first."""
+    return {"directory": profiling.PROFILING_DIR, "dumps": profiling.list_dumps()}
@@ -5,10 +5,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, timedelta
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.models.share_log import ShareLog
 from app.models.device import Device
 from pydantic import BaseModel
+from typing import Optional
 
 router = APIRouter(prefix="/api/shares", tags=["shares"])
 
@@ -33,7 +34,7 @@ class ShareEventResponse(BaseModel):
 
 class ShareStatsResponse(BaseModel):
     """Response model for share statistics."""
-    life_seal_number: int = None
+    life_seal_number: Optional[int] = None
     total_shares: int
     shares_by_platform: dict
     unique_devices: int
@@ -88,7 +89,7 @@ async def track_share(
 async def get_share_stats(
     life_seal_number: int = Query(None, description="Filter by specific life seal number"),
     days: int = Query(30, description="Days to look back (default 30)"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get share statistics across all shares or for a specific life seal.
@@ -136,7 +137,7 @@ async def get_share_stats(
 async def get_top_shared(
     limit: int = Query(10, description="Number of top items to return"),
     days: int = Query(30, description="Days to look back"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get the most frequently shared life seal numbers.
@@ -8,12 +8,11 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime, timedelta
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.models import User, SubscriptionHistory
 from app.models.subscription_history import SubscriptionStatus
 from app.models.user import SubscriptionTier
-from app.services.receipt_validation_service import ReceiptValidationService
-from app.core.feature_gates import get_user_from_request
+from app.core.feature_gates import require_user
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +20,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/subscriptions", tags=["subscriptions"])
 
 
-# Dependency to get current user from JWT
-async def get_current_user(db: Session = Depends(get_db)) -> User:
-    """Get current authenticated user from JWT token."""
-    user = get_user_from_request(db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required"
-        )
-    return user
-
-
 # ===== Request/Response Models =====
 
 class ValidateReceiptRequest(BaseModel):
@@ -74,7 +61,7 @@ class CancelSubscriptionRequest(BaseModel):
 async def validate_receipt(
     request: ValidateReceiptRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_user)
 ):
     """
     Validate purchase receipt with Apple/Google and activate subscription.
@@ -86,11 +73,17 @@ async def validate_receipt(
     4. Create subscription history record
     5. Return updated subscription status
     """
+    # Deferred: the service pulls in httpx, which only this endpoint needs
+    from app.services.receipt_validation_service import (
+        ReceiptValidationUnavailable,
+        get_receipt_validation_service,
+    )
+
     try:
         logger.info(f"Validating receipt for user {current_user.id}, product {request.product_id}")
         
         # Validate receipt with platform
-        validation_result = ReceiptValidationService.validate_receipt(
+        validation_result = await get_receipt_validation_service().validate_receipt(
             platform=request.platform,
             receipt_data=request.receipt_data,
             product_id=request.product_id
@@ -132,8 +125,7 @@ async def validate_receipt(
         price_usd = price_map.get(request.product_id, "0.00")
         
         # Update user subscription
-        current_user.subscription_tier = tier
-        current_user.subscription_expires = expires_date
+        current_user.set_subscription(tier, expires_date)
         db.add(current_user)
         
         # Create subscription history record
@@ -168,6 +160,12 @@ async def validate_receipt(
         
     except HTTPException:
         raise
+    except ReceiptValidationUnavailable as e:
+        logger.warning(f"⚠ Receipt validation unavailable: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Store receipt validation is temporarily unavailable, please retry"
+        )
     except Exception as e:
         logger.error(f"❌ Error processing subscription: {str(e)}")
         db.rollback()
@@ -180,7 +178,7 @@ async def validate_receipt(
 @router.get("/status", response_model=SubscriptionStatusResponse)
 async def get_subscription_status(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_user)
 ):
     """
     Get current subscription status for authenticated user.
@@ -195,13 +193,8 @@ async def get_subscription_status(
         .first()
     )
     
-    # Check if subscription is still active
-    is_active = False
-    if current_user.subscription_tier != SubscriptionTier.FREE:
-        if current_user.subscription_expires:
-            is_active = current_user.subscription_expires > datetime.utcnow()
-        else:
-            is_active = True  # Lifetime or no expiration
+    # effective_tier drops to FREE once the expiry sweeper sees the subscription lapse
+    is_active = current_user.effective_tier != SubscriptionTier.FREE
     
     return SubscriptionStatusResponse(
         tier=current_user.subscription_tier.value,
@@ -214,8 +207,8 @@ async def get_subscription_status(
 
 @router.get("/history")
 async def get_subscription_history(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user)
 ):
     """
     Get subscription history for authenticated user.
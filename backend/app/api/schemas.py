@@ -101,6 +101,35 @@ class PersonalMonthResponse(BaseModel):
     month_name: str
     theme: str
 
+class DailyRangeRequest(BaseModel):
+    """Request schema for calendar data over an arbitrary date range"""
+    life_seal: int = Field(..., ge=1, le=9)
+    day_of_birth: int = Field(..., ge=1, le=31)
+    month_of_birth: Optional[int] = Field(None, ge=1, le=12, description="Enables personal month/year arrays")
+    start_date: str = Field(..., description="ISO format date (YYYY-MM-DD)")
+    end_date: str = Field(..., description="ISO format date (YYYY-MM-DD), inclusive")
+
+class CalendarYearRequest(BaseModel):
+    """Request schema for a full-year calendar"""
+    life_seal: int = Field(..., ge=1, le=9)
+    day_of_birth: int = Field(..., ge=1, le=31)
+    month_of_birth: Optional[int] = Field(None, ge=1, le=12, description="Enables personal month/year arrays")
+
+class DailyRangeResponse(BaseModel):
+    """Compact calendar data: per-day arrays aligned from start_date, per-month arrays aligned with months"""
+    start_date: str
+    end_date: str
+    days: int
+    power_numbers: List[int]
+    blessed: List[bool]
+    months: List[str] = Field(..., description="YYYY-MM for each month in the range")
+    personal_years: Optional[List[int]] = None
+    personal_months: Optional[List[int]] = None
+
+class CalendarYearResponse(DailyRangeResponse):
+    """Compact calendar data for one calendar year"""
+    year: int
+
 # Notification Preferences Schemas
 class NotificationPreferencesRequest(BaseModel):
     """User notification preferences"""
@@ -5,47 +5,323 @@ Supports PostgreSQL, SQLite, and other SQLAlchemy-compatible databases.
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+from typing import Dict, List
+import itertools
 import os
 import logging
+import threading
+import time
+
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_EVENTS, DB_POOL_WAIT
 
 logger = logging.getLogger(__name__)
 
+
+def _normalize_url(database_url: str) -> str:
+    """Handle PostgreSQL URL format from some hosting providers."""
+    if database_url.startswith("postgres://"):
+        return database_url.replace("postgres://", "postgresql://", 1)
+    return database_url
+
+
 # Database URL from environment variable with fallback to SQLite
-DATABASE_URL = os.getenv(
+DATABASE_URL = _normalize_url(os.getenv(
     "DATABASE_URL",
     "sqlite:///./destiny_decoder.db"  # Default to SQLite for easy development
-)
-
-# Handle PostgreSQL URL format from some hosting providers
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-
-# SQLAlchemy engine configuration
-engine_kwargs = {
-    "echo": False,  # Set to True for SQL query logging in development
-    "pool_pre_ping": True,  # Verify connections before using them
-}
-
-# SQLite-specific configuration
-if DATABASE_URL.startswith("sqlite"):
-    engine_kwargs.update({
-        "connect_args": {"check_same_thread": False},
-        "poolclass": StaticPool,  # Use static pool for SQLite
-    })
+))
+
+# Optional read replicas (comma-separated) for read-only routes; defaults to the primary
+READ_DATABASE_URLS = [
+    _normalize_url(url.strip())
+    for url in os.getenv("READ_DATABASE_URL", "").split(",")
+    if url.strip()
+]
+
+# Pool sizing is per process: each gunicorn/uvicorn worker holds its own pool,
+# so the database sees up to workers * (pool_size + max_overflow) connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", str(DB_POOL_SIZE)))
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+
+# SQLite performance profile for single-node deployments:
+#   "tuned"  - WAL journaling, synchronous=NORMAL, mmap, busy timeout, and
+#              separate pools for writers and query-only readers. SQLite still
+#              admits one write transaction at a time; the busy timeout queues
+#              the rest instead of failing with "database is locked".
+#   "legacy" - rollback journal through one shared connection (StaticPool)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned").lower()
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(16 * 1024)))
+SQLITE_WRITE_POOL_SIZE = int(os.getenv("SQLITE_WRITE_POOL_SIZE", str(DB_POOL_SIZE)))
+SQLITE_WRITE_MAX_OVERFLOW = int(os.getenv("SQLITE_WRITE_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+SQLITE_READ_MAX_OVERFLOW = int(os.getenv("SQLITE_READ_MAX_OVERFLOW", "16"))
+
+
+class PoolMetrics:
+    """
+    Checkout/checkin counters and checkout wait times for one engine's pool.
+    Also exported to Prometheus, where they are summed across workers.
+    """
+
+    # PoolMetrics counter -> Prometheus db_pool_events_total event label
+    _EVENTS = {"connects": "connect", "checkouts": "checkout", "checkins": "checkin"}
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+        DB_POOL_WAIT.labels(self.name).observe(seconds)
+        if timed_out:
+            DB_POOL_EVENTS.labels(self.name, "timeout").inc()
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        DB_POOL_EVENTS.labels(self.name, self._EVENTS[counter]).inc()
+        if counter == "checkouts":
+            DB_POOL_CHECKED_OUT.labels(self.name).inc()
+        elif counter == "checkins":
+            DB_POOL_CHECKED_OUT.labels(self.name).dec()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.waits, 6) if self.waits else 0.0,
+            }
+
+
+# Metrics per engine, keyed by the pool's logging name
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Survives pool.recreate(), which passes logging_name through
+        name = kwargs.get("logging_name") or "default"
+        self.metrics = _pool_metrics.setdefault(name, PoolMetrics(name))
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def is_file_sqlite(database_url: str) -> bool:
+    """True for on-disk SQLite URLs (in-memory databases can't be shared across connections)."""
+    return (
+        database_url.startswith("sqlite")
+        and database_url not in ("sqlite://", "sqlite:///:memory:")
+        and "mode=memory" not in database_url
+    )
+
+
+def _apply_sqlite_pragmas(dbapi_conn, sqlite_profile: str, read_only: bool) -> None:
+    """Per-connection SQLite settings for the given performance profile."""
+    cursor = dbapi_conn.cursor()
+    # Enable foreign key constraints for SQLite
+    cursor.execute("PRAGMA foreign_keys=ON")
+    if sqlite_profile == "tuned":
+        cursor.execute("PRAGMA journal_mode=WAL")  # Readers no longer block the writer
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def create_db_engine(
+    database_url: str,
+    name: str,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    sqlite_profile: str = SQLITE_PROFILE,
+    read_only: bool = False,
+):
+    """
+    Create an engine with the app's pool configuration and metrics.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        name: Pool name used for metrics and pool logging (e.g. "primary", "replica-0")
+        pool_size: Connections kept open per worker process
+        max_overflow: Extra connections allowed under load per worker process
+        sqlite_profile: "tuned" or "legacy" (SQLite only)
+        read_only: Open SQLite connections with query_only (tuned profile only)
+
+    Returns:
+        SQLAlchemy Engine
+    """
+    engine_kwargs = {
+        "echo": False,  # Set to True for SQL query logging in development
+        "pool_pre_ping": True,  # Verify connections before using them
+        "pool_logging_name": name,
+    }
+
+    is_sqlite = database_url.startswith("sqlite")
+    tuned_sqlite = is_sqlite and sqlite_profile == "tuned" and is_file_sqlite(database_url)
+
+    if tuned_sqlite:
+        # One pooled connection per concurrent request instead of one shared
+        # connection, so WAL readers run alongside the writer
+        engine_kwargs.update({
+            "pool_pre_ping": False,  # Local file; nothing to go stale
+            "connect_args": {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        })
+    elif is_sqlite:
+        # Legacy SQLite configuration
+        engine_kwargs.update({
+            "connect_args": {"check_same_thread": False},
+            "poolclass": StaticPool,  # Use static pool for SQLite
+        })
+    else:
+        # PostgreSQL/MySQL configuration
+        engine_kwargs.update({
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": pool_size,  # Number of connections to maintain
+            "max_overflow": max_overflow,  # Maximum overflow connections
+            "pool_timeout": DB_POOL_TIMEOUT,  # Seconds to wait for a free connection
+            "pool_recycle": DB_POOL_RECYCLE,  # Recycle connections after 1 hour
+        })
+
+    new_engine = create_engine(database_url, **engine_kwargs)
+    metrics = _pool_metrics.setdefault(name, PoolMetrics(name))
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_conn, connection_record):
+        metrics.increment("connects")
+        if is_sqlite:
+            _apply_sqlite_pragmas(dbapi_conn, sqlite_profile if tuned_sqlite else "legacy", read_only)
+
+    @event.listens_for(new_engine, "checkout")
+    def _on_checkout(dbapi_conn, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+
+    @event.listens_for(new_engine, "checkin")
+    def _on_checkin(dbapi_conn, connection_record):
+        metrics.increment("checkins")
+
+    return new_engine
+
+
+# Create engines
+if SQLITE_PROFILE == "tuned" and is_file_sqlite(DATABASE_URL):
+    # Single-node SQLite: a writer pool plus a query-only reader pool on the
+    # same file stand in for primary and replica
+    engine = create_db_engine(DATABASE_URL, "primary", SQLITE_WRITE_POOL_SIZE, SQLITE_WRITE_MAX_OVERFLOW)
+    _default_read_engines = [
+        create_db_engine(
+            DATABASE_URL, "sqlite-reader", SQLITE_READ_POOL_SIZE, SQLITE_READ_MAX_OVERFLOW, read_only=True
+        )
+    ]
 else:
-    # PostgreSQL/MySQL configuration
-    engine_kwargs.update({
-        "pool_size": 5,  # Number of connections to maintain
-        "max_overflow": 10,  # Maximum overflow connections
-        "pool_recycle": 3600,  # Recycle connections after 1 hour
-    })
+    engine = create_db_engine(DATABASE_URL, "primary")
+    _default_read_engines = [engine]
+
+read_engines: List = [
+    create_db_engine(url, f"replica-{i}", DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW)
+    for i, url in enumerate(READ_DATABASE_URLS)
+] or _default_read_engines
+_replica_cycle = itertools.cycle(read_engines)
+
+
+class RoutingSession(Session):
+    """
+    Session for read-only routes.
+    Queries go to one replica (picked round-robin per session); anything that
+    writes - flushes and INSERT/UPDATE/DELETE statements - goes to the primary.
+    """
+
+    def __init__(self, *args, primary=None, replica=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._primary = primary if primary is not None else engine
+        self._replica = replica if replica is not None else next(_replica_cycle)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            return self._primary
+        return self._replica
 
-# Create engine
-engine = create_engine(DATABASE_URL, **engine_kwargs)
 
-# Session factory
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+
+def get_pool_stats() -> dict:
+    """
+    Pool occupancy and checkout metrics for every engine in this worker.
+    Use wait times and timeouts to size DB_POOL_SIZE against the worker count.
+    """
+    stats = {}
+    for db_engine in [engine] + [e for e in read_engines if e is not engine]:
+        pool = db_engine.pool
+        name = pool.logging_name or "default"
+        entry = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+            })
+        entry.update(_pool_metrics.setdefault(name, PoolMetrics(name)).snapshot())
+        stats[name] = entry
+    return stats
+
+
+def reset_pools_after_fork() -> None:
+    """
+    Forget pooled connections inherited from the parent process.
+    Call in each forked worker before it touches the database (gunicorn
+    post_fork); the parent's sockets are left alone and the worker opens
+    its own connections.
+    """
+    for db_engine in {id(e): e for e in [engine, *read_engines]}.values():
+        db_engine.dispose(close=False)
 
 # Base class for models
 Base = declarative_base()
@@ -68,26 +344,38 @@ def get_db() -> Session:
         db.close()
 
 
+def get_read_db() -> Session:
+    """
+    Dependency for read-only routes.
+    Queries are routed to a READ_DATABASE_URL replica when configured (the
+    primary otherwise); replicas may lag, so only use it for pure reads.
+    
+    Usage:
+        @router.get("/items")
+        def get_items(db: Session = Depends(get_read_db)):
+            return db.query(Item).all()
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
     """
-    Initialize database by creating all tables.
-    Call this during application startup.
+    Bring the database schema up to date by running Alembic migrations.
+    For scripts and first-time setup; the API itself only verifies the
+    schema at startup (see app.config.migrations.verify_schema).
     """
     try:
-        # Import all models so they're registered with Base
-        from app.models.device import Device  # noqa: F401
-        from app.models.notification_preference import NotificationPreference  # noqa: F401
-        
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        logger.info(f"✓ Database initialized successfully")
+        from app.config.migrations import run_migrations, get_schema_status
+
+        run_migrations()
+        status = get_schema_status()
+        logger.info(f"✓ Database initialized successfully (revision {status['current']})")
         logger.info(f"  Database URL: {DATABASE_URL.split('@')[-1] if '@' in DATABASE_URL else DATABASE_URL}")
-        
-        # Log table creation
-        table_names = Base.metadata.tables.keys()
-        for table_name in table_names:
-            logger.info(f"  ✓ Table created: {table_name}")
-            
+
     except Exception as e:
         logger.error(f"✗ Failed to initialize database: {str(e)}")
         raise
@@ -108,12 +396,3 @@ def check_db_connection() -> bool:
     except Exception as e:
         logger.error(f"Database connection check failed: {str(e)}")
         return False
-
-
-# Enable foreign key constraints for SQLite
-if DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
@@ -0,0 +1,97 @@
+"""
+Alembic schema management.
+Migrations run once per deploy (scripts/migrate.py) before any worker
+starts; app startup only checks that the database is at the head revision.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+
+# Development convenience: migrate in the lifespan instead of failing startup
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "false").lower() in ("1", "true", "yes")
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """The database is not at the migration head the code expects."""
+
+
+def get_alembic_config() -> Config:
+    """Alembic config that works regardless of the current directory."""
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def get_head_revision() -> str:
+    """Head revision of the migration tree shipped with this code."""
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def get_current_revision(db_engine: Optional[Engine] = None) -> Optional[str]:
+    """
+    Revision stamped in the database.
+
+    Args:
+        db_engine: Engine to inspect (defaults to the primary engine)
+
+    Returns:
+        The revision id, or None for an empty or pre-Alembic database
+    """
+    if db_engine is None:
+        from app.config.database import engine as db_engine
+
+    with db_engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def get_schema_status(db_engine: Optional[Engine] = None) -> dict:
+    """Current and head revisions and whether they match."""
+    current = get_current_revision(db_engine)
+    head = get_head_revision()
+    return {"current": current, "head": head, "up_to_date": current == head}
+
+
+def run_migrations(revision: str = "head", db_engine: Optional[Engine] = None) -> None:
+    """
+    Upgrade the database to a revision.
+
+    Args:
+        revision: Target revision (default "head")
+        db_engine: Engine to migrate (defaults to the primary engine)
+    """
+    config = get_alembic_config()
+    if db_engine is None:
+        command.upgrade(config, revision)
+        return
+
+    with db_engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def verify_schema(db_engine: Optional[Engine] = None) -> dict:
+    """
+    Check the database is at the migration head without changing it.
+
+    Raises:
+        SchemaOutOfDateError: If migrations have not been run
+    """
+    status = get_schema_status(db_engine)
+    if not status["up_to_date"]:
+        raise SchemaOutOfDateError(
+            f"Database schema is at {status['current'] or 'no revision'}, "
+            f"code expects {status['head']}. Run: python scripts/migrate.py"
+        )
+    return status
@@ -1,101 +1,155 @@
 """
-Feature gate decorators for enforcing subscription requirements on API endpoints.
+Feature gate dependencies for enforcing subscription requirements on API endpoints.
 Allows fine-grained control over which subscription tiers can access which features.
 """
 
-from functools import wraps
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, Request, status, Depends
 from sqlalchemy.orm import Session
-from typing import Callable, List, Optional
+from typing import Callable, Optional
 
 from app.config.database import get_db
 from app.models.user import User, SubscriptionTier
 from app.api.routes.auth import verify_jwt_token
 
 
-def get_user_from_request(request, db: Session) -> Optional[User]:
-    """Extract user from request Authorization header."""
+class AuthContext:
+    """
+    Who is making the request, resolved once per request.
+
+    The bearer token is decoded up front (no DB access); the User row is
+    loaded on first use through the request's own session, so routes that
+    only need the caller's id never touch the users table.
+    """
+
+    def __init__(self, db: Optional[Session] = None, user_id: Optional[str] = None,
+                 email: Optional[str] = None, error: Optional[str] = None):
+        """
+        Args:
+            db: Request-scoped session used to load the user
+            user_id: User id from a valid token (None = anonymous)
+            email: Email claim from the token
+            error: Why a presented token was rejected, for the 401 detail
+        """
+        self.db = db
+        self.user_id = user_id
+        self.email = email
+        self.error = error
+        self._user: Optional[User] = None
+        self._user_loaded = False
+
+    @classmethod
+    def anonymous(cls) -> "AuthContext":
+        return cls()
+
+    @property
+    def authenticated(self) -> bool:
+        return self.user_id is not None
+
+    @property
+    def user(self) -> Optional[User]:
+        """The authenticated User, or None (anonymous or deleted account)."""
+        if not self._user_loaded:
+            self._user_loaded = True
+            if self.user_id is not None and self.db is not None:
+                self._user = self.db.get(User, self.user_id)
+        return self._user
+
+    @property
+    def effective_tier(self) -> SubscriptionTier:
+        return self.user.effective_tier if self.user is not None else SubscriptionTier.FREE
+
+
+def resolve_auth_context(request: Request, db: Optional[Session]) -> AuthContext:
+    """Decode the Authorization header once and cache the result on request.state."""
+    auth = getattr(request.state, "auth", None)
+    if auth is not None:
+        if auth.db is None and db is not None:
+            auth.db = db
+        return auth
+
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
-        return None
-    
-    token = auth_header.replace("Bearer ", "")
-    try:
-        payload = verify_jwt_token(token)
-        user_id = payload.get("user_id")
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
-    except Exception:
-        return None
+        auth = AuthContext(db)
+    else:
+        try:
+            payload = verify_jwt_token(auth_header.replace("Bearer ", ""))
+            auth = AuthContext(db, user_id=payload.get("user_id"), email=payload.get("email"))
+        except HTTPException as e:
+            auth = AuthContext(db, error=e.detail)
+
+    request.state.auth = auth
+    return auth
+
+
+def get_auth_context(request: Request, db: Session = Depends(get_db)) -> AuthContext:
+    """FastAPI dependency: the per-request auth context, sharing the route's session."""
+    return resolve_auth_context(request, db)
+
+
+def get_user_from_request(request: Request, db: Session) -> Optional[User]:
+    """Extract user from request Authorization header."""
+    return resolve_auth_context(request, db).user
 
 
-def require_subscription(*allowed_tiers: str):
+def require_user(auth: AuthContext = Depends(get_auth_context)) -> User:
     """
-    Decorator to enforce subscription requirements on endpoints.
+    FastAPI dependency returning the authenticated user.
+
+    Raises:
+        HTTPException(401): If there is no valid token or the user no longer exists
+    """
+    user = auth.user
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=auth.error or "Not authenticated"
+        )
+    return user
+
+
+def require_subscription(*allowed_tiers: str) -> Callable[..., User]:
+    """
+    Build a dependency enforcing subscription requirements on endpoints.
     
     Usage:
-        @require_subscription("premium", "pro")
-        async def get_daily_insights(user_id: str):
+        @router.get("/insights")
+        async def get_daily_insights(user: User = Depends(require_subscription("premium", "pro"))):
             # Only premium and pro users can access
             ...
     
     Args:
         *allowed_tiers: List of allowed subscription tiers (e.g., "premium", "pro", "free")
     
+    Returns:
+        Dependency resolving to the authenticated User
+    
     Raises:
+        HTTPException(401): If not authenticated
         HTTPException(403): If user's tier is not in allowed_tiers
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, request=None, db: Session = None, **kwargs):
-            # Handle dependency injection
-            if db is None:
-                # Get db from dependencies if not passed
-                from app.config.database import SessionLocal
-                db = SessionLocal()
-            
-            # Extract user from request
-            user = get_user_from_request(request, db)
-            
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Not authenticated"
-                )
-            
-            # Check subscription tier
-            if user.subscription_tier.value not in allowed_tiers:
+    def dependency(user: User = Depends(require_user)) -> User:
+        # Check subscription tier (effective_tier is FREE once a subscription lapses)
+        if user.effective_tier.value not in allowed_tiers:
+            if user.subscription_tier.value in allowed_tiers:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"This feature requires one of: {', '.join(allowed_tiers)}. "
-                           f"Your tier: {user.subscription_tier.value}. Upgrade to unlock.",
-                    headers={"X-Subscription-Tier": user.subscription_tier.value}
+                    detail="Your subscription has expired. Renew to continue.",
+                    headers={"X-Subscription-Expired": "true"}
                 )
-            
-            # Check if subscription is active (not expired)
-            if user.subscription_tier != SubscriptionTier.FREE:
-                if not user.is_premium and not user.is_pro:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Your subscription has expired. Renew to continue.",
-                        headers={"X-Subscription-Expired": "true"}
-                    )
-            
-            # Call original function
-            return await func(*args, request=request, db=db, **kwargs)
-        
-        return wrapper
-    return decorator
-
-
-def require_premium(func: Callable):
-    """Shorthand decorator for premium-only features."""
-    return require_subscription("premium", "pro")(func)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"This feature requires one of: {', '.join(allowed_tiers)}. "
+                       f"Your tier: {user.effective_tier.value}. Upgrade to unlock.",
+                headers={"X-Subscription-Tier": user.effective_tier.value}
+            )
+        return user
+    
+    return dependency
 
 
-def require_pro(func: Callable):
-    """Shorthand decorator for pro-only features."""
-    return require_subscription("pro")(func)
+# Shorthand dependencies: Depends(require_premium) / Depends(require_pro)
+require_premium = require_subscription("premium", "pro")
+require_pro = require_subscription("pro")
 
 
 class SubscriptionRequired(Exception):
@@ -146,12 +200,12 @@ def check_reading_limit(user: User, db: Session) -> tuple[bool, int]:
         tuple: (is_allowed, remaining_reads)
     """
     from datetime import datetime, timedelta
-    from app.models.user import Reading
+    from app.models.reading import Reading
     
     # Premium and pro users have unlimited reads
-    if user.subscription_tier == SubscriptionTier.PREMIUM:
+    if user.effective_tier == SubscriptionTier.PREMIUM:
         return True, 999
-    if user.subscription_tier == SubscriptionTier.PRO:
+    if user.effective_tier == SubscriptionTier.PRO:
         return True, 999
     
     # Check free tier limit (3 per month)
@@ -0,0 +1,184 @@
+"""
+Background component health checks behind /health, /health/live and /health/ready.
+
+Probes never touch the database: a background task per worker checks the
+components every HEALTH_CHECK_INTERVAL_SECONDS and the endpoints serve the
+last result.
+
+- database   SELECT 1 on the primary (the only check that does I/O)
+- pools      checked-out connections vs. capacity, from the pool counters
+- scheduler  NotificationScheduler.is_running, leader/standby role and job count
+- firebase   whether the Admin SDK initialized (optional in development)
+
+Readiness needs a recent successful database check; a stopped scheduler,
+missing Firebase or saturated pool only degrade the status.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "15"))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
+# A pool this full (checked out / (size + max_overflow)) is reported as saturated
+HEALTH_POOL_SATURATION_THRESHOLD = float(os.getenv("HEALTH_POOL_SATURATION_THRESHOLD", "0.9"))
+
+
+def _check_database() -> Dict:
+    from sqlalchemy import text
+
+    from app.config.database import engine
+
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+    except Exception as e:
+        logger.error(f"Database health check failed: {str(e)}")
+        return {"status": "down", "error": str(e)[:200]}
+
+
+def _check_pools() -> Dict:
+    from app.config.database import get_pool_stats
+
+    pools = {}
+    saturated = False
+    for name, stats in get_pool_stats().items():
+        entry = {"checked_out": stats.get("checked_out"), "timeouts": stats.get("timeouts", 0)}
+        if "size" in stats:
+            capacity = stats["size"] + max(stats["max_overflow"], 0)
+            entry["capacity"] = capacity
+            entry["saturation"] = round(stats["checked_out"] / capacity, 3) if capacity else 0.0
+            saturated = saturated or entry["saturation"] >= HEALTH_POOL_SATURATION_THRESHOLD
+        pools[name] = entry
+    return {"status": "saturated" if saturated else "ok", "pools": pools}
+
+
+def _check_scheduler() -> Dict:
+    from app.services.notification_scheduler import get_notification_scheduler
+
+    scheduler = get_notification_scheduler()
+    if not scheduler.is_running:
+        return {"status": "stopped"}
+    if not scheduler.is_leader:
+        # Another worker runs the jobs; this one takes over if it dies
+        return {"status": "ok", "role": "standby"}
+    # job_ids, not get_jobs(): the job store is a database read
+    return {"status": "ok", "role": "leader", "jobs": len(scheduler.job_ids)}
+
+
+def _check_firebase() -> Dict:
+    from app.services.firebase_admin_service import FirebaseAdminService
+
+    return {"status": "ok" if FirebaseAdminService._initialized else "not_configured"}
+
+
+class HealthMonitor:
+    """Caches component health, refreshed by a background task."""
+
+    def __init__(
+        self,
+        interval: float = HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.components: Dict[str, Dict] = {}
+        self.checked_at: Optional[float] = None  # time.monotonic() of the last refresh
+        self.checked_at_utc: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> Dict[str, Dict]:
+        """Run every check once (the DB check off the event loop) and cache the result."""
+        loop = asyncio.get_running_loop()
+        try:
+            database = await asyncio.wait_for(
+                loop.run_in_executor(None, _check_database), self.timeout
+            )
+        except asyncio.TimeoutError:
+            database = {"status": "down", "error": f"no response within {self.timeout}s"}
+
+        components = {"database": database}
+        for name, check in (("pools", _check_pools), ("scheduler", _check_scheduler), ("firebase", _check_firebase)):
+            try:
+                components[name] = check()
+            except Exception as e:
+                components[name] = {"status": "error", "error": str(e)[:200]}
+
+        self.components = components
+        self.checked_at = time.monotonic()
+        self.checked_at_utc = datetime.utcnow()
+        return components
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health check refresh failed: {str(e)}")
+
+    async def start(self) -> Dict[str, Dict]:
+        """Check once now, then keep checking in the background."""
+        components = await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return components
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def readiness(self) -> Tuple[bool, Dict]:
+        """
+        Whether this worker should receive traffic, from cached results only.
+
+        Returns:
+            (ready, report). Not ready before the first check, when the last
+            database check failed, or when results are older than three
+            intervals (the background checker has stalled).
+        """
+        if self.checked_at is None:
+            return False, {"status": "starting", "components": {}}
+
+        age = time.monotonic() - self.checked_at
+        stale = age > 3 * self.interval
+        ready = not stale and self.components.get("database", {}).get("status") == "ok"
+        degraded = any(c.get("status") != "ok" for c in self.components.values())
+
+        if not ready:
+            status = "unavailable"
+        elif degraded:
+            status = "degraded"
+        else:
+            status = "healthy"
+        return ready, {
+            "status": status,
+            "checked_at": self.checked_at_utc.isoformat() + "Z",
+            "age_seconds": round(age, 1),
+            "stale": stale,
+            "components": self.components,
+        }
+
+
+# Singleton instance
+_health_monitor: Optional[HealthMonitor] = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get or create the health monitor instance."""
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = HealthMonitor()
+    return _health_monitor
@@ -0,0 +1,250 @@
+"""
+Prometheus metrics for the API, served at /metrics.
+
+Multi-process safe under gunicorn: when PROMETHEUS_MULTIPROC_DIR is set
+(before the first import of prometheus_client, i.e. in the environment of
+the gunicorn master) every worker writes its samples to mmap'd files in
+that directory and /metrics aggregates all of them, whichever worker
+answers the scrape. The directory must be emptied when the server starts
+and dead workers should be reported with mark_worker_dead().
+
+Recording is a dict lookup plus an mmap write per sample, a few
+microseconds per request, so it stays on in production.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_PATH = "/metrics"
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PDF_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Requests that matched no route share one label so scanners can't blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _metric(metric_class, name: str, documentation: str, labelnames, **kwargs):
+    # The backend is importable as both `app` and `backend.app`; a second copy
+    # of this module must reuse the registered collectors, not register them again
+    try:
+        return metric_class(name, documentation, labelnames, **kwargs)
+    except ValueError:
+        return REGISTRY._names_to_collectors[name]
+
+
+# HTTP
+HTTP_REQUESTS = _metric(
+    Counter, "http_requests_total", "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = _metric(
+    Histogram, "http_request_duration_seconds", "Time to produce the full response, by route template",
+    ["method", "route"], buckets=HTTP_BUCKETS,
+)
+HTTP_IN_PROGRESS = _metric(
+    Gauge, "http_requests_in_progress", "Requests currently being handled",
+    ["method"], multiprocess_mode="livesum",
+)
+
+# Database pools (see app.config.database.PoolMetrics)
+DB_POOL_CHECKED_OUT = _metric(
+    Gauge, "db_pool_checked_out_connections", "Connections currently checked out of the pool",
+    ["pool"], multiprocess_mode="livesum",
+)
+DB_POOL_EVENTS = _metric(
+    Counter, "db_pool_events_total", "Pool connects, checkouts, checkins and timeouts",
+    ["pool", "event"],
+)
+DB_POOL_WAIT = _metric(
+    Histogram, "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    ["pool"], buckets=POOL_WAIT_BUCKETS,
+)
+
+# In-process caches; hit ratio = hit / (hit + miss)
+CACHE_REQUESTS = _metric(
+    Counter, "cache_requests_total", "Cache lookups by outcome",
+    ["cache", "result"],
+)
+
+# PDF rendering runs inline in the export routes; in-progress renders are the queue
+PDF_RENDERS_IN_PROGRESS = _metric(
+    Gauge, "pdf_renders_in_progress", "PDF documents currently being rendered",
+    ["kind"], multiprocess_mode="livesum",
+)
+PDF_RENDER_DURATION = _metric(
+    Histogram, "pdf_render_duration_seconds", "Time to render a PDF document",
+    ["kind"], buckets=PDF_BUCKETS,
+)
+
+# Scheduler
+SCHEDULER_JOB_DURATION = _metric(
+    Histogram, "scheduler_job_duration_seconds", "Scheduled job run time",
+    ["job"], buckets=JOB_BUCKETS,
+)
+SCHEDULER_JOB_RUNS = _metric(
+    Counter, "scheduler_job_runs_total", "Scheduled job runs by outcome (success, error, missed)",
+    ["job", "outcome"],
+)
+# 1 in the worker leading the scheduler; summed over workers it should be exactly 1
+SCHEDULER_LEADER = _metric(
+    Gauge, "scheduler_leader", "Whether this process is the notification scheduler leader",
+    [], multiprocess_mode="livesum",
+)
+
+# Push notifications
+FCM_MESSAGES = _metric(
+    Counter, "fcm_messages_total", "FCM messages by send kind and result",
+    ["kind", "result"],
+)
+OUTBOX_DELIVERIES = _metric(
+    Counter, "notification_outbox_deliveries_total",
+    "Outbox delivery attempts by provider and outcome (sent, retry, dead)",
+    ["provider", "outcome"],
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, status codes and
+    in-flight requests.
+
+    Routes are labelled by their template ("/content/articles/{slug}"), read
+    from the scope after FastAPI has matched the request, so path parameters
+    never become label values.
+    """
+
+    def __init__(self, app, enabled: bool = METRICS_ENABLED):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def _send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            HTTP_LATENCY.labels(method, template).observe(elapsed)
+            HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
+
+
+@contextmanager
+def track_pdf_render(kind: str) -> Iterator[None]:
+    """
+    Count a PDF render as in progress and time it.
+
+    Args:
+        kind: Which document is rendered (e.g. "report", "reading", "compatibility")
+    """
+    in_progress = PDF_RENDERS_IN_PROGRESS.labels(kind)
+    in_progress.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PDF_RENDER_DURATION.labels(kind).observe(time.perf_counter() - started)
+        in_progress.dec()
+
+
+def cache_lookup_counters(cache: str):
+    """(hit, miss) counters for a cache, bound once so lookups skip the label lookup."""
+    return CACHE_REQUESTS.labels(cache, "hit"), CACHE_REQUESTS.labels(cache, "miss")
+
+
+def record_fcm_result(kind: str, successful: int, failed: int) -> None:
+    if successful:
+        FCM_MESSAGES.labels(kind, "success").inc(successful)
+    if failed:
+        FCM_MESSAGES.labels(kind, "failure").inc(failed)
+
+
+def instrument_scheduler(scheduler) -> None:
+    """
+    Record run time and outcome of every job on an APScheduler scheduler.
+
+    A run is timed from submission to the executor until it finishes, so the
+    job functions themselves need no instrumentation.
+    """
+    from apscheduler.events import (
+        EVENT_JOB_ERROR,
+        EVENT_JOB_EXECUTED,
+        EVENT_JOB_MISSED,
+        EVENT_JOB_SUBMITTED,
+    )
+
+    started = {}
+
+    def _listener(event):
+        key = (event.job_id, event.jobstore)
+        if event.code == EVENT_JOB_SUBMITTED:
+            started[key] = time.perf_counter()
+            return
+        if event.code == EVENT_JOB_MISSED:
+            SCHEDULER_JOB_RUNS.labels(event.job_id, "missed").inc()
+            return
+        began = started.pop(key, None)
+        if began is not None:
+            SCHEDULER_JOB_DURATION.labels(event.job_id).observe(time.perf_counter() - began)
+        outcome = "error" if event.code == EVENT_JOB_ERROR else "success"
+        SCHEDULER_JOB_RUNS.labels(event.job_id, outcome).inc()
+
+    scheduler.add_listener(
+        _listener, EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+    )
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text format.
+
+    Returns:
+        (body, content type). In multi-process mode the body aggregates every
+        worker's samples from PROMETHEUS_MULTIPROC_DIR.
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=PROMETHEUS_MULTIPROC_DIR)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (call from gunicorn's child_exit hook)."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid, PROMETHEUS_MULTIPROC_DIR)
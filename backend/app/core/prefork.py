@@ -0,0 +1,79 @@
+"""
+Shared warm state for preforked workers (gunicorn with preload_app).
+
+The master imports main, runs warm_shared_state() and freezes the heap
+before forking, so the read-only data every worker needs exists once and
+is shared copy-on-write:
+
+- interpretation tables (including the daily insight and cycle texts)
+- content articles, pinned for the life of the process
+- reportlab, the PDF export stylesheets and the standard font metrics
+- the analytics dashboard templates
+
+gc.freeze() moves everything allocated so far into the permanent
+generation. Without it, the first collection in each worker would walk
+(and write the GC header of) every shared object, copying most of those
+pages anyway.
+
+Nothing per-worker is created here. DB connections, the notification
+scheduler, the health checker and HTTP clients are opened after the
+fork; see gunicorn.conf.py.
+"""
+
+import gc
+import importlib
+import sys
+import time
+from typing import Dict
+
+SHARED_MODULES = (
+    "app.interpretations.cycle_interpretations",
+    "app.interpretations.daily_insights",
+    "app.services.pdf_service",
+    "app.services.compatibility_pdf_service",
+    "app.services.pdf_export",
+)
+# Standard fonts the PDF styles use; reportlab loads their metrics on first use
+PDF_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique", "Times-Roman")
+
+
+def warm_shared_state() -> Dict:
+    """
+    Load the immutable data workers would otherwise each build on first use.
+
+    Returns:
+        What was loaded: article count, loaded module count and seconds taken
+    """
+    started = time.perf_counter()
+    for name in SHARED_MODULES:
+        importlib.import_module(name)
+
+    from reportlab.pdfbase import pdfmetrics
+
+    from app.api.routes.analytics import get_templates
+    from app.services.content_service import content_service
+    from app.services.pdf_export import get_pdf_export_service
+
+    for font in PDF_FONTS:
+        pdfmetrics.getFont(font)
+    get_pdf_export_service()
+    get_templates()
+    articles = content_service.preload()
+
+    return {
+        "articles": articles,
+        "modules": len(sys.modules),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def freeze_shared_state() -> int:
+    """
+    Exempt everything allocated so far from garbage collection (call right
+    before forking).
+
+    Returns:
+        Number of objects in the permanent generation
+    """
+    gc.freeze()
+    return gc.get_freeze_count()
@@ -0,0 +1,205 @@
+"""
+Opt-in profiling for diagnosing latency in a running server.
+
+Everything here is off unless PROFILING_TOKEN is set, and only callers
+presenting that token in the X-Profile header can use it:
+
+- Per-request: a request carrying the token is run under cProfile (for
+  PROFILING_SAMPLE_RATE of such requests, one at a time per worker). The
+  profile is written to PROFILING_DIR as <id>.prof, and the id comes back
+  in the X-Profile-Id response header. Inspect the file with
+  `python -m pstats`, snakeviz or similar. cProfile follows the event
+  loop thread, so any other requests running concurrently on it are
+  included.
+- Aggregated: POST /admin/profiling/flamegraph samples every thread's
+  stack for a few seconds. The collapsed stacks are written as
+  <id>.folded, which flamegraph.pl or speedscope.app can read.
+
+Both only ever cover the worker process that handled the request.
+"""
+
+import asyncio
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN") or None
+PROFILING_HEADER = "X-Profile"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "1.0"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(tempfile.gettempdir(), "destiny-profiles"))
+
+# Frames where a thread is parked rather than working; left out of flame graphs
+_IDLE_LEAVES = {("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get")}
+
+
+def is_profiling_token(value: Optional[str], token: Optional[str] = None) -> bool:
+    """True if profiling is enabled and `value` is the configured token."""
+    expected = token if token is not None else PROFILING_TOKEN
+    return bool(expected and value) and hmac.compare_digest(value.encode(), expected.encode())
+
+
+def new_profile_id(label: str = "") -> str:
+    """Sortable, unique file stem for a dump, e.g. 20261019-101500-decode-full-1a2b3c4d."""
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", label).strip("-")[:60]
+    parts = [time.strftime("%Y%m%d-%H%M%S"), slug, uuid.uuid4().hex[:8]]
+    return "-".join(part for part in parts if part)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware running token-bearing requests under cProfile.
+    Requests without the header (or with a wrong token) are untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        token: Optional[str] = PROFILING_TOKEN,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        output_dir: str = PROFILING_DIR,
+    ):
+        self.app = app
+        self.token = token
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self._header = PROFILING_HEADER.lower().encode()
+        # cProfile can't nest on one thread; concurrent requests just aren't profiled
+        self._busy = threading.Lock()
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope.get("headers", ()):
+            if name == self._header:
+                return is_profiling_token(value.decode("latin-1"), self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.token
+            or scope["type"] != "http"
+            or not self._requested(scope)
+            or random.random() >= self.sample_rate
+            or not self._busy.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id(f"{scope['method']} {scope['path']}")
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [
+                    *message.get("headers", []), (b"x-profile-id", profile_id.encode()),
+                ]}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                profiler.disable()
+        finally:
+            self._busy.release()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{profile_id}.prof")
+        profiler.dump_stats(path)
+        logger.info(f"Profiled {scope['method']} {scope['path']} -> {path}")
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler: a background thread records every other
+    thread's Python stack each `interval` seconds and counts identical
+    stacks, producing the "folded" format flame graph tools read.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def dump(self, path: str) -> None:
+        """Write "frame;frame;frame count" lines (flamegraph.pl / speedscope)."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+async def capture_flame_graph(
+    seconds: float, interval: float = 0.005, output_dir: str = PROFILING_DIR
+) -> Tuple[str, int]:
+    """
+    Sample this worker's stacks for `seconds` and write a folded flame graph.
+
+    Returns:
+        (path of the .folded file, number of sampling ticks)
+    """
+    sampler = StackSampler(interval)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{new_profile_id('flamegraph')}.folded")
+    sampler.dump(path)
+    return path, sampler.samples
+
+
+def list_dumps(output_dir: str = PROFILING_DIR) -> list[Dict]:
+    """Profiles and flame graphs on disk, newest first."""
+    if not os.path.isdir(output_dir):
+        return []
+    dumps = []
+    for name in os.listdir(output_dir):
+        if name.endswith((".prof", ".folded")):
+            stat = os.stat(os.path.join(output_dir, name))
+            dumps.append({"name": name, "bytes": stat.st_size, "modified": stat.st_mtime})
+    return sorted(dumps, key=lambda d: d["modified"], reverse=True)
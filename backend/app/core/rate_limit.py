@@ -0,0 +1,412 @@
+"""
+Token-bucket rate limiting shared across workers.
+
+Each caller (authenticated user, else client IP) gets a bucket sized by
+their subscription tier. Bucket state lives in a pluggable storage picked
+by RATE_LIMIT_STORAGE:
+
+- sqlite:///path  one file shared by every worker on the host (default)
+- redis://...     shared across hosts (needs the optional `redis` package)
+- memory://       per-process, for development and tests
+
+Storage errors and slow storage fail open: a request is never rejected or
+held up for more than the storage timeout because the limiter is unhealthy.
+"""
+
+import logging
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.models.user import SubscriptionTier
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_STORAGE = os.getenv(
+    "RATE_LIMIT_STORAGE",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'destiny-rate-limits.db')}",
+)
+# Upper bound a storage call may add to a request before failing open
+RATE_LIMIT_STORAGE_TIMEOUT_MS = int(os.getenv("RATE_LIMIT_STORAGE_TIMEOUT_MS", "50"))
+RATE_LIMIT_TIER_CACHE_SECONDS = float(os.getenv("RATE_LIMIT_TIER_CACHE_SECONDS", "60"))
+# X-Forwarded-For entries appended by our own proxies. When set, anonymous
+# callers are keyed on the entry that many places from the right (the
+# address the outermost trusted proxy saw) instead of request.client, so
+# entries a client writes into the header itself are never used
+RATE_LIMIT_PROXY_HOPS = int(os.getenv("RATE_LIMIT_PROXY_HOPS", "0"))
+RATE_LIMIT_EXEMPT_PATHS = tuple(
+    path.strip() for path in os.getenv(
+        "RATE_LIMIT_EXEMPT_PATHS", "/health,/metrics,/docs,/redoc,/openapi.json"
+    ).split(",") if path.strip()
+)
+
+# Tier -> "requests/period"; the bucket holds that many tokens and refills evenly
+TIER_LIMITS = {
+    "anonymous": os.getenv("RATE_LIMIT_ANONYMOUS", "60/minute"),
+    SubscriptionTier.FREE.value: os.getenv("RATE_LIMIT_FREE", "100/minute"),
+    SubscriptionTier.PREMIUM.value: os.getenv("RATE_LIMIT_PREMIUM", "300/minute"),
+    SubscriptionTier.PRO.value: os.getenv("RATE_LIMIT_PRO", "600/minute"),
+}
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A bucket of `capacity` tokens refilled over `period` seconds."""
+    capacity: int
+    period: int
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    def __str__(self) -> str:
+        return f"{self.capacity} per {self.period} seconds"
+
+
+def parse_rate_limit(value: str) -> RateLimit:
+    """
+    Parse "100/minute" (or "100 per minute", "5/second", "1000/hour", "10000/day").
+
+    Raises:
+        ValueError: If the string is not a rate limit
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*(?:/|per)\s*(second|minute|hour|day)s?\s*", value)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    return RateLimit(int(match.group(1)), _PERIODS[match.group(2)])
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of taking a token from a bucket."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until a token is available (0 if allowed)
+    reset_after: float  # seconds until the bucket is full again
+
+
+def _result(limit: RateLimit, allowed: bool, tokens: float, cost: int) -> RateLimitResult:
+    rate = limit.refill_rate
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit.capacity,
+        remaining=max(0, int(tokens)),
+        retry_after=0.0 if allowed else max(0.0, (cost - tokens) / rate),
+        reset_after=max(0.0, (limit.capacity - tokens) / rate),
+    )
+
+
+class TokenBucketStorage(ABC):
+    """Atomically refills and takes tokens from named buckets."""
+
+    # Whether consume() does I/O and should run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def consume(self, key: str, limit: RateLimit, cost: int = 1, now: Optional[float] = None) -> RateLimitResult:
+        """Refill the bucket for the time since its last use, then take `cost` tokens if it holds them."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop every bucket (tests and admin use)."""
+
+
+class MemoryTokenBucketStorage(TokenBucketStorage):
+    """Per-process buckets; least recently used keys are evicted past max_keys."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, limit, cost=1, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(limit.capacity), now))
+            tokens = min(float(limit.capacity), tokens + max(0.0, now - updated) * limit.refill_rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return _result(limit, allowed, tokens, cost)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteTokenBucketStorage(TokenBucketStorage):
+    """
+    Buckets in a SQLite file shared by every worker process on the host.
+
+    One UPSERT ... RETURNING per request does the refill and take atomically;
+    the SET expressions all see the row's previous values.
+    """
+
+    blocking = True
+
+    _UPSERT = """
+        INSERT INTO rate_limit_buckets (key, tokens, updated, allowed)
+        VALUES (:key, :capacity - :cost, :now, 1)
+        ON CONFLICT(key) DO UPDATE SET
+            tokens = CASE
+                WHEN MIN(:capacity, tokens + MAX(0, :now - updated) * :rate) >= :cost
+                THEN MIN(:capacity, tokens + MAX(0, :now - updated) * :rate) - :cost
+                ELSE MIN(:capacity, tokens + MAX(0, :now - updated) * :rate)
+            END,
+            allowed = MIN(:capacity, tokens + MAX(0, :now - updated) * :rate) >= :cost,
+            updated = :now
+        RETURNING tokens, allowed
+    """
+
+    def __init__(self, path: str, timeout_ms: int = RATE_LIMIT_STORAGE_TIMEOUT_MS):
+        self.path = path
+        self.timeout_ms = timeout_ms
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, allowed INTEGER NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout_ms / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Bucket state is disposable; don't pay for fsyncs
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def consume(self, key, limit, cost=1, now=None):
+        now = time.time() if now is None else now
+        tokens, allowed = self._connection().execute(self._UPSERT, {
+            "key": key, "capacity": limit.capacity, "cost": cost,
+            "now": now, "rate": limit.refill_rate,
+        }).fetchone()
+        return _result(limit, bool(allowed), tokens, cost)
+
+    def reset(self):
+        self._connection().execute("DELETE FROM rate_limit_buckets")
+
+
+class RedisTokenBucketStorage(TokenBucketStorage):
+    """Buckets in Redis (or any server speaking its protocol and Lua), shared across hosts."""
+
+    blocking = True
+
+    _SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local cost = tonumber(ARGV[4])
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        local allowed = 0
+        if tokens >= cost then
+            tokens = tokens - cost
+            allowed = 1
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str = None, client=None, prefix: str = "ratelimit:",
+                 timeout_ms: int = RATE_LIMIT_STORAGE_TIMEOUT_MS):
+        """
+        Args:
+            url: redis:// URL (ignored when client is given)
+            client: Existing redis.Redis-compatible client
+            prefix: Key prefix for bucket hashes
+        """
+        if client is None:
+            import redis  # optional dependency
+
+            client = redis.Redis.from_url(
+                url, socket_timeout=timeout_ms / 1000, socket_connect_timeout=timeout_ms / 1000
+            )
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self._SCRIPT)
+
+    def consume(self, key, limit, cost=1, now=None):
+        now = time.time() if now is None else now
+        allowed, tokens = self._script(
+            keys=[self.prefix + key], args=[limit.capacity, limit.refill_rate, now, cost]
+        )
+        return _result(limit, bool(int(allowed)), float(tokens), cost)
+
+    def reset(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+def create_storage(url: str = RATE_LIMIT_STORAGE) -> TokenBucketStorage:
+    """Storage for a RATE_LIMIT_STORAGE URL; falls back to memory if it can't be opened."""
+    try:
+        if url.startswith("memory://"):
+            return MemoryTokenBucketStorage()
+        if url.startswith("sqlite:///"):
+            return SQLiteTokenBucketStorage(url[len("sqlite:///"):])
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            return RedisTokenBucketStorage(url)
+        raise ValueError(f"Unsupported RATE_LIMIT_STORAGE: {url}")
+    except Exception as e:
+        logger.warning(f"⚠ Rate limit storage unavailable ({str(e)}), using per-process memory")
+        return MemoryTokenBucketStorage()
+
+
+def lookup_effective_tier(user_id: str) -> Optional[SubscriptionTier]:
+    """Current effective tier for a user id (None if the user doesn't exist)."""
+    from sqlalchemy import select
+    from app.config.database import ReadSessionLocal
+    from app.models.user import User
+
+    db = ReadSessionLocal()
+    try:
+        return db.execute(select(User.effective_tier).where(User.id == user_id)).scalar_one_or_none()
+    finally:
+        db.close()
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-tier token buckets and X-RateLimit-* headers.
+
+    The caller is identified from the request's AuthContext (decoded once and
+    left on request.state for the route to reuse). Tiers are cached in-process
+    for RATE_LIMIT_TIER_CACHE_SECONDS so the limiter itself adds no DB query
+    to most requests.
+    """
+
+    def __init__(
+        self,
+        app,
+        storage: Optional[TokenBucketStorage] = None,
+        limits: Optional[Dict[str, str]] = None,
+        tier_resolver: Callable[[str], Optional[SubscriptionTier]] = lookup_effective_tier,
+        exempt_paths: Tuple[str, ...] = RATE_LIMIT_EXEMPT_PATHS,
+        enabled: bool = RATE_LIMIT_ENABLED,
+        proxy_hops: int = RATE_LIMIT_PROXY_HOPS,
+    ):
+        self.app = app
+        self.storage = storage if storage is not None else create_storage()
+        self.limits = {tier: parse_rate_limit(value) for tier, value in (limits or TIER_LIMITS).items()}
+        self.tier_resolver = tier_resolver
+        self.exempt_paths = exempt_paths
+        self.enabled = enabled
+        self.proxy_hops = proxy_hops
+        self._tier_cache: Dict[str, Tuple[float, str]] = {}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or scope["path"].startswith(self.exempt_paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        key, tier = await self._identify(request)
+        limit = self.limits.get(tier, self.limits["anonymous"])
+        result = await self._consume(key, limit)
+        if result is None:  # storage unavailable: fail open, no headers
+            await self.app(scope, receive, send)
+            return
+
+        headers = self._headers(result)
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+            response = JSONResponse(
+                {"error": f"Rate limit exceeded: {limit}"},
+                status_code=429,
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers.items()
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _identify(self, request: Request) -> Tuple[str, str]:
+        """(bucket key, tier name) for the caller."""
+        from app.core.feature_gates import resolve_auth_context
+
+        auth = resolve_auth_context(request, None)
+        if not auth.authenticated:
+            return f"ip:{self._client_host(request)}", "anonymous"
+        return f"user:{auth.user_id}", await self._tier_for(auth.user_id)
+
+    def _client_host(self, request: Request) -> str:
+        """The anonymous caller's address; see RATE_LIMIT_PROXY_HOPS."""
+        if self.proxy_hops:
+            forwarded = [
+                host.strip() for host in request.headers.get("x-forwarded-for", "").split(",") if host.strip()
+            ]
+            if len(forwarded) >= self.proxy_hops:
+                return forwarded[-self.proxy_hops]
+        return request.client.host if request.client else "unknown"
+
+    async def _tier_for(self, user_id: str) -> str:
+        cached = self._tier_cache.get(user_id)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        try:
+            tier = await run_in_threadpool(self.tier_resolver, user_id)
+        except Exception as e:
+            logger.warning(f"⚠ Rate limit tier lookup failed: {str(e)}")
+            tier = None
+        name = tier.value if tier is not None else SubscriptionTier.FREE.value
+        if len(self._tier_cache) > 100_000:
+            self._tier_cache.clear()
+        self._tier_cache[user_id] = (now + RATE_LIMIT_TIER_CACHE_SECONDS, name)
+        return name
+
+    async def _consume(self, key: str, limit: RateLimit) -> Optional[RateLimitResult]:
+        try:
+            if self.storage.blocking:
+                return await run_in_threadpool(self.storage.consume, key, limit)
+            return self.storage.consume(key, limit)
+        except Exception as e:
+            logger.warning(f"⚠ Rate limit storage error, allowing request: {str(e)}")
+            return None
+
+    @staticmethod
+    def _headers(result: RateLimitResult) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+        }
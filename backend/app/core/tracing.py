@@ -0,0 +1,203 @@
+"""
+Lightweight timing spans on the hot paths, exportable as OpenTelemetry traces.
+
+Spans are written against the OpenTelemetry API and cost a flag check
+until tracing is configured. configure_tracing() (called at startup when
+TRACING_ENABLED or OTEL_EXPORTER_OTLP_ENDPOINT is set) installs the SDK
+tracer provider and ships spans over OTLP/HTTP to a collector, e.g. a
+local otel-collector or Jaeger on http://localhost:4318. The SDK and
+exporter are optional packages:
+
+    pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http
+
+Spanned: each request, calculate_destiny, interpretation lookup, PDF
+generation and build, DB queries and FCM sends.
+"""
+
+import functools
+import logging
+import os
+from contextlib import nullcontext
+
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+logger = logging.getLogger(__name__)
+
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+TRACING_ENABLED = (
+    os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+    or bool(OTEL_EXPORTER_OTLP_ENDPOINT)
+)
+TRACING_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "destiny-decoder-api")
+# Fraction of requests traced (parent-based, so a trace is kept or dropped whole)
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+
+tracer = trace.get_tracer("destiny-decoder")
+_enabled = False
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def configure_tracing(exporter=None, sample_rate: float = TRACING_SAMPLE_RATE) -> bool:
+    """
+    Install the OpenTelemetry SDK tracer provider and start recording spans.
+
+    Args:
+        exporter: SpanExporter to ship spans to; defaults to OTLP/HTTP
+                  (configured by the standard OTEL_EXPORTER_OTLP_* variables)
+        sample_rate: Fraction of traces to keep
+
+    Returns:
+        True if tracing is now active, False if the SDK/exporter is missing
+    """
+    global _enabled
+    if _enabled:
+        return True
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        if exporter is None:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            exporter = OTLPSpanExporter()
+    except ImportError as e:
+        logger.warning(f"⚠ Tracing requested but OpenTelemetry SDK/exporter not installed: {e}")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+    )
+    # Exporting happens on the processor's thread, never on the request path
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    from app.config.database import engine, read_engines
+
+    for db_engine in {id(e): e for e in [engine, *read_engines]}.values():
+        instrument_engine(db_engine)
+
+    _enabled = True
+    logger.info(f"✓ Tracing enabled ({TRACING_SERVICE_NAME}, sample rate {sample_rate})")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush spans still buffered in the batch processor."""
+    provider = trace.get_tracer_provider()
+    if _enabled and hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+
+def span(name: str, **attributes):
+    """
+    Context manager timing a block as a span (a no-op until tracing is configured).
+
+    Args:
+        name: Span name, dotted by area (e.g. "pdf.build", "fcm.send")
+        **attributes: Span attributes
+    """
+    if not _enabled:
+        return nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def traced(name: str, **attributes):
+    """Decorator form of span() for a whole function."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with tracer.start_as_current_span(name, attributes=attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_engine(db_engine) -> None:
+    """Record a client span per statement executed on an engine."""
+    from sqlalchemy import event
+
+    pool_name = db_engine.pool.logging_name or "default"
+
+    @event.listens_for(db_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if not _enabled:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        context._trace_span = tracer.start_span(
+            f"db.{operation.lower()}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": db_engine.dialect.name,
+                "db.operation": operation,
+                "db.statement": statement[:1000],
+                "db.pool": pool_name,
+            },
+        )
+
+    @event.listens_for(db_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        current = getattr(context, "_trace_span", None)
+        if current is not None:
+            current.end()
+            context._trace_span = None
+
+    @event.listens_for(db_engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        current = getattr(context, "_trace_span", None) if context is not None else None
+        if current is not None:
+            current.record_exception(exception_context.original_exception)
+            current.set_status(Status(StatusCode.ERROR))
+            current.end()
+            context._trace_span = None
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening a server span per request, so the spans
+    above nest under the request that caused them. Named "METHOD /route/{param}"
+    once the route is known.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not _enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def _send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]},
+        ) as request_span:
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    request_span.update_name(f"{method} {route}")
+                    request_span.set_attribute("http.route", route)
+                request_span.set_attribute("http.status_code", status_code)
+                if status_code >= 500:
+                    request_span.set_status(Status(StatusCode.ERROR))
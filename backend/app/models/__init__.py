@@ -7,6 +7,11 @@ from app.models.share_log import ShareLog
 from app.models.user import User, SubscriptionTier
 from app.models.subscription_history import SubscriptionHistory, SubscriptionStatus
 from app.models.reading import Reading
+from app.models.user_profile import UserProfile
+from app.models.daily_precompute import DailyPrecompute
+from app.models.scheduler_job_run import SchedulerJobRun
+from app.models.scheduler_job import scheduler_jobs
+from app.models.notification_outbox import NotificationOutbox
 
 __all__ = [
     "Device", 
@@ -16,5 +21,10 @@ __all__ = [
     "SubscriptionTier",
     "SubscriptionHistory",
     "SubscriptionStatus",
-    "Reading"
+    "Reading",
+    "UserProfile",
+    "DailyPrecompute",
+    "SchedulerJobRun",
+    "scheduler_jobs",
+    "NotificationOutbox"
 ]
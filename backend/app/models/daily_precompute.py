@@ -0,0 +1,42 @@
+"""
+DailyPrecompute model for per-user daily numbers computed ahead of time.
+"""
+from sqlalchemy import Column, String, Date, DateTime, Boolean, SmallInteger, ForeignKey
+from datetime import datetime
+from app.config.database import Base
+
+
+class DailyPrecompute(Base):
+    """
+    One row per (profile, date) with the user's daily numbers.
+    Written in bulk by the nightly precompute job so the dashboard and
+    notification paths read a single row instead of recomputing.
+    """
+    __tablename__ = "daily_precompute"
+
+    # Composite primary key: profile + calendar date
+    profile_id = Column(String, ForeignKey("user_profiles.id", ondelete="CASCADE"), primary_key=True)
+    target_date = Column(Date, primary_key=True, index=True)
+
+    # Daily numbers
+    power_number = Column(SmallInteger, nullable=False)  # 1-9
+    is_blessed_day = Column(Boolean, nullable=False)
+    personal_year = Column(SmallInteger, nullable=False)  # 1-9
+    personal_month = Column(SmallInteger, nullable=False)  # 1-9
+
+    # When the job wrote this row
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DailyPrecompute(profile_id={self.profile_id}, date={self.target_date}, power={self.power_number})>"
+
+    def to_dict(self):
+        """Convert precomputed day to dictionary."""
+        return {
+            "profile_id": self.profile_id,
+            "date": self.target_date.isoformat(),
+            "power_number": self.power_number,
+            "is_blessed_day": self.is_blessed_day,
+            "personal_year": self.personal_year,
+            "personal_month": self.personal_month,
+        }
@@ -1,7 +1,7 @@
 """
 Device model for tracking FCM tokens and device information.
 """
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.config.database import Base
@@ -13,6 +13,16 @@ class Device(Base):
     Tracks device information and token status.
     """
     __tablename__ = "devices"
+    __table_args__ = (
+        # Push fan-out only targets active tokens: partial index skips
+        # deactivated devices entirely
+        Index(
+            "ix_devices_active_user_id",
+            "user_id",
+            postgresql_where=text("active"),
+            sqlite_where=text("active = 1"),
+        ),
+    )
 
     # Primary key - unique device identifier (generated client-side)
     device_id = Column(String(255), primary_key=True, index=True)
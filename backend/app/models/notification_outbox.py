@@ -0,0 +1,79 @@
+"""
+NotificationOutbox model: the durable queue of outbound push notifications.
+"""
+import json
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index
+from datetime import datetime
+from app.config.database import Base
+
+
+class NotificationOutbox(Base):
+    """
+    One notification waiting to be sent, being sent, sent, or given up on.
+
+    Producers (scheduler jobs, API handlers) insert a row and return; the
+    outbox worker on the scheduler leader delivers it, retrying with
+    backoff. Rows that exhaust their attempts or fail permanently stay
+    here as dead letters (status "dead") until requeued.
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # The drain query: status = 'pending' AND next_attempt_at <= now
+        Index("ix_notification_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    # Enqueueing the same key twice yields one notification
+    dedupe_key = Column(String(200), nullable=True, unique=True)
+
+    # Transport that delivers it (fcm)
+    provider = Column(String(20), nullable=False, default="fcm")
+
+    # token | tokens | topic; target is the token, a JSON list of tokens, or the topic
+    target_type = Column(String(20), nullable=False)
+    target = Column(Text, nullable=False)
+
+    title = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    data = Column(Text, nullable=True)  # JSON object of strings
+    image_url = Column(String(500), nullable=True)
+
+    # pending | sending | sent | dead
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+
+    # Worker (host:pid) holding the row while sending, and since when
+    locked_by = Column(String(255), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, status={self.status}, attempts={self.attempts})>"
+
+    @property
+    def targets(self):
+        """Token list of a multicast, else the single token or topic."""
+        return json.loads(self.target) if self.target_type == "tokens" else self.target
+
+    def to_dict(self):
+        """Convert outbox entry to dictionary."""
+        return {
+            "id": self.id,
+            "dedupe_key": self.dedupe_key,
+            "provider": self.provider,
+            "target_type": self.target_type,
+            "title": self.title,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
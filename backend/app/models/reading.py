@@ -1,7 +1,7 @@
 """
 Reading model for storing user destiny readings.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -12,6 +12,10 @@ from app.config.database import Base
 class Reading(Base):
     """User destiny reading storage."""
     __tablename__ = "readings"
+    __table_args__ = (
+        # Monthly quota check: user_id = ? AND created_at >= ?
+        Index("ix_readings_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
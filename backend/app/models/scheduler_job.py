@@ -0,0 +1,20 @@
+"""
+APScheduler's job store table (apscheduler_jobs).
+
+SQLAlchemyJobStore owns the rows: each holds a pickled job and its next
+run time. It would create the table itself; it is declared here so
+Alembic manages it like every other table. The columns must match the
+ones APScheduler defines.
+"""
+from sqlalchemy import Column, Float, LargeBinary, Table, Unicode
+from app.config.database import Base
+
+SCHEDULER_JOBS_TABLE = "apscheduler_jobs"
+
+scheduler_jobs = Table(
+    SCHEDULER_JOBS_TABLE,
+    Base.metadata,
+    Column("id", Unicode(191), primary_key=True),
+    Column("next_run_time", Float(25), index=True),
+    Column("job_state", LargeBinary, nullable=False),
+)
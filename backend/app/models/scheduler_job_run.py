@@ -0,0 +1,59 @@
+"""
+SchedulerJobRun model: the history of scheduled job runs.
+"""
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index
+from app.config.database import Base
+
+
+class SchedulerJobRun(Base):
+    """
+    One row per run (or missed run) of a notification scheduler job.
+    Written by whichever worker held scheduler leadership at the time, so
+    the history shows which process ran each job and how long it took.
+
+    Jobs that send notifications claim a run key, "<job_id>:<date>", by
+    inserting their row before they start. The key is unique, so a run
+    caught up after a restart or a leader change never sends twice.
+    """
+    __tablename__ = "scheduler_job_runs"
+    __table_args__ = (
+        # When one job last finished: job_id = ? ORDER BY finished_at DESC
+        Index("ix_scheduler_job_runs_job_id_finished_at", "job_id", "finished_at"),
+        # One run per key; NULL (jobs that may run again) never conflicts
+        Index("ux_scheduler_job_runs_run_key", "run_key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(100), nullable=False)
+    run_key = Column(String(150), nullable=True)
+
+    # running | success | error | missed
+    status = Column(String(20), nullable=False)
+
+    # Trigger time the run was for, and when it actually ran (UTC)
+    scheduled_for = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True, index=True)
+    duration_ms = Column(Integer, nullable=True)
+
+    error = Column(Text, nullable=True)
+
+    # host:pid of the leader that ran it
+    worker = Column(String(255), nullable=False)
+
+    def __repr__(self):
+        return f"<SchedulerJobRun(job_id={self.job_id}, status={self.status}, finished_at={self.finished_at})>"
+
+    def to_dict(self):
+        """Convert job run to dictionary."""
+        return {
+            "job_id": self.job_id,
+            "run_key": self.run_key,
+            "status": self.status,
+            "scheduled_for": self.scheduled_for.isoformat() if self.scheduled_for else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "worker": self.worker,
+        }
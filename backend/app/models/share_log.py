@@ -1,7 +1,7 @@
 """
 ShareLog model for tracking social shares of readings and life seal cards.
 """
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.config.database import Base
@@ -13,6 +13,12 @@ class ShareLog(Base):
     Tracks which platform, when, and what content was shared.
     """
     __tablename__ = "share_logs"
+    __table_args__ = (
+        # Share stats / top shared: created_at >= ? [AND life_seal_number = ?],
+        # grouped by life seal. A (life_seal_number, ...) index would tempt the
+        # planner into scanning all history to skip the GROUP BY sort.
+        Index("ix_share_logs_created_at_life_seal", "created_at", "life_seal_number"),
+    )
 
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -21,7 +27,7 @@ class ShareLog(Base):
     device_id = Column(String(255), ForeignKey("devices.device_id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Life seal number being shared (from reading)
-    life_seal_number = Column(Integer, nullable=False, index=True)
+    life_seal_number = Column(Integer, nullable=False)
     
     # Platform shared to: whatsapp, instagram, twitter, copy_clipboard, other
     platform = Column(String(50), nullable=False, index=True)
@@ -30,7 +36,7 @@ class ShareLog(Base):
     share_text = Column(String(500), nullable=True)
     
     # Timestamp of share
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationship to device
     device = relationship(
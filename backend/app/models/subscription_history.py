@@ -1,7 +1,7 @@
 """
 Subscription history model for tracking subscription changes.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -22,6 +22,10 @@ class SubscriptionStatus(enum.Enum):
 class SubscriptionHistory(Base):
     """Subscription history tracking."""
     __tablename__ = "subscription_history"
+    __table_args__ = (
+        # Subscription status/history: user_id = ? ORDER BY created_at DESC
+        Index("ix_subscription_history_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
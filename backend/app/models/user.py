@@ -1,9 +1,10 @@
 """
 User model for authentication and subscription management.
 """
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Optional
 import enum
 import uuid
 
@@ -20,6 +21,10 @@ class SubscriptionTier(enum.Enum):
 class User(Base):
     """User account model."""
     __tablename__ = "users"
+    __table_args__ = (
+        # Expiry sweeper: effective_tier != FREE AND subscription_expires <= now
+        Index("ix_users_effective_tier_expires", "effective_tier", "subscription_expires"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     email = Column(String, unique=True, nullable=False, index=True)
@@ -32,6 +37,15 @@ class User(Base):
         nullable=False
     )
     subscription_expires = Column(DateTime, nullable=True)
+    # Tier actually in force: subscription_tier until it expires, then FREE.
+    # Kept current by set_subscription() and the expiry sweeper, so request
+    # paths read this field instead of comparing dates.
+    effective_tier = Column(
+        SQLEnum(SubscriptionTier),
+        default=SubscriptionTier.FREE,
+        server_default=SubscriptionTier.FREE.name,
+        nullable=False
+    )
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -44,21 +58,28 @@ class User(Base):
     
     @property
     def is_premium(self) -> bool:
-        """Check if user has active premium subscription."""
-        if self.subscription_tier == SubscriptionTier.FREE:
-            return False
-        if self.subscription_expires is None:
-            return False
-        return datetime.utcnow() < self.subscription_expires
+        """Check if user has active premium (or pro) subscription."""
+        return self.effective_tier not in (None, SubscriptionTier.FREE)
     
     @property
     def is_pro(self) -> bool:
         """Check if user has active pro subscription."""
-        if self.subscription_tier != SubscriptionTier.PRO:
-            return False
-        if self.subscription_expires is None:
-            return False
-        return datetime.utcnow() < self.subscription_expires
+        return self.effective_tier == SubscriptionTier.PRO
+    
+    def set_subscription(self, tier: SubscriptionTier, expires: Optional[datetime]) -> None:
+        """
+        Record a purchased tier and its expiry, updating effective_tier.
+        
+        Args:
+            tier: Purchased tier
+            expires: Expiry (UTC); None or a past date leaves the user on FREE
+        """
+        self.subscription_tier = tier
+        self.subscription_expires = expires
+        if expires is not None and expires > datetime.utcnow():
+            self.effective_tier = tier
+        else:
+            self.effective_tier = SubscriptionTier.FREE
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, tier={self.subscription_tier.value})>"
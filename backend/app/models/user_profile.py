@@ -75,6 +75,11 @@ class UserProfile(Base):
     has_completed_onboarding = Column(Boolean, default=False)
     has_seen_dashboard_intro = Column(Boolean, default=False)
     
+    # Derived numerology snapshot (see app.services.profile_service)
+    # Recomputed only when name/DOB change or the engine version is bumped
+    calculations = Column(JSON, nullable=True)
+    calculations_version = Column(Integer, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
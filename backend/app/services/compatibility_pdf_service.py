@@ -10,7 +10,10 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 
+from ..core.tracing import span, traced
 
+
+@traced("pdf.generate", kind="compatibility")
 def generate_compatibility_pdf(person_a: dict, person_b: dict, compatibility: dict) -> BytesIO:
     """
     Generate a PDF document for compatibility analysis.
@@ -237,7 +240,8 @@ def generate_compatibility_pdf(person_a: dict, person_b: dict, compatibility: di
         )
     ))
     
-    doc.build(elements)
+    with span("pdf.build"):
+        doc.build(elements)
     pdf_buffer.seek(0)
     return pdf_buffer
 
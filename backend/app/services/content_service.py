@@ -16,6 +16,7 @@ class ContentService:
         self.articles_dir = Path(__file__).parent.parent / "content" / "articles"
         self._articles_cache = None
         self._last_load_time = None
+        self._pinned = False
         
     def _load_articles(self, force_reload: bool = False) -> List[Dict]:
         """Load all articles from JSON files with caching"""
@@ -23,7 +24,7 @@ class ContentService:
         if (not force_reload and 
             self._articles_cache is not None and 
             self._last_load_time is not None and
-            (datetime.now() - self._last_load_time).seconds < 300):
+            (self._pinned or (datetime.now() - self._last_load_time).seconds < 300)):
             return self._articles_cache
             
         articles = []
@@ -42,6 +43,17 @@ class ContentService:
         self._last_load_time = datetime.now()
         return articles
     
+    def preload(self) -> int:
+        """
+        Load the articles once and keep them for the life of the process.
+        Used before forking workers, which then share one copy instead of
+        each re-reading the files every 5 minutes. Articles ship with the
+        deploy, so a restart picks up new ones.
+        """
+        articles = self._load_articles(force_reload=True)
+        self._pinned = True
+        return len(articles)
+
     def get_all_articles(
         self, 
         category: Optional[str] = None,
@@ -4,12 +4,36 @@ Handles calculation of daily power numbers and blessed day status.
 Provides personalized daily guidance based on user's life seal and current date.
 """
 
-from datetime import date, datetime
-from typing import Dict, List, Optional
+import json
+import logging
+import threading
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..core.metrics import cache_lookup_counters
 from ..core.reduction import reduce_to_single_digit
 from ..core.cycles import calculate_blessed_days
+from ..core.personal_year import calculate_personal_year
 from ..interpretations.daily_insights import get_daily_insight, get_brief_daily_insight
 
+logger = logging.getLogger(__name__)
+
+# Longest span the calendar engine will compute in one call (~10 years).
+MAX_CALENDAR_RANGE_DAYS = 3660
+
+# Digital roots for every value a day component or a daily power sum can take
+# (days 1-31, and day_r + month_r + year_r + life_seal <= 36), so the calendar
+# engine can index instead of reducing day by day.
+_DIGIT_ROOTS = tuple(reduce_to_single_digit(n) for n in range(64))
+
+
+@lru_cache(maxsize=None)
+def _blessed_day_numbers(birth_root: int) -> Tuple[int, ...]:
+    """Blessed days of the month for a reduced birth day (only nine distinct answers)."""
+    return tuple(calculate_blessed_days(birth_root))
+
 
 def calculate_daily_power_number(target_date: date, life_seal: int) -> int:
     """
@@ -61,8 +85,7 @@ def check_blessed_day(target_date: date, day_of_birth: int) -> bool:
         Blessed days: 9, 18, 27 (all reduce to 9)
         So Jan 9, 18, 27 would be blessed days
     """
-    blessed_days_list = calculate_blessed_days(day_of_birth)
-    return target_date.day in blessed_days_list
+    return _DIGIT_ROOTS[target_date.day] == reduce_to_single_digit(day_of_birth)
 
 
 def get_daily_insight_full(
@@ -100,15 +123,17 @@ def get_daily_insight_full(
     
     power_number = calculate_daily_power_number(target_date, life_seal)
     is_blessed = check_blessed_day(target_date, day_of_birth)
-    full_insight = get_daily_insight(power_number)
-    brief_text = get_brief_daily_insight(power_number)
     
+    return _build_insight_payload(target_date, power_number, is_blessed)
+
+
+def _build_insight_payload(target_date: date, power_number: int, is_blessed: bool) -> Dict:
     return {
         "date": target_date.isoformat(),
         "power_number": power_number,
         "is_blessed_day": is_blessed,
-        "insight": full_insight,
-        "brief_insight": brief_text,
+        "insight": get_daily_insight(power_number),
+        "brief_insight": get_brief_daily_insight(power_number),
         "day_of_week": target_date.strftime("%A")
     }
 
@@ -131,12 +156,12 @@ def get_weekly_power_numbers(
     if start_date is None:
         start_date = date.today()
     
+    end_date = start_date + timedelta(days=6)
+    power_numbers = calculate_power_numbers_range(life_seal, start_date, end_date)
+    
     weekly_data = []
-    for day_offset in range(7):
-        from datetime import timedelta
+    for day_offset, power_num in enumerate(power_numbers):
         current_date = start_date + timedelta(days=day_offset)
-        power_num = calculate_daily_power_number(current_date, life_seal)
-        
         weekly_data.append({
             "date": current_date.isoformat(),
             "day_of_week": current_date.strftime("%A"),
@@ -169,10 +194,9 @@ def get_monthly_blessed_days(
     if year is None:
         year = date.today().year
     
-    blessed_day_numbers = calculate_blessed_days(day_of_birth)
+    blessed_day_numbers = _blessed_day_numbers(reduce_to_single_digit(day_of_birth))
     
     # Get number of days in target month
-    from calendar import monthrange
     _, days_in_month = monthrange(year, month)
     
     blessed_dates = []
@@ -204,8 +228,6 @@ def get_personal_month_guidance(
     Returns:
         Dictionary with personal_month number and brief guidance
     """
-    from ..core.personal_year import calculate_personal_year
-    
     if target_month is None:
         target_month = date.today().month
     if target_year is None:
@@ -239,3 +261,323 @@ def get_personal_month_guidance(
         "theme": month_themes[personal_month],
         "month_name": date(target_year, target_month, 1).strftime("%B")
     }
+
+
+def _iter_month_spans(start_date: date, end_date: date) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Split an inclusive date range into calendar-month spans.
+    
+    Yields:
+        (year, month, first_day, last_day) for each month touched by the range
+    """
+    year, month, first_day = start_date.year, start_date.month, start_date.day
+    while (year, month) <= (end_date.year, end_date.month):
+        _, days_in_month = monthrange(year, month)
+        if (year, month) == (end_date.year, end_date.month):
+            last_day = end_date.day
+        else:
+            last_day = days_in_month
+        yield year, month, first_day, last_day
+        
+        first_day = 1
+        month += 1
+        if month > 12:
+            month = 1
+            year += 1
+
+
+def _validate_range(start_date: date, end_date: date) -> None:
+    if end_date < start_date:
+        raise ValueError("end_date must be on or after start_date")
+    span_days = (end_date - start_date).days + 1
+    if span_days > MAX_CALENDAR_RANGE_DAYS:
+        raise ValueError(
+            f"Date range too large: {span_days} days (max {MAX_CALENDAR_RANGE_DAYS})"
+        )
+
+
+def calculate_power_numbers_range(
+    life_seal: int,
+    start_date: date,
+    end_date: date
+) -> List[int]:
+    """
+    Calculate daily power numbers for every date in an inclusive range.
+    
+    Works a month at a time: month, year and life seal are folded into one
+    base value per month, and each day becomes a table lookup instead of a
+    full reduction. Results match calculate_daily_power_number() exactly.
+    
+    Args:
+        life_seal: User's life seal number (1-9)
+        start_date: First date of the range
+        end_date: Last date of the range (inclusive)
+        
+    Returns:
+        List of power numbers (1-9), one per day
+    """
+    if life_seal < 1 or life_seal > 9:
+        raise ValueError(f"Life seal must be 1-9, got {life_seal}")
+    _validate_range(start_date, end_date)
+    
+    power_numbers: List[int] = []
+    for year, month, first_day, last_day in _iter_month_spans(start_date, end_date):
+        base = _DIGIT_ROOTS[month] + reduce_to_single_digit(year) + life_seal
+        power_numbers.extend(
+            _DIGIT_ROOTS[base + day_root]
+            for day_root in _DIGIT_ROOTS[first_day:last_day + 1]
+        )
+    
+    return power_numbers
+
+
+def calculate_blessed_flags_range(
+    day_of_birth: int,
+    start_date: date,
+    end_date: date
+) -> List[bool]:
+    """
+    Flag blessed days for every date in an inclusive range.
+    
+    Args:
+        day_of_birth: User's birth day (1-31)
+        start_date: First date of the range
+        end_date: Last date of the range (inclusive)
+        
+    Returns:
+        List of booleans, one per day
+    """
+    _validate_range(start_date, end_date)
+    
+    birth_root = reduce_to_single_digit(day_of_birth)
+    blessed: List[bool] = []
+    for _, _, first_day, last_day in _iter_month_spans(start_date, end_date):
+        blessed.extend(
+            day_root == birth_root
+            for day_root in _DIGIT_ROOTS[first_day:last_day + 1]
+        )
+    
+    return blessed
+
+
+def calculate_calendar_range(
+    life_seal: int,
+    day_of_birth: int,
+    start_date: date,
+    end_date: date,
+    month_of_birth: Optional[int] = None
+) -> Dict:
+    """
+    Compute the daily calendar (power numbers, blessed days, personal months)
+    for an arbitrary inclusive date range.
+    
+    Per-day values are returned as parallel arrays aligned with the dates
+    from start_date onwards; per-month values are aligned with "months".
+    Personal year/month are only included when month_of_birth is given.
+    
+    Args:
+        life_seal: User's life seal number (1-9)
+        day_of_birth: User's birth day (1-31)
+        start_date: First date of the range
+        end_date: Last date of the range (inclusive)
+        month_of_birth: User's birth month (1-12), optional
+        
+    Returns:
+        Dictionary containing:
+        - start_date / end_date: ISO format date strings
+        - days: number of days in the range
+        - power_numbers: power number per day
+        - blessed: blessed-day flag per day
+        - months: "YYYY-MM" for each month touched by the range
+        - personal_years / personal_months: per month, or None
+        
+    Example:
+        Life Seal 7, born May 1, for Jan 30 - Feb 2, 2026:
+        {
+            "start_date": "2026-01-30",
+            "end_date": "2026-02-02",
+            "days": 4,
+            "power_numbers": [3, 4, 2, 3],
+            "blessed": [False, False, True, False],
+            "months": ["2026-01", "2026-02"],
+            "personal_years": [7, 7],
+            "personal_months": [8, 9]
+        }
+    """
+    power_numbers = calculate_power_numbers_range(life_seal, start_date, end_date)
+    blessed = calculate_blessed_flags_range(day_of_birth, start_date, end_date)
+    
+    months: List[str] = []
+    personal_years: Optional[List[int]] = [] if month_of_birth else None
+    personal_months: Optional[List[int]] = [] if month_of_birth else None
+    
+    for year, month, _, _ in _iter_month_spans(start_date, end_date):
+        months.append(f"{year:04d}-{month:02d}")
+        if month_of_birth:
+            personal_year = calculate_personal_year(day_of_birth, month_of_birth, year)
+            personal_years.append(personal_year)
+            personal_months.append(reduce_to_single_digit(personal_year + month))
+    
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "days": len(power_numbers),
+        "power_numbers": power_numbers,
+        "blessed": blessed,
+        "months": months,
+        "personal_years": personal_years,
+        "personal_months": personal_months,
+    }
+
+
+def get_calendar_year(
+    life_seal: int,
+    day_of_birth: int,
+    year: int,
+    month_of_birth: Optional[int] = None
+) -> Dict:
+    """
+    Compute the full-year calendar used by the mobile calendar view.
+    
+    Args:
+        life_seal: User's life seal number (1-9)
+        day_of_birth: User's birth day (1-31)
+        year: Calendar year (YYYY)
+        month_of_birth: User's birth month (1-12), optional
+        
+    Returns:
+        Same structure as calculate_calendar_range() plus "year"
+    """
+    calendar_data = calculate_calendar_range(
+        life_seal=life_seal,
+        day_of_birth=day_of_birth,
+        start_date=date(year, 1, 1),
+        end_date=date(year, 12, 31),
+        month_of_birth=month_of_birth
+    )
+    calendar_data["year"] = year
+    return calendar_data
+
+
+class DailyInsightPayloadCache:
+    """
+    Per-day table of pre-serialized /daily/insight response payloads.
+    
+    A day's insight depends only on its power number (1-9) and whether it is
+    a blessed day, so each date has 18 possible payloads for the whole user
+    base. Tables are built lazily on first request (or ahead of time by the
+    scheduler's midnight rollover) and requests are served as a byte lookup.
+    """
+    
+    def __init__(self, max_days: int = 8):
+        """
+        Args:
+            max_days: Number of date tables to keep (today plus any other
+                dates requested via target_date), least recently used first out
+        """
+        self.max_days = max_days
+        self._tables: "OrderedDict[date, Tuple[bytes, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter, self._miss_counter = cache_lookup_counters("daily_insight")
+    
+    @staticmethod
+    def _build_table(target_date: date) -> Tuple[bytes, ...]:
+        """Serialize all 18 payloads for a date, indexed by (power_number - 1) * 2 + is_blessed."""
+        payloads = []
+        for power_number in range(1, 10):
+            for is_blessed in (False, True):
+                payload = _build_insight_payload(target_date, power_number, is_blessed)
+                # Same encoding as FastAPI's JSONResponse
+                payloads.append(
+                    json.dumps(
+                        payload,
+                        ensure_ascii=False,
+                        allow_nan=False,
+                        indent=None,
+                        separators=(",", ":"),
+                    ).encode("utf-8")
+                )
+        return tuple(payloads)
+    
+    def _get_table(self, target_date: date) -> Tuple[bytes, ...]:
+        table = self._tables.get(target_date)
+        if table is not None:
+            try:
+                self._tables.move_to_end(target_date)
+            except KeyError:
+                pass  # Evicted by another thread since the lookup; the table is still good
+            self.hits += 1
+            self._hit_counter.inc()
+            return table
+        
+        with self._lock:
+            table = self._tables.get(target_date)
+            if table is None:
+                self.misses += 1
+                self._miss_counter.inc()
+                table = self._build_table(target_date)
+                self._tables[target_date] = table
+                while len(self._tables) > self.max_days:
+                    self._tables.popitem(last=False)
+            return table
+    
+    def get_payload(
+        self,
+        life_seal: int,
+        day_of_birth: int,
+        target_date: Optional[date] = None
+    ) -> bytes:
+        """
+        Get the serialized daily insight for a user's numbers.
+        
+        Args:
+            life_seal: User's life seal number (1-9)
+            day_of_birth: User's birth day (1-31)
+            target_date: Date to get insight for (defaults to today)
+            
+        Returns:
+            UTF-8 JSON bytes, identical to get_daily_insight_full() serialized
+        """
+        if target_date is None:
+            target_date = date.today()
+        
+        power_number = calculate_daily_power_number(target_date, life_seal)
+        is_blessed = check_blessed_day(target_date, day_of_birth)
+        
+        return self._get_table(target_date)[(power_number - 1) * 2 + int(is_blessed)]
+    
+    def rollover(self, today: Optional[date] = None) -> None:
+        """
+        Build today's table and drop tables for earlier dates.
+        Called by the scheduler at midnight so the first request of the day is a hit.
+        """
+        if today is None:
+            today = date.today()
+        
+        table = self._build_table(today)
+        with self._lock:
+            for cached_date in [d for d in self._tables if d < today]:
+                del self._tables[cached_date]
+            self._tables[today] = table
+            self._tables.move_to_end(today)
+        
+        logger.info(f"Daily insight cache rolled over to {today.isoformat()}")
+    
+    def clear(self) -> None:
+        """Drop all cached tables."""
+        with self._lock:
+            self._tables.clear()
+
+
+# Singleton instance
+_insight_cache_instance: Optional[DailyInsightPayloadCache] = None
+
+
+def get_daily_insight_cache() -> DailyInsightPayloadCache:
+    """Get or create the daily insight payload cache."""
+    global _insight_cache_instance
+    if _insight_cache_instance is None:
+        _insight_cache_instance = DailyInsightPayloadCache()
+    return _insight_cache_instance
@@ -0,0 +1,211 @@
+"""
+Daily Precompute Service
+Nightly batch job that writes each user's daily numbers for the next N days
+into the daily_precompute table, so dashboard and notification paths read one
+row instead of recomputing per request.
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.core.life_seal import calculate_life_seal
+from app.core.personal_year import calculate_personal_year
+from app.core.reduction import reduce_to_single_digit
+from app.models.daily_precompute import DailyPrecompute
+from app.models.user_profile import UserProfile
+from app.services.daily_insights_service import (
+    calculate_power_numbers_range,
+    calculate_blessed_flags_range,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRECOMPUTE_DAYS = 7
+DEFAULT_CHUNK_SIZE = 500
+
+
+class _WindowTables:
+    """
+    Batched engine for one date window.
+
+    Power numbers depend only on (date, life seal), blessed flags only on
+    (date, reduced birth day) and personal year/month only on (reduced birth
+    day, reduced birth month, date). Each of these is computed once per
+    window, so per-user work is a handful of lookups.
+    """
+
+    def __init__(self, start_date: date, days: int):
+        self.start_date = start_date
+        self.end_date = start_date + timedelta(days=days - 1)
+        self.dates = [start_date + timedelta(days=offset) for offset in range(days)]
+        self.power_by_seal = {
+            life_seal: calculate_power_numbers_range(life_seal, self.start_date, self.end_date)
+            for life_seal in range(1, 10)
+        }
+        self.blessed_by_root = {
+            birth_root: calculate_blessed_flags_range(birth_root, self.start_date, self.end_date)
+            for birth_root in range(1, 10)
+        }
+        self._personal_cache: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+    def personal_numbers(self, day_of_birth: int, month_of_birth: int) -> List[Tuple[int, int]]:
+        """(personal_year, personal_month) per day of the window."""
+        key = (reduce_to_single_digit(day_of_birth), reduce_to_single_digit(month_of_birth))
+        cached = self._personal_cache.get(key)
+        if cached is None:
+            by_year = {
+                year: calculate_personal_year(key[0], key[1], year)
+                for year in {d.year for d in self.dates}
+            }
+            cached = [
+                (by_year[d.year], reduce_to_single_digit(by_year[d.year] + d.month))
+                for d in self.dates
+            ]
+            self._personal_cache[key] = cached
+        return cached
+
+
+def _parse_date_of_birth(date_of_birth: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        year, month, day = (int(part) for part in date_of_birth.split("-"))
+        date(year, month, day)
+        return year, month, day
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def run_daily_precompute(
+    db: Session,
+    start_date: Optional[date] = None,
+    days: int = DEFAULT_PRECOMPUTE_DAYS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict:
+    """
+    Compute daily numbers for every profile over the next `days` days.
+
+    Walks user_profiles in primary-key order (keyset pagination), replaces the
+    window's rows for each chunk and commits per chunk, then removes rows
+    for dates before the window.
+
+    Args:
+        db: Database session
+        start_date: First date to compute (defaults to today)
+        days: Number of days to compute per profile
+        chunk_size: Profiles per batch
+
+    Returns:
+        Dictionary with profiles, skipped, rows, elapsed_seconds and rows_per_second
+    """
+    if days < 1:
+        raise ValueError(f"days must be at least 1, got {days}")
+    if start_date is None:
+        start_date = date.today()
+
+    started = time.perf_counter()
+    window = _WindowTables(start_date, days)
+    computed_at = datetime.utcnow()
+
+    profiles = 0
+    skipped = 0
+    rows_written = 0
+    last_id = ""
+
+    while True:
+        chunk = (
+            db.query(UserProfile.id, UserProfile.date_of_birth, UserProfile.life_seal)
+            .filter(UserProfile.id > last_id)
+            .order_by(UserProfile.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        rows = []
+        for profile_id, date_of_birth, life_seal in chunk:
+            parsed = _parse_date_of_birth(date_of_birth)
+            if parsed is None:
+                skipped += 1
+                continue
+            year, month, day = parsed
+            if not life_seal:
+                life_seal = calculate_life_seal(day, month, year)["number"]
+
+            power_numbers = window.power_by_seal[life_seal]
+            blessed = window.blessed_by_root[reduce_to_single_digit(day)]
+            personal = window.personal_numbers(day, month)
+
+            for offset, target_date in enumerate(window.dates):
+                rows.append({
+                    "profile_id": profile_id,
+                    "target_date": target_date,
+                    "power_number": power_numbers[offset],
+                    "is_blessed_day": blessed[offset],
+                    "personal_year": personal[offset][0],
+                    "personal_month": personal[offset][1],
+                    "computed_at": computed_at,
+                })
+            profiles += 1
+
+        db.execute(
+            delete(DailyPrecompute).where(
+                DailyPrecompute.profile_id.in_([row.id for row in chunk]),
+                DailyPrecompute.target_date >= window.start_date,
+                DailyPrecompute.target_date <= window.end_date,
+            )
+        )
+        if rows:
+            db.execute(insert(DailyPrecompute), rows)
+        db.commit()
+        rows_written += len(rows)
+
+    db.execute(delete(DailyPrecompute).where(DailyPrecompute.target_date < window.start_date))
+    db.commit()
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "start_date": window.start_date.isoformat(),
+        "days": days,
+        "profiles": profiles,
+        "skipped": skipped,
+        "rows": rows_written,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_written / elapsed, 1) if elapsed > 0 else None,
+    }
+    logger.info(
+        f"✓ Daily precompute: {rows_written} rows for {profiles} profiles "
+        f"({skipped} skipped) in {elapsed:.2f}s ({stats['rows_per_second']} rows/sec)"
+    )
+    return stats
+
+
+def get_precomputed_day(
+    db: Session,
+    profile_id: str,
+    target_date: Optional[date] = None
+) -> Optional[DailyPrecompute]:
+    """Get a profile's precomputed numbers for a date (defaults to today), if the job has run."""
+    if target_date is None:
+        target_date = date.today()
+    return db.get(DailyPrecompute, (profile_id, target_date))
+
+
+def get_blessed_profile_ids(db: Session, target_date: Optional[date] = None) -> List[str]:
+    """Get ids of profiles whose precomputed day is a blessed day."""
+    if target_date is None:
+        target_date = date.today()
+    rows = (
+        db.query(DailyPrecompute.profile_id)
+        .filter(
+            DailyPrecompute.target_date == target_date,
+            DailyPrecompute.is_blessed_day.is_(True),
+        )
+        .all()
+    )
+    return [row.profile_id for row in rows]
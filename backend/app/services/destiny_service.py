@@ -23,8 +23,10 @@ from ..interpretations.cycle_interpretations import (
 )
 from .narrative_service import build_narrative
 from .report_service import build_report
+from ..core.tracing import traced
 
 
+@traced("calculate_destiny")
 def calculate_destiny(payload: dict) -> dict:
     day = payload["day_of_birth"]
     month = payload["month_of_birth"]
@@ -1,60 +1,199 @@
 """
 FCM (Firebase Cloud Messaging) token management and notification dispatch.
+
+Tokens are the devices table: a user's active tokens come from the
+partial index ix_devices_active_user_id, fronted by an LRU of token lists
+per user. Sends go out as multicasts of up to MULTICAST_TOKEN_LIMIT tokens,
+and tokens FCM reports as invalid are deactivated on the spot.
+
+The cache is per process. Registrations and deactivations here evict the
+user's entry; changes made by other workers show up once the entry's TTL
+(FCM_TOKEN_CACHE_TTL_SECONDS) runs out.
 """
-from typing import Optional, List
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 from pydantic import BaseModel
 from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.core.metrics import cache_lookup_counters
+from app.models.device import Device
+from app.models.notification_preference import NotificationPreference
+
+logger = logging.getLogger(__name__)
+
+FCM_TOKEN_CACHE_MAX_USERS = int(os.getenv("FCM_TOKEN_CACHE_MAX_USERS", "10000"))
+FCM_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("FCM_TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# FCM accepts at most this many tokens per multicast
+MULTICAST_TOKEN_LIMIT = 500
 
 
 class DeviceToken(BaseModel):
     """Device push notification token."""
     token: str
     device_type: str  # ios, android, web
-    created_at: datetime = datetime.now()
+    created_at: datetime
     active: bool = True
 
 
+class ActiveTokenCache:
+    """LRU of user_id -> active FCM tokens, each entry valid for ttl_seconds."""
+
+    def __init__(self, max_users: int = FCM_TOKEN_CACHE_MAX_USERS,
+                 ttl_seconds: float = FCM_TOKEN_CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+        self._hit_counter, self._miss_counter = cache_lookup_counters("fcm_tokens")
+
+    def get(self, user_id: str) -> Optional[Tuple[str, ...]]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self._miss_counter.inc()
+            return None
+        self._entries.move_to_end(user_id)
+        self._hit_counter.inc()
+        return entry[1]
+
+    def put(self, user_id: str, tokens: Iterable[str]) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, tuple(tokens))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str]) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_token_cache: Optional[ActiveTokenCache] = None
+
+
+def get_active_token_cache() -> ActiveTokenCache:
+    """The process-wide cache of active tokens per user."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = ActiveTokenCache()
+    return _token_cache
+
+
+def deactivate_tokens(db: Session, tokens: List[str]) -> int:
+    """
+    Mark devices with these FCM tokens inactive and evict their users' cached tokens.
+
+    Returns:
+        Number of devices deactivated
+    """
+    if not tokens:
+        return 0
+    user_ids = [
+        user_id for (user_id,) in
+        db.query(Device.user_id).filter(Device.fcm_token.in_(tokens), Device.active == True).all()  # noqa: E712
+    ]
+    count = (
+        db.query(Device)
+        .filter(Device.fcm_token.in_(tokens), Device.active == True)  # noqa: E712
+        .update({"active": False}, synchronize_session=False)
+    )
+    db.commit()
+    cache = get_active_token_cache()
+    for user_id in user_ids:
+        cache.invalidate(user_id)
+    if count:
+        logger.info(f"✓ Deactivated {count} invalid FCM token(s)")
+    return count
+
+
+def invalid_tokens(result: Dict) -> List[str]:
+    """
+    Tokens a FirebaseAdminService.send_multicast result reports as permanently invalid.
+    Only token-specific errors count (token_invalid); payload and IAM errors never do.
+    """
+    return [error["token"] for error in result.get("errors", []) if error.get("token_invalid")]
+
+
 class NotificationDispatcher:
-    """Dispatch notifications via FCM (or local fallback)."""
+    """Dispatch notifications to a user's devices via FCM."""
 
-    def __init__(self, fcm_api_key: Optional[str] = None):
+    def __init__(self, firebase=None, token_cache: Optional[ActiveTokenCache] = None):
         """
         Initialize dispatcher.
-        
+
         Args:
-            fcm_api_key: Firebase Cloud Messaging API key (optional for local dev)
+            firebase: FirebaseAdminService to send with (default: get_firebase_service(), on first send)
+            token_cache: Active token cache (default: the process-wide one)
         """
-        self.fcm_api_key = fcm_api_key
-        self.tokens_db: dict[str, List[DeviceToken]] = {}  # user_id -> [tokens]
-
-    def register_device_token(self, user_id: str, token: str, device_type: str) -> bool:
-        """Register a device token for push notifications."""
-        if user_id not in self.tokens_db:
-            self.tokens_db[user_id] = []
-        
-        # Check if token already exists
-        existing = next((t for t in self.tokens_db[user_id] if t.token == token), None)
-        if existing:
-            existing.active = True
-            return True
-        
-        self.tokens_db[user_id].append(
-            DeviceToken(token=token, device_type=device_type)
-        )
-        return True
+        self._firebase = firebase
+        self.token_cache = token_cache or get_active_token_cache()
 
-    def unregister_device_token(self, user_id: str, token: str) -> bool:
-        """Unregister a device token."""
-        if user_id not in self.tokens_db:
-            return False
-        
-        self.tokens_db[user_id] = [
-            t for t in self.tokens_db[user_id] if t.token != token
-        ]
+    @property
+    def firebase(self):
+        if self._firebase is None:
+            from app.services.firebase_admin_service import get_firebase_service
+
+            self._firebase = get_firebase_service()
+        return self._firebase
+
+    def register_device_token(self, db: Session, user_id: str, token: str, device_type: str) -> bool:
+        """Register (or reactivate and reassign) a device token for a user's push notifications."""
+        device = db.query(Device).filter(Device.fcm_token == token).first()
+        if device:
+            self.token_cache.invalidate(device.user_id)
+            device.user_id = user_id
+            device.device_type = device_type
+            device.active = True
+            device.last_active = datetime.utcnow()
+        else:
+            device = Device(
+                device_id=str(uuid.uuid4()),
+                user_id=user_id,
+                fcm_token=token,
+                device_type=device_type,
+                active=True,
+            )
+            db.add(device)
+            db.add(NotificationPreference(device_id=device.device_id))
+        db.commit()
+        self.token_cache.invalidate(user_id)
         return True
 
+    def unregister_device_token(self, db: Session, user_id: str, token: str) -> bool:
+        """Deactivate one of a user's device tokens. False if the user has no such token."""
+        count = (
+            db.query(Device)
+            .filter(Device.user_id == user_id, Device.fcm_token == token)
+            .update({"active": False}, synchronize_session=False)
+        )
+        db.commit()
+        self.token_cache.invalidate(user_id)
+        return count > 0
+
+    def get_active_tokens(self, db: Session, user_id: str) -> List[str]:
+        """A user's active FCM tokens (cached)."""
+        tokens = self.token_cache.get(user_id)
+        if tokens is None:
+            tokens = tuple(
+                token for (token,) in
+                db.query(Device.fcm_token)
+                .filter(Device.user_id == user_id, Device.active == True)  # noqa: E712
+                .all()
+            )
+            self.token_cache.put(user_id, tokens)
+        return list(tokens)
+
     async def send_notification(
         self,
+        db: Session,
         user_id: str,
         title: str,
         body: str,
@@ -62,41 +201,72 @@ class NotificationDispatcher:
     ) -> dict:
         """
         Send push notification to user's devices.
-        
+
         Returns:
-            dict with 'success', 'message', and 'sent_count'
+            dict with 'success', 'message', 'sent_count', 'failed_count'
+            and 'deactivated' (invalid tokens switched off)
         """
-        if user_id not in self.tokens_db or not self.tokens_db[user_id]:
-            return {
-                "success": False,
-                "message": f"No active devices for user {user_id}",
-                "sent_count": 0,
-            }
+        from app.services.firebase_admin_service import FCMNotification
 
-        active_tokens = [t for t in self.tokens_db[user_id] if t.active]
-        if not active_tokens:
+        tokens = self.get_active_tokens(db, user_id)
+        if not tokens:
             return {
                 "success": False,
                 "message": f"No active devices for user {user_id}",
                 "sent_count": 0,
             }
 
-        # In production, call FCM API here
-        # For now, log and return success (local dev mode)
-        if self.fcm_api_key:
-            # TODO: Call Firebase Cloud Messaging API
-            # See: https://firebase.google.com/docs/cloud-messaging/send-message
-            pass
-        
+        notification = FCMNotification(
+            title=title,
+            body=body,
+            data={key: str(value) for key, value in (data or {}).items()},
+        )
+        loop = asyncio.get_running_loop()
+        sent, failed, invalid = 0, 0, []
+        for start in range(0, len(tokens), MULTICAST_TOKEN_LIMIT):
+            batch = tokens[start:start + MULTICAST_TOKEN_LIMIT]
+            result = await loop.run_in_executor(None, self.firebase.send_multicast, batch, notification)
+            sent += result.get("successful", 0)
+            failed += result.get("failed", 0)
+            invalid.extend(invalid_tokens(result))
+
+        deactivated = 0
+        if invalid:
+            deactivated = deactivate_tokens(db, invalid)
+            self.token_cache.invalidate(user_id)
         return {
-            "success": True,
-            "message": f"Notification queued for {len(active_tokens)} device(s)",
-            "sent_count": len(active_tokens),
-            "tokens": [t.token for t in active_tokens],
+            "success": sent > 0,
+            "message": f"Notification sent to {sent} of {len(tokens)} device(s)",
+            "sent_count": sent,
+            "failed_count": failed,
+            "deactivated": deactivated,
         }
 
-    def get_user_tokens(self, user_id: str) -> List[DeviceToken]:
+    def get_user_tokens(self, db: Session, user_id: str) -> List[DeviceToken]:
         """Get all active tokens for a user."""
-        if user_id not in self.tokens_db:
-            return []
-        return [t for t in self.tokens_db[user_id] if t.active]
+        devices = (
+            db.query(Device)
+            .filter(Device.user_id == user_id, Device.active == True)  # noqa: E712
+            .all()
+        )
+        return [
+            DeviceToken(
+                token=device.fcm_token,
+                device_type=device.device_type,
+                created_at=device.created_at,
+                active=device.active,
+            )
+            for device in devices
+        ]
+
+
+# Singleton instance
+_dispatcher: Optional[NotificationDispatcher] = None
+
+
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """Get or create notification dispatcher instance."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = NotificationDispatcher()
+    return _dispatcher
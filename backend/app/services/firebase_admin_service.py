@@ -10,6 +10,26 @@ import firebase_admin
 from firebase_admin import credentials, messaging
 from pydantic import BaseModel
 
+from app.core.metrics import record_fcm_result
+from app.core.tracing import span
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """FirebaseError code (NOT_FOUND, INVALID_ARGUMENT, UNAVAILABLE, ...); None for other errors."""
+    return getattr(error, "code", None)
+
+
+def _token_invalid(error: Exception) -> bool:
+    """
+    Whether an error says the token itself will never work again: the app
+    was uninstalled, the token belongs to another sender, or FCM rejected
+    the token as malformed. Generic codes alone (INVALID_ARGUMENT for a bad
+    payload, PERMISSION_DENIED for IAM) don't count.
+    """
+    if isinstance(error, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+        return True
+    return _error_code(error) == "INVALID_ARGUMENT" and "registration token" in str(error).lower()
+
 
 class FCMNotification(BaseModel):
     """FCM notification payload."""
@@ -134,7 +154,9 @@ class FirebaseAdminService:
                 ),
             )
             
-            response = messaging.send(message, dry_run=False)
+            with span("fcm.send", kind="single"):
+                response = messaging.send(message, dry_run=False)
+            record_fcm_result("single", successful=1, failed=0)
             
             return {
                 "success": True,
@@ -142,9 +164,12 @@ class FirebaseAdminService:
                 "timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
+            record_fcm_result("single", successful=0, failed=1)
             return {
                 "success": False,
                 "error": str(e),
+                "error_code": _error_code(e),
+                "token_invalid": _token_invalid(e),
                 "timestamp": datetime.now().isoformat(),
             }
 
@@ -158,7 +183,7 @@ class FirebaseAdminService:
         Send notifications to multiple devices.
         
         Args:
-            tokens: List of FCM device tokens
+            tokens: List of FCM device tokens (at most 500)
             notification: Notification content
             android_priority: Priority level for Android
         
@@ -174,7 +199,8 @@ class FirebaseAdminService:
             }
 
         try:
-            message = messaging.Message(
+            message = messaging.MulticastMessage(
+                tokens=tokens,
                 notification=messaging.Notification(
                     title=notification.title,
                     body=notification.body,
@@ -203,7 +229,11 @@ class FirebaseAdminService:
                 ),
             )
             
-            response = messaging.send_multicast(message)
+            with span("fcm.send", kind="multicast", tokens=len(tokens)):
+                # One HTTP/2 request per token; the legacy batch endpoint behind
+                # send_multicast is gone
+                response = messaging.send_each_for_multicast(message)
+            record_fcm_result("multicast", successful=response.success_count, failed=response.failure_count)
             
             return {
                 "success": response.failure_count == 0,
@@ -211,16 +241,23 @@ class FirebaseAdminService:
                 "failed": response.failure_count,
                 "message_ids": [r.message_id for r in response.responses if r.success],
                 "errors": [
-                    {"token": tokens[i], "error": str(r.exception)}
+                    {
+                        "token": tokens[i],
+                        "error": str(r.exception),
+                        "error_code": _error_code(r.exception),
+                        "token_invalid": _token_invalid(r.exception),
+                    }
                     for i, r in enumerate(response.responses)
                     if not r.success
                 ],
                 "timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
+            record_fcm_result("multicast", successful=0, failed=len(tokens))
             return {
                 "success": False,
                 "error": str(e),
+                "error_code": _error_code(e),
                 "successful": 0,
                 "failed": len(tokens),
                 "timestamp": datetime.now().isoformat(),
@@ -328,7 +365,9 @@ class FirebaseAdminService:
                 topic=topic,
             )
             
-            response = messaging.send(message)
+            with span("fcm.send", kind="topic"):
+                response = messaging.send(message)
+            record_fcm_result("topic", successful=1, failed=0)
             
             return {
                 "success": True,
@@ -337,9 +376,11 @@ class FirebaseAdminService:
                 "timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
+            record_fcm_result("topic", successful=0, failed=1)
             return {
                 "success": False,
                 "error": str(e),
+                "error_code": _error_code(e),
                 "topic": topic,
                 "timestamp": datetime.now().isoformat(),
             }
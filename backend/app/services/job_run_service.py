@@ -0,0 +1,168 @@
+"""
+Job run history for the notification scheduler (scheduler_job_runs).
+
+The scheduler leader records every run, off the event loop: a row is
+inserted as the run starts and completed when it finishes, and a missed
+run gets a row of its own. The history shows when each job last ran and
+on which worker, even after the leader that ran it has restarted.
+
+Notification jobs also claim a run key, "<job_id>:<date>", with that
+first insert. The key is unique, so whichever worker gets there second
+(a catch-up after a restart, a new leader re-running a job the old one
+already started) skips the run instead of sending it again.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _worker() -> str:
+    # host:pid after fork, not at import (the preload master's pid)
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def make_run_key(job_id: str, run_date: date) -> str:
+    """The key of a job's run for one day (job, date)."""
+    return f"{job_id}:{run_date.isoformat()}"
+
+
+def start_job_run(
+    job_id: str,
+    scheduled_for: Optional[datetime] = None,
+    run_key: Optional[str] = None,
+) -> Optional[int]:
+    """
+    Insert a "running" row for a run that is about to start.
+
+    Args:
+        job_id: Scheduler job id
+        scheduled_for: Trigger time the run is for
+        run_key: Claim this key for the run (None: no claim, the job may run again)
+
+    Returns:
+        The row id, or None when run_key was already claimed and the run
+        must be skipped
+    """
+    from app.config.database import SessionLocal
+    from app.models.scheduler_job_run import SchedulerJobRun
+
+    db = SessionLocal()
+    try:
+        run = SchedulerJobRun(
+            job_id=job_id,
+            run_key=run_key,
+            status="running",
+            scheduled_for=_utc_naive(scheduled_for),
+            started_at=datetime.utcnow(),
+            worker=_worker(),
+        )
+        db.add(run)
+        db.commit()
+        return run.id
+    except IntegrityError:
+        db.rollback()
+        return None
+    finally:
+        db.close()
+
+
+def finish_job_run(run_id: int, status: str, error: Optional[str] = None) -> None:
+    """
+    Complete a row from start_job_run; failures are only logged.
+    A run ending in "error" releases its run key, so the run can be retried.
+    """
+    from app.config.database import SessionLocal
+    from app.models.scheduler_job_run import SchedulerJobRun
+
+    db = SessionLocal()
+    try:
+        run = db.get(SchedulerJobRun, run_id)
+        if run is None:
+            return
+        run.status = status
+        run.finished_at = datetime.utcnow()
+        run.duration_ms = round((run.finished_at - run.started_at).total_seconds() * 1000)
+        run.error = error[:2000] if error else None
+        if status == "error":
+            run.run_key = None
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record run {run_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def save_job_run(
+    job_id: str,
+    status: str,
+    scheduled_for: Optional[datetime] = None,
+    error: Optional[str] = None,
+) -> None:
+    """Insert one finished scheduler_job_runs row in its own session; failures are only logged."""
+    from app.config.database import SessionLocal
+    from app.models.scheduler_job_run import SchedulerJobRun
+
+    db = SessionLocal()
+    try:
+        db.add(SchedulerJobRun(
+            job_id=job_id,
+            status=status,
+            scheduled_for=_utc_naive(scheduled_for),
+            finished_at=datetime.utcnow(),
+            error=error[:2000] if error else None,
+            worker=_worker(),
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record run of {job_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def record_missed_runs(scheduler) -> None:
+    """
+    Persist a "missed" row for every run an APScheduler scheduler skips
+    because it was more than the job's misfire_grace_time late.
+
+    Runs that do happen record themselves (see NotificationScheduler._run_job).
+    """
+    from apscheduler.events import EVENT_JOB_MISSED
+
+    def _listener(event):
+        kwargs = {"job_id": event.job_id, "status": "missed", "scheduled_for": event.scheduled_run_time}
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            save_job_run(**kwargs)
+        else:
+            loop.run_in_executor(None, lambda: save_job_run(**kwargs))
+
+    scheduler.add_listener(_listener, EVENT_JOB_MISSED)
+
+
+def get_recent_job_runs(db: Session, limit: int = 20, job_id: Optional[str] = None) -> List[dict]:
+    """Latest runs (running ones included), newest first, optionally for one job."""
+    from app.models.scheduler_job_run import SchedulerJobRun
+
+    query = db.query(SchedulerJobRun)
+    if job_id:
+        query = query.filter(SchedulerJobRun.job_id == job_id)
+    runs = query.order_by(SchedulerJobRun.id.desc()).limit(limit).all()
+    return [run.to_dict() for run in runs]
@@ -0,0 +1,541 @@
+"""
+Durable outbound notification queue (notification_outbox).
+
+Producers enqueue a row and return immediately; scheduler jobs and
+request handlers never wait on FCM. The OutboxWorker, which runs on the
+scheduler leader next to the jobs, drains due rows:
+
+- a bounded pool of concurrent sends (OUTBOX_CONCURRENCY)
+- a token bucket per provider (OUTBOX_RATE_LIMITS); one drainer, so it is
+  the deployment-wide rate
+- transient failures retried with exponential backoff and jitter,
+  permanent ones (invalid token, unknown topic) and rows out of attempts
+  kept as dead letters (status "dead") until requeued
+- dedupe keys: enqueueing the same key twice yields one notification
+
+Rows survive restarts. A row left "sending" by a leader that died is
+taken again once its lease (OUTBOX_LEASE_SECONDS) expires, so delivery is
+at least once.
+
+OUTBOX_TRANSPORT=fake swaps FCM for a transport that logs and records
+messages, for local development and tests.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.metrics import OUTBOX_DELIVERIES
+from app.core.rate_limit import RateLimit, parse_rate_limit
+from app.models.notification_outbox import NotificationOutbox
+from app.services.fcm_dispatcher import MULTICAST_TOKEN_LIMIT, deactivate_tokens, invalid_tokens
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_TRANSPORT = os.getenv("OUTBOX_TRANSPORT", "fcm").lower()
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "4"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "30"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+# A "sending" row older than this belonged to a leader that died; take it again
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+# provider=rate pairs, rates as in RATE_LIMIT_* ("100/second")
+OUTBOX_RATE_LIMITS = os.getenv("OUTBOX_RATE_LIMITS", "fcm=100/second")
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    """A claimed outbox row, detached from its session, as handed to a transport."""
+    id: int
+    provider: str
+    target_type: str  # token | tokens | topic
+    targets: Union[str, List[str]]
+    title: str
+    body: str
+    data: Optional[Dict[str, str]]
+    image_url: Optional[str]
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    """
+    What a transport made of one message.
+
+    status: "sent", "retry" (transient, try again later) or "failed"
+    (permanent). retry_tokens narrows a multicast retry to the tokens that
+    failed transiently.
+    """
+    status: str
+    error: Optional[str] = None
+    retry_tokens: Optional[List[str]] = None
+
+
+def _worker() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number `attempts`: exponential, capped, with jitter in [delay/2, delay]."""
+    delay = min(OUTBOX_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), OUTBOX_MAX_BACKOFF_SECONDS)
+    return delay * (0.5 + random.random() / 2)
+
+
+def enqueue_notification(
+    db: Session,
+    notification,
+    topic: Optional[str] = None,
+    token: Optional[str] = None,
+    tokens: Optional[List[str]] = None,
+    dedupe_key: Optional[str] = None,
+    provider: str = "fcm",
+    max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+) -> int:
+    """
+    Queue a notification for delivery. Commits the session.
+
+    Args:
+        db: Database session
+        notification: Content (FCMNotification or anything with title, body, data, image_url)
+        topic: Send to a topic...
+        token: ...or one device...
+        tokens: ...or up to MULTICAST_TOKEN_LIMIT devices
+        dedupe_key: Returns the existing entry instead of queueing this key again
+        provider: Transport to deliver with
+        max_attempts: Attempts before the entry is dead-lettered
+
+    Returns:
+        Outbox entry id (the existing one for a duplicate dedupe_key)
+
+    Raises:
+        ValueError: If not exactly one of topic, token and tokens is given,
+                    or tokens is empty or over the multicast limit
+    """
+    targets = [value for value in (topic, token, tokens) if value is not None]
+    if len(targets) != 1:
+        raise ValueError("Exactly one of topic, token or tokens is required")
+    if tokens is not None and not 0 < len(tokens) <= MULTICAST_TOKEN_LIMIT:
+        raise ValueError(f"tokens must hold 1 to {MULTICAST_TOKEN_LIMIT} tokens")
+
+    if topic is not None:
+        target_type, target = "topic", topic
+    elif token is not None:
+        target_type, target = "token", token
+    else:
+        target_type, target = "tokens", json.dumps(list(tokens))
+
+    entry = NotificationOutbox(
+        dedupe_key=dedupe_key,
+        provider=provider,
+        target_type=target_type,
+        target=target,
+        title=notification.title,
+        body=notification.body,
+        data=json.dumps(notification.data) if notification.data else None,
+        image_url=notification.image_url,
+        status="pending",
+        attempts=0,
+        max_attempts=max_attempts,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(entry)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if dedupe_key is None:
+            raise
+        existing = db.query(NotificationOutbox.id).filter(
+            NotificationOutbox.dedupe_key == dedupe_key
+        ).scalar()
+        if existing is None:
+            raise
+        return existing
+    return entry.id
+
+
+def claim_due_notifications(
+    db: Session,
+    limit: int = OUTBOX_BATCH_SIZE,
+    lease_seconds: int = OUTBOX_LEASE_SECONDS,
+) -> List[OutboxMessage]:
+    """
+    Mark up to `limit` due entries as sending and count the attempt.
+
+    Due means pending with next_attempt_at reached, or sending with an
+    expired lease.
+    """
+    now = datetime.utcnow()
+    query = (
+        db.query(NotificationOutbox)
+        .filter(or_(
+            and_(NotificationOutbox.status == "pending", NotificationOutbox.next_attempt_at <= now),
+            and_(
+                NotificationOutbox.status == "sending",
+                NotificationOutbox.locked_at < now - timedelta(seconds=lease_seconds),
+            ),
+        ))
+        .order_by(NotificationOutbox.next_attempt_at)
+        .limit(limit)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+
+    entries = query.all()
+    messages = []
+    worker = _worker()
+    for entry in entries:
+        entry.status = "sending"
+        entry.attempts += 1
+        entry.locked_by = worker
+        entry.locked_at = now
+        messages.append(OutboxMessage(
+            id=entry.id,
+            provider=entry.provider,
+            target_type=entry.target_type,
+            targets=entry.targets,
+            title=entry.title,
+            body=entry.body,
+            data=json.loads(entry.data) if entry.data else None,
+            image_url=entry.image_url,
+        ))
+    db.commit()
+    return messages
+
+
+def complete_delivery(db: Session, entry_id: int, result: DeliveryResult) -> str:
+    """
+    Record a delivery attempt's result.
+
+    Returns:
+        "sent", "retry" (rescheduled with backoff) or "dead"
+    """
+    entry = db.get(NotificationOutbox, entry_id)
+    if entry is None:
+        return "dead"
+
+    entry.locked_by = None
+    entry.locked_at = None
+    entry.last_error = result.error[:2000] if result.error else None
+    if result.status == "sent":
+        entry.status = "sent"
+        entry.sent_at = datetime.utcnow()
+        outcome = "sent"
+    elif result.status == "retry" and entry.attempts < entry.max_attempts:
+        entry.status = "pending"
+        entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(entry.attempts))
+        if result.retry_tokens:
+            entry.target = json.dumps(result.retry_tokens)
+        outcome = "retry"
+    else:
+        entry.status = "dead"
+        outcome = "dead"
+    db.commit()
+    return outcome
+
+
+def requeue_dead_notifications(db: Session, ids: Optional[List[int]] = None) -> int:
+    """Give dead letters (all, or those in `ids`) a fresh set of attempts. Returns how many."""
+    query = db.query(NotificationOutbox).filter(NotificationOutbox.status == "dead")
+    if ids:
+        query = query.filter(NotificationOutbox.id.in_(ids))
+    count = query.update(
+        {"status": "pending", "attempts": 0, "next_attempt_at": datetime.utcnow()},
+        synchronize_session=False,
+    )
+    db.commit()
+    return count
+
+
+def get_outbox_stats(db: Session, dead_limit: int = 20) -> dict:
+    """Entry counts by status, the oldest pending entry's age and the latest dead letters."""
+    counts = dict(
+        db.query(NotificationOutbox.status, func.count(NotificationOutbox.id))
+        .group_by(NotificationOutbox.status)
+        .all()
+    )
+    oldest_pending = db.query(func.min(NotificationOutbox.created_at)).filter(
+        NotificationOutbox.status == "pending"
+    ).scalar()
+    dead = (
+        db.query(NotificationOutbox)
+        .filter(NotificationOutbox.status == "dead")
+        .order_by(NotificationOutbox.id.desc())
+        .limit(dead_limit)
+        .all()
+    )
+    return {
+        "counts": {status: counts.get(status, 0) for status in ("pending", "sending", "sent", "dead")},
+        "oldest_pending_seconds": (
+            round((datetime.utcnow() - oldest_pending).total_seconds()) if oldest_pending else None
+        ),
+        "dead_letters": [entry.to_dict() for entry in dead],
+    }
+
+
+def _fcm_outcome(result: dict) -> DeliveryResult:
+    """
+    Map a FirebaseAdminService result dict to a DeliveryResult.
+    Only dead tokens are permanent; any other error is retried until
+    OUTBOX_MAX_ATTEMPTS.
+    """
+    if result.get("success"):
+        return DeliveryResult("sent")
+
+    errors = result.get("errors")
+    if errors is None:
+        # The whole call failed
+        status = "failed" if result.get("token_invalid") else "retry"
+        return DeliveryResult(status, error=result.get("error"))
+
+    # Multicast: retry every token but the invalid ones
+    invalid = set(invalid_tokens(result))
+    retry_tokens = [e["token"] for e in errors if e["token"] not in invalid]
+    error = f"{len(errors)} of {len(errors) + result.get('successful', 0)} tokens failed: {errors[0]['error']}"
+    if retry_tokens:
+        return DeliveryResult("retry", error=error, retry_tokens=retry_tokens)
+    if result.get("successful"):
+        return DeliveryResult("sent", error=error)
+    return DeliveryResult("failed", error=error)
+
+
+class FCMTransport:
+    """Delivers through FirebaseAdminService."""
+
+    def send(self, message: OutboxMessage) -> DeliveryResult:
+        from app.services.firebase_admin_service import FCMNotification, get_firebase_service
+
+        firebase = get_firebase_service()
+        notification = FCMNotification(
+            title=message.title,
+            body=message.body,
+            data=message.data,
+            image_url=message.image_url,
+        )
+        if message.target_type == "topic":
+            result = firebase.send_to_topic(message.targets, notification)
+        elif message.target_type == "token":
+            result = firebase.send_notification(message.targets, notification)
+        else:
+            result = firebase.send_multicast(message.targets, notification)
+            invalid = invalid_tokens(result)
+            if invalid:
+                _in_session(deactivate_tokens, invalid)
+        return _fcm_outcome(result)
+
+
+class FakeTransport:
+    """
+    Logs and keeps every message instead of sending it.
+
+    Args:
+        outcomes: Results to return, in order, before falling back to "sent"
+    """
+
+    def __init__(self, outcomes: Optional[List[DeliveryResult]] = None):
+        self.outcomes = list(outcomes or [])
+        self.sent: List[OutboxMessage] = []
+
+    def send(self, message: OutboxMessage) -> DeliveryResult:
+        result = self.outcomes.pop(0) if self.outcomes else DeliveryResult("sent")
+        if result.status == "sent":
+            self.sent.append(message)
+        logger.info(f"[fake {message.provider}] {message.target_type} {message.targets}: {message.title} -> {result.status}")
+        return result
+
+
+_fake_transport: Optional[FakeTransport] = None
+
+
+def get_transport(provider: str):
+    """
+    The transport for a provider (the shared FakeTransport when OUTBOX_TRANSPORT=fake).
+
+    Raises:
+        ValueError: If the provider has no transport
+    """
+    global _fake_transport
+    if OUTBOX_TRANSPORT == "fake":
+        if _fake_transport is None:
+            _fake_transport = FakeTransport()
+        return _fake_transport
+    if provider == "fcm":
+        return FCMTransport()
+    raise ValueError(f"No transport for provider {provider!r}")
+
+
+def parse_provider_rate_limits(value: str) -> Dict[str, RateLimit]:
+    """
+    Parse "fcm=100/second,apns=50/second".
+
+    Raises:
+        ValueError: If a pair is not provider=rate
+    """
+    limits = {}
+    for pair in value.split(","):
+        if not pair.strip():
+            continue
+        provider, sep, rate = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid provider rate limit: {pair!r}")
+        limits[provider.strip()] = parse_rate_limit(rate)
+    return limits
+
+
+class ProviderRateLimiter:
+    """Token bucket per provider; acquire() waits until the send fits the rate."""
+
+    def __init__(self, limits: Dict[str, RateLimit]):
+        self.limits = limits
+        self._tokens: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+
+    async def acquire(self, provider: str, cost: int = 1) -> None:
+        limit = self.limits.get(provider)
+        if limit is None:
+            return
+        cost = min(cost, limit.capacity)
+        while True:
+            now = time.monotonic()
+            elapsed = now - self._updated.get(provider, now)
+            tokens = min(limit.capacity, self._tokens.get(provider, limit.capacity) + elapsed * limit.refill_rate)
+            self._updated[provider] = now
+            if tokens >= cost:
+                self._tokens[provider] = tokens - cost
+                return
+            self._tokens[provider] = tokens
+            await asyncio.sleep((cost - tokens) / limit.refill_rate)
+
+
+class OutboxWorker:
+    """
+    Drains the outbox in the background while started.
+
+    Args:
+        transport_for: provider -> transport with a blocking send(OutboxMessage)
+        concurrency: Sends in flight at once
+        batch_size: Entries claimed per round
+        poll_seconds: Wait between rounds when nothing was due
+        rate_limiter: Per-provider rates (default from OUTBOX_RATE_LIMITS)
+    """
+
+    def __init__(
+        self,
+        transport_for: Callable[[str], object] = get_transport,
+        concurrency: int = OUTBOX_CONCURRENCY,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+        rate_limiter: Optional[ProviderRateLimiter] = None,
+    ):
+        self.transport_for = transport_for
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.rate_limiter = rate_limiter or ProviderRateLimiter(parse_provider_rate_limits(OUTBOX_RATE_LIMITS))
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("✓ Notification outbox worker started")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Finish the round in progress (up to `timeout`), then stop."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            # Entries still sending are taken again once their lease expires
+            logger.warning("⚠ Notification outbox worker stopped mid-round")
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                drained = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Notification outbox drain failed: {str(e)}")
+                drained = {}
+            if not sum(drained.values()):
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def drain_once(self) -> Dict[str, int]:
+        """Claim one batch of due entries and deliver it. Returns counts by outcome."""
+        loop = asyncio.get_running_loop()
+        messages = await loop.run_in_executor(None, _in_session, claim_due_notifications, self.batch_size)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(message: OutboxMessage) -> str:
+            async with semaphore:
+                return await self._deliver(message)
+
+        outcomes = await asyncio.gather(*(_bounded(message) for message in messages))
+        return {outcome: outcomes.count(outcome) for outcome in set(outcomes)}
+
+    async def _deliver(self, message: OutboxMessage) -> str:
+        loop = asyncio.get_running_loop()
+        cost = len(message.targets) if message.target_type == "tokens" else 1
+        await self.rate_limiter.acquire(message.provider, cost)
+        try:
+            transport = self.transport_for(message.provider)
+        except ValueError as e:
+            result = DeliveryResult("failed", error=str(e))
+        else:
+            try:
+                result = await loop.run_in_executor(None, transport.send, message)
+            except Exception as e:
+                result = DeliveryResult("retry", error=repr(e))
+
+        outcome = await loop.run_in_executor(None, _in_session, complete_delivery, message.id, result)
+        OUTBOX_DELIVERIES.labels(message.provider, outcome).inc()
+        if outcome == "dead":
+            logger.warning(f"⚠ Notification {message.id} dead-lettered: {result.error}")
+        return outcome
+
+
+def _in_session(function, *args):
+    from app.config.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return function(db, *args)
+    finally:
+        db.close()
+
+
+# Singleton instance
+_outbox_worker: Optional[OutboxWorker] = None
+
+
+def get_outbox_worker() -> OutboxWorker:
+    """Get or create the outbox worker instance."""
+    global _outbox_worker
+    if _outbox_worker is None:
+        _outbox_worker = OutboxWorker()
+    return _outbox_worker
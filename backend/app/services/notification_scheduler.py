@@ -5,15 +5,197 @@ Handles scheduled daily/weekly push notifications for events like:
 - Personal year transitions
 - Lunar phase changes
 - Daily insights
+
+Every worker starts a NotificationScheduler, but only the elected leader
+(see scheduler_leader) runs the jobs; the others stand by to take over.
+
+Jobs live in the database (apscheduler_jobs), so a run that falls due
+while no leader is up (a deploy around 06:00) is caught up when the next
+one starts, as long as it is within the job's misfire grace time. Later
+than that, the run is recorded as missed. Notification jobs claim a run
+key per day before sending, so a catch-up never sends twice.
+
+Jobs don't send: they queue notifications in the outbox (see
+notification_outbox), which the leader drains alongside the jobs.
 """
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_STOPPED
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime, time
+from apscheduler.triggers.interval import IntervalTrigger
+import asyncio
+from datetime import datetime, time, timedelta
 import logging
+import os
 from typing import Optional, List
 
+from app.core.metrics import SCHEDULER_LEADER, instrument_scheduler
+from app.services.fcm_dispatcher import MULTICAST_TOKEN_LIMIT
+from app.services.job_run_service import (
+    finish_job_run,
+    make_run_key,
+    record_missed_runs,
+    start_job_run,
+)
+from app.services.scheduler_leader import (
+    SCHEDULER_LEADER_ELECTION,
+    LeaderElection,
+    create_leader_lock,
+)
+
 logger = logging.getLogger(__name__)
 
+# How long a lapsed subscription can keep its tier before the sweeper demotes it
+SUBSCRIPTION_SWEEP_MINUTES = int(os.getenv("SUBSCRIPTION_SWEEP_MINUTES", "5"))
+# database: jobs persist in apscheduler_jobs; memory: lost on restart (tests, one-off scripts)
+SCHEDULER_JOB_STORE = os.getenv("SCHEDULER_JOB_STORE", "database").lower()
+
+HOUR = 3600
+
+# The scheduler running jobs in this process (the leader's), see run_scheduled_job
+_active_scheduler: Optional["NotificationScheduler"] = None
+
+
+async def run_scheduled_job(job_id: str, handler: str, once_per_day: bool = False) -> None:
+    """
+    What every scheduled job calls.
+
+    The job store pickles jobs, and a bound method can't be stored, so
+    jobs reference this function and name the NotificationScheduler
+    method that does the work.
+
+    Args:
+        job_id: Scheduler job id
+        handler: NotificationScheduler method to run
+        once_per_day: Claim the (job, date) run key first; skip if taken
+    """
+    scheduler = _active_scheduler
+    if scheduler is None:
+        logger.warning(f"⚠ {job_id} fired with no active scheduler, skipping")
+        return
+    await scheduler._run_job(job_id, getattr(scheduler, handler), once_per_day)
+
+
+def _scheduled_for(job, now: Optional[datetime] = None) -> datetime:
+    """
+    The trigger time a run of `job` starting now is for: the first fire
+    time within the misfire grace before now. Jobs are spaced further
+    apart than their grace, so that is the run being made (or caught up).
+    """
+    now = now or datetime.now(job.trigger.timezone)
+    grace = timedelta(seconds=job.misfire_grace_time or 0)
+    fire_time = job.trigger.get_next_fire_time(None, now - grace)
+    return fire_time if fire_time is not None and fire_time <= now else now
+
+
+def _devices_to_notify(preference: str) -> List[str]:
+    """
+    Active devices that have `preference` (a NotificationPreference flag)
+    on and are outside their quiet hours. Devices without saved
+    preferences get the column defaults.
+    """
+    from app.config.database import SessionLocal
+    from app.models.device import Device
+    from app.models.notification_preference import NotificationPreference
+
+    enabled_by_default = NotificationPreference.__table__.c[preference].default.arg
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Device.device_id, NotificationPreference)
+            .outerjoin(NotificationPreference, NotificationPreference.device_id == Device.device_id)
+            .filter(Device.active.is_(True))
+            .all()
+        )
+    finally:
+        db.close()
+    return [
+        device_id for device_id, prefs in rows
+        if (enabled_by_default if prefs is None else getattr(prefs, preference))
+        and (prefs is None or not _check_quiet_hours(prefs.to_dict()))
+    ]
+
+
+async def _enqueue_topic_notification(topic: str, notification, dedupe_key: str) -> int:
+    """Queue a topic notification in the outbox (delivered by the outbox worker). Returns its id."""
+    from app.config.database import SessionLocal
+    from app.services.notification_outbox import enqueue_notification
+
+    def _run():
+        db = SessionLocal()
+        try:
+            return enqueue_notification(db, notification, topic=topic, dedupe_key=dedupe_key)
+        finally:
+            db.close()
+
+    return await asyncio.get_running_loop().run_in_executor(None, _run)
+
+
+def _blessed_device_tokens(device_ids: List[str]) -> List[str]:
+    """
+    FCM tokens of the active devices, among device_ids, belonging to a
+    profile with a blessed day today: the profile's own device, and every
+    device of its user. Sorted, so repeated runs split them the same way.
+    """
+    from sqlalchemy import or_
+
+    from app.config.database import SessionLocal
+    from app.models.device import Device
+    from app.models.user_profile import UserProfile
+    from app.services.daily_precompute_service import get_blessed_profile_ids
+
+    allowed = set(device_ids)
+    tokens = set()
+    db = SessionLocal()
+    try:
+        blessed = get_blessed_profile_ids(db)
+        for start in range(0, len(blessed), MULTICAST_TOKEN_LIMIT):
+            profiles = (
+                db.query(UserProfile.device_id, UserProfile.user_id)
+                .filter(UserProfile.id.in_(blessed[start:start + MULTICAST_TOKEN_LIMIT]))
+                .all()
+            )
+            profile_devices = {device_id for device_id, _ in profiles}
+            profile_users = {user_id for _, user_id in profiles if user_id}
+            rows = (
+                db.query(Device.device_id, Device.fcm_token)
+                .filter(
+                    Device.active.is_(True),
+                    or_(Device.device_id.in_(profile_devices), Device.user_id.in_(profile_users)),
+                )
+                .all()
+            )
+            tokens.update(token for device_id, token in rows if device_id in allowed)
+    finally:
+        db.close()
+    return sorted(tokens)
+
+
+async def _enqueue_multicast_notifications(tokens: List[str], notification, dedupe_key: str) -> List[int]:
+    """
+    Queue a notification to these devices in the outbox, one multicast per
+    MULTICAST_TOKEN_LIMIT tokens, deduplicated as "<dedupe_key>:<chunk>".
+    Returns the entry ids.
+    """
+    from app.config.database import SessionLocal
+    from app.services.notification_outbox import enqueue_notification
+
+    def _run():
+        db = SessionLocal()
+        try:
+            return [
+                enqueue_notification(
+                    db,
+                    notification,
+                    tokens=tokens[start:start + MULTICAST_TOKEN_LIMIT],
+                    dedupe_key=f"{dedupe_key}:{start // MULTICAST_TOKEN_LIMIT}",
+                )
+                for start in range(0, len(tokens), MULTICAST_TOKEN_LIMIT)
+            ]
+        finally:
+            db.close()
+
+    return await asyncio.get_running_loop().run_in_executor(None, _run)
+
 
 def _check_quiet_hours(preferences: dict) -> bool:
     """
@@ -64,277 +246,525 @@ class NotificationScheduler:
     Runs daily/weekly jobs for engagement and astrological events.
     """
     
-    def __init__(self):
-        """Initialize APScheduler."""
-        self.scheduler = AsyncIOScheduler()
+    def __init__(
+        self,
+        leader_election: bool = SCHEDULER_LEADER_ELECTION,
+        job_store: str = SCHEDULER_JOB_STORE,
+    ):
+        """
+        Args:
+            leader_election: Run jobs only while holding the leader lock
+                             (off: this process always runs them)
+            job_store: "database" (persistent) or "memory"
+        """
+        self.leader_election = leader_election
+        self.job_store = job_store
+        self.scheduler = self._create_scheduler()
+        self.election: Optional[LeaderElection] = None
         self.is_running = False
+        self.job_ids: List[str] = []
+
+    def _create_job_store(self):
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+        from app.config.database import engine
+        from app.models.scheduler_job import SCHEDULER_JOBS_TABLE
+
+        return SQLAlchemyJobStore(engine=engine, tablename=SCHEDULER_JOBS_TABLE)
+
+    def _create_scheduler(self) -> AsyncIOScheduler:
+        jobstores = {}
+        if self.job_store == "database":
+            jobstores["default"] = self._create_job_store()
+        scheduler = AsyncIOScheduler(jobstores=jobstores)
+        instrument_scheduler(scheduler)  # Job durations/outcomes on /metrics
+        record_missed_runs(scheduler)  # Missed runs in scheduler_job_runs
+        return scheduler
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process is the one running the jobs."""
+        return self.is_running and self.scheduler.running
 
     async def start(self):
-        """Start the scheduler and register all jobs."""
+        """Start campaigning for leadership; the leader starts the scheduler and registers all jobs."""
         if self.is_running:
             logger.warning("Scheduler already running")
             return
 
+        self.is_running = True
         try:
-            self.scheduler.start()
-            self.is_running = True
-            logger.info("✓ Notification scheduler started")
-            
-            # Register scheduled jobs
-            await self._register_daily_jobs()
-            
+            if self.leader_election:
+                self.election = LeaderElection(create_leader_lock(), self._lead, self._stand_down)
+                if not await self.election.start():
+                    logger.info("✓ Notification scheduler on standby (another worker leads)")
+            else:
+                await self._lead()
         except Exception as e:
+            self.is_running = False
             logger.error(f"Failed to start scheduler: {str(e)}")
             raise
 
     async def stop(self):
-        """Stop the scheduler."""
+        """Stop the scheduler and give up leadership."""
         if not self.is_running:
             return
 
         try:
-            self.scheduler.shutdown(wait=True)
+            if self.election is not None:
+                await self.election.stop()
+                self.election = None
+            else:
+                await self._stand_down()
             self.is_running = False
             logger.info("✓ Notification scheduler stopped")
         except Exception as e:
             logger.error(f"Failed to stop scheduler: {str(e)}")
 
+    async def _lead(self):
+        """Became leader: start a fresh scheduler with every job."""
+        global _active_scheduler
+
+        if self.scheduler.state != STATE_STOPPED:
+            return
+        # A shut down AsyncIOScheduler keeps its old jobs; start from a clean one
+        self.scheduler = self._create_scheduler()
+        # Paused until the jobs are reconciled with the store; due runs are caught up on resume
+        self.scheduler.start(paused=True)
+        await self._register_daily_jobs()
+        _active_scheduler = self
+        self.scheduler.resume()
+        # The leader also delivers what the jobs queue (one drainer: one rate limit)
+        from app.services.notification_outbox import get_outbox_worker
+
+        await get_outbox_worker().start()
+        SCHEDULER_LEADER.set(1)
+        logger.info("✓ Notification scheduler started")
+
+    async def _stand_down(self):
+        """Lost or gave up leadership: stop running jobs here."""
+        global _active_scheduler
+
+        SCHEDULER_LEADER.set(0)
+        if _active_scheduler is self:
+            _active_scheduler = None
+        if self.scheduler.state != STATE_STOPPED:
+            self.scheduler.shutdown(wait=True)
+            from app.services.notification_outbox import get_outbox_worker
+
+            await get_outbox_worker().stop()
+
+    def _schedule(
+        self,
+        handler,
+        trigger,
+        job_id: str,
+        name: str,
+        misfire_grace_time: int,
+        once_per_day: bool = False,
+        max_instances: int = 1,
+    ) -> None:
+        """
+        Add a job, unless the job store already has it unchanged.
+
+        A stored job keeps its next_run_time, so a run that fell due while
+        no leader was up is caught up on resume. Re-adding the job would
+        reschedule it from now and silently drop that run.
+
+        Args:
+            handler: Method doing the work (stored by name)
+            trigger: APScheduler trigger
+            job_id: Job id, also the run key prefix
+            name: Display name
+            misfire_grace_time: Seconds late a run may still start; later it is missed
+            once_per_day: Claim a (job, date) run key so the run never repeats
+            max_instances: Concurrent runs allowed
+        """
+        self.job_ids.append(job_id)
+        kwargs = {"job_id": job_id, "handler": handler.__name__, "once_per_day": once_per_day}
+        stored = self.scheduler.get_job(job_id)
+        if (
+            stored is not None
+            and stored.func is run_scheduled_job
+            and stored.kwargs == kwargs
+            and stored.name == name
+            and str(stored.trigger) == str(trigger)
+            and str(stored.trigger.timezone) == str(trigger.timezone)
+            and stored.misfire_grace_time == misfire_grace_time
+            and stored.max_instances == max_instances
+        ):
+            return
+        self.scheduler.add_job(
+            run_scheduled_job,
+            trigger,
+            kwargs=kwargs,
+            id=job_id,
+            name=name,
+            replace_existing=True,
+            coalesce=True,  # Several missed runs catch up as one
+            misfire_grace_time=misfire_grace_time,
+            max_instances=max_instances,
+        )
+
+    async def _run_job(self, job_id: str, handler, once_per_day: bool = False) -> None:
+        """
+        Run one job, recorded in scheduler_job_runs.
+
+        With once_per_day, the run first claims "<job_id>:<date>" (the date
+        of the trigger time it is for) and is skipped if that is taken. A
+        run that raises is recorded as an error and gives its key back, so
+        a later catch-up may try again.
+        """
+        loop = asyncio.get_running_loop()
+        # The job store is the database: look the job up off the loop
+        job = await loop.run_in_executor(None, self.scheduler.get_job, job_id)
+        scheduled_for = _scheduled_for(job) if job is not None else None
+        run_key = make_run_key(job_id, scheduled_for.date()) if once_per_day and scheduled_for else None
+
+        run_id = await loop.run_in_executor(None, start_job_run, job_id, scheduled_for, run_key)
+        if run_id is None:
+            logger.info(f"Skipping {job_id}: run {run_key} already claimed")
+            return
+        try:
+            await handler()
+        except Exception as e:
+            logger.error(f"Error running {job_id}: {str(e)}")
+            await loop.run_in_executor(None, finish_job_run, run_id, "error", repr(e))
+            raise
+        await loop.run_in_executor(None, finish_job_run, run_id, "success")
+
     async def _register_daily_jobs(self):
-        """Register all recurring notification jobs."""
-        
+        """Register all recurring notification jobs and drop stored ones no longer defined."""
+        self.job_ids = []
+
+        # Rebuild the shared daily insight payload table at midnight
+        self._schedule(
+            self._rollover_daily_insight_cache,
+            CronTrigger(hour=0, minute=0),
+            job_id="daily_insight_cache_rollover",
+            name="Daily Insight Cache Rollover",
+            misfire_grace_time=6 * HOUR,
+        )
+        logger.info("✓ Registered: Daily Insight Cache Rollover job (midnight)")
+
+        # Per-user daily numbers for the coming days at 00:15
+        self._schedule(
+            self._run_daily_precompute,
+            CronTrigger(hour=0, minute=15),
+            job_id="daily_precompute",
+            name="Daily Precompute",
+            misfire_grace_time=6 * HOUR,
+        )
+        logger.info("✓ Registered: Daily Precompute job (12:15 AM)")
+
+        # PDF export counters are tracked per UTC month; a late reset beats none
+        self._schedule(
+            self._roll_over_pdf_exports,
+            CronTrigger(day=1, hour=0, minute=5, timezone="UTC"),
+            job_id="pdf_exports_rollover",
+            name="PDF Exports Monthly Rollover",
+            misfire_grace_time=72 * HOUR,
+        )
+        logger.info("✓ Registered: PDF Exports Rollover job (1st of month, 00:05 UTC)")
+
+        # Demote lapsed subscriptions to FREE (users.effective_tier); the next sweep covers a missed one
+        self._schedule(
+            self._sweep_expired_subscriptions,
+            IntervalTrigger(minutes=SUBSCRIPTION_SWEEP_MINUTES),
+            job_id="subscription_expiry_sweep",
+            name="Subscription Expiry Sweep",
+            misfire_grace_time=SUBSCRIPTION_SWEEP_MINUTES * 60,
+        )
+        logger.info(f"✓ Registered: Subscription Expiry Sweep job (every {SUBSCRIPTION_SWEEP_MINUTES} min)")
+
+        # Notifications: late by a few hours still makes sense, and each sends at most once a day
+
         # Daily insights at 6:00 AM
-        self.scheduler.add_job(
+        self._schedule(
             self._send_daily_insights,
             CronTrigger(hour=6, minute=0),
-            id="daily_insights",
+            job_id="daily_insights",
             name="Daily Insights Notification",
-            replace_existing=True,
-            coalesce=True,
+            misfire_grace_time=3 * HOUR,
+            once_per_day=True,
         )
         logger.info("✓ Registered: Daily Insights job (6:00 AM)")
 
         # Blessed days alert at 8:00 AM
-        self.scheduler.add_job(
+        self._schedule(
             self._send_blessed_day_alert,
             CronTrigger(hour=8, minute=0),
-            id="blessed_day_alert",
+            job_id="blessed_day_alert",
             name="Blessed Day Alert",
-            replace_existing=True,
-            coalesce=True,
+            misfire_grace_time=4 * HOUR,
+            once_per_day=True,
         )
         logger.info("✓ Registered: Blessed Day Alert job (8:00 AM)")
 
         # Weekly lunar phase update on Sundays at 7:00 PM
-        self.scheduler.add_job(
+        self._schedule(
             self._send_lunar_phase_update,
             CronTrigger(day_of_week=6, hour=19, minute=0),
-            id="lunar_update",
+            job_id="lunar_update",
             name="Lunar Phase Update",
-            replace_existing=True,
-            coalesce=True,
+            misfire_grace_time=3 * HOUR,
+            once_per_day=True,
         )
         logger.info("✓ Registered: Lunar Phase Update job (Sunday 7:00 PM)")
 
         # Motivational quote every 2 days at 5:00 PM
-        self.scheduler.add_job(
+        self._schedule(
             self._send_motivational_quote,
             CronTrigger(day="*/2", hour=17, minute=0),
-            id="motivational_quote",
+            job_id="motivational_quote",
             name="Motivational Quote",
-            replace_existing=True,
-            coalesce=True,
+            misfire_grace_time=3 * HOUR,
+            once_per_day=True,
         )
         logger.info("✓ Registered: Motivational Quote job (every 2 days at 5:00 PM)")
 
+        for job in self.scheduler.get_jobs():
+            if job.id not in self.job_ids:
+                self.scheduler.remove_job(job.id)
+                logger.info(f"✓ Removed stored job no longer defined: {job.id}")
+
+    async def _rollover_daily_insight_cache(self):
+        """Precompute today's daily insight payloads and drop stale days."""
+        from app.services.daily_insights_service import get_daily_insight_cache
+
+        get_daily_insight_cache().rollover()
+
+    async def _run_daily_precompute(self):
+        """Write each profile's daily numbers for the next few days."""
+        import asyncio
+        import os
+        from app.config.database import SessionLocal
+        from app.services.daily_precompute_service import (
+            run_daily_precompute,
+            DEFAULT_PRECOMPUTE_DAYS,
+        )
+
+        days = int(os.getenv("DAILY_PRECOMPUTE_DAYS", DEFAULT_PRECOMPUTE_DAYS))
+
+        def _run():
+            db = SessionLocal()
+            try:
+                return run_daily_precompute(db, days=days)
+            finally:
+                db.close()
+
+        # Batch work runs off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, _run)
+
+    async def _roll_over_pdf_exports(self):
+        """Reset last month's PDF export counters in one bulk update."""
+        import asyncio
+        from app.config.database import SessionLocal
+        from app.services.profile_service import roll_over_pdf_exports
+
+        def _run():
+            db = SessionLocal()
+            try:
+                return roll_over_pdf_exports(db)
+            finally:
+                db.close()
+
+        reset = await asyncio.get_running_loop().run_in_executor(None, _run)
+        logger.info(f"PDF export counters reset for {reset} profiles")
+
+    async def _sweep_expired_subscriptions(self):
+        """Move lapsed subscriptions to the free tier in bulk."""
+        import asyncio
+        from app.config.database import SessionLocal
+        from app.services.subscription_service import SubscriptionService
+
+        def _run():
+            db = SessionLocal()
+            try:
+                return SubscriptionService.sweep_expired_subscriptions(db)
+            finally:
+                db.close()
+
+        stats = await asyncio.get_running_loop().run_in_executor(None, _run)
+        if stats["users_expired"]:
+            logger.info(
+                f"Expired {stats['users_expired']} subscriptions "
+                f"({stats['history_expired']} history rows)"
+            )
+
     async def _send_daily_insights(self):
         """Send daily insights to subscribed users."""
-        try:
-            from app.services.firebase_admin_service import get_firebase_service
-            from app.services.daily_insights_service import DailyInsightsService
-            from app.api.routes.notifications import _notification_preferences
-            
-            firebase = get_firebase_service()
-            insights_service = DailyInsightsService()
-            
-            # Check if any users have daily insights enabled
-            users_to_notify = [
-                device_id for device_id, prefs in _notification_preferences.items()
-                if prefs.get("daily_insights", True) and not _check_quiet_hours(prefs)
-            ]
-            
-            if not users_to_notify:
-                logger.info("No users subscribed to daily insights or all in quiet hours")
-                return
-            
-            # Get today's insights
-            daily_insights = await insights_service.get_daily_insights(
-                date=datetime.now().date()
-            )
-            
-            if daily_insights:
-                from app.services.firebase_admin_service import FCMNotification
-                
-                notification = FCMNotification(
-                    title="✨ Your Daily Insight",
-                    body=daily_insights.get("summary", "Check your daily numerology reading"),
-                    data={
-                        "type": "daily_insight",
-                        "date": datetime.now().isoformat(),
-                    }
-                )
-                
-                result = firebase.send_to_topic(
-                    topic="daily_insights",
-                    notification=notification
-                )
-                
-                logger.info(f"Daily insights sent to {len(users_to_notify)} users: {result}")
-        except Exception as e:
-            logger.error(f"Error sending daily insights: {str(e)}")
+        from app.services.daily_insights_service import DailyInsightsService
+
+        insights_service = DailyInsightsService()
+
+        # Check if any users have daily insights enabled
+        users_to_notify = await asyncio.get_running_loop().run_in_executor(
+            None, _devices_to_notify, "daily_insights"
+        )
+
+        if not users_to_notify:
+            logger.info("No users subscribed to daily insights or all in quiet hours")
+            return
+
+        # Get today's insights
+        daily_insights = await insights_service.get_daily_insights(
+            date=datetime.now().date()
+        )
+
+        if daily_insights:
+            from app.services.firebase_admin_service import FCMNotification
 
-    async def _send_blessed_day_alert(self):
-        """Send blessed day alert to subscribed users."""
-        try:
-            from app.services.firebase_admin_service import get_firebase_service, FCMNotification
-            from app.api.routes.notifications import _notification_preferences
-            
-            firebase = get_firebase_service()
-            
-            # Check if any users have blessed day alerts enabled
-            users_to_notify = [
-                device_id for device_id, prefs in _notification_preferences.items()
-                if prefs.get("blessed_day_alerts", True) and not _check_quiet_hours(prefs)
-            ]
-            
-            if not users_to_notify:
-                logger.info("No users subscribed to blessed day alerts or all in quiet hours")
-                return
-            
             notification = FCMNotification(
-                title="🌟 Blessed Day Alert",
-                body="Today is a blessed day for new beginnings and positive changes",
+                title="✨ Your Daily Insight",
+                body=daily_insights.get("summary", "Check your daily numerology reading"),
                 data={
-                    "type": "blessed_day",
+                    "type": "daily_insight",
                     "date": datetime.now().isoformat(),
                 }
             )
-            
-            result = firebase.send_to_topic(
-                topic="blessed_days",
-                notification=notification
+
+            entry_id = await _enqueue_topic_notification(
+                "daily_insights", notification, f"daily_insights:{datetime.now().date().isoformat()}"
             )
-            
-            logger.info(f"Blessed day alert sent to {len(users_to_notify)} users: {result}")
-        except Exception as e:
-            logger.error(f"Error sending blessed day alert: {str(e)}")
+
+            logger.info(f"Daily insights queued for {len(users_to_notify)} users (outbox #{entry_id})")
+
+    async def _send_blessed_day_alert(self):
+        """Send a blessed day alert to the devices of the profiles having one today."""
+        from app.services.firebase_admin_service import FCMNotification
+
+        loop = asyncio.get_running_loop()
+        # Devices with blessed day alerts enabled
+        users_to_notify = await loop.run_in_executor(None, _devices_to_notify, "blessed_day_alerts")
+
+        if not users_to_notify:
+            logger.info("No users subscribed to blessed day alerts or all in quiet hours")
+            return
+
+        # Blessed status comes from the nightly precompute rows
+        tokens = await loop.run_in_executor(None, _blessed_device_tokens, users_to_notify)
+
+        if not tokens:
+            logger.info("No subscribed devices have a blessed day today")
+            return
+
+        notification = FCMNotification(
+            title="🌟 Blessed Day Alert",
+            body="Today is a blessed day for new beginnings and positive changes",
+            data={
+                "type": "blessed_day",
+                "date": datetime.now().isoformat(),
+            }
+        )
+
+        entry_ids = await _enqueue_multicast_notifications(
+            tokens, notification, f"blessed_day_alert:{datetime.now().date().isoformat()}"
+        )
+
+        logger.info(f"Blessed day alert queued for {len(tokens)} devices ({len(entry_ids)} outbox entries)")
 
     async def _send_lunar_phase_update(self):
         """Send lunar phase update to subscribed users."""
-        try:
-            from app.services.firebase_admin_service import get_firebase_service, FCMNotification
-            from app.services.daily_insights_service import DailyInsightsService
-            from app.api.routes.notifications import _notification_preferences
-            
-            firebase = get_firebase_service()
-            
-            # Check if any users have lunar phase alerts enabled
-            users_to_notify = [
-                device_id for device_id, prefs in _notification_preferences.items()
-                if prefs.get("lunar_phase_alerts", False) and not _check_quiet_hours(prefs)
-            ]
-            
-            if not users_to_notify:
-                logger.info("No users subscribed to lunar phase alerts or all in quiet hours")
-                return
-            
-            # Get current lunar phase
-            insights_service = DailyInsightsService()
-            lunar_info = insights_service.get_lunar_phase_info(datetime.now().date())
-            
-            notification = FCMNotification(
-                title="🌙 Lunar Phase Update",
-                body=f"This week: {lunar_info.get('phase', 'Check the lunar calendar')}",
-                data={
-                    "type": "lunar_phase",
-                    "phase": lunar_info.get("phase", "unknown"),
-                    "date": datetime.now().isoformat(),
-                }
-            )
-            
-            result = firebase.send_to_topic(
-                topic="lunar_phases",
-                notification=notification
-            )
-            
-            logger.info(f"Lunar phase update sent to {len(users_to_notify)} users: {result}")
-        except Exception as e:
-            logger.error(f"Error sending lunar phase update: {str(e)}")
+        from app.services.firebase_admin_service import FCMNotification
+        from app.services.daily_insights_service import DailyInsightsService
+
+        # Check if any users have lunar phase alerts enabled
+        users_to_notify = await asyncio.get_running_loop().run_in_executor(
+            None, _devices_to_notify, "lunar_phase_alerts"
+        )
+
+        if not users_to_notify:
+            logger.info("No users subscribed to lunar phase alerts or all in quiet hours")
+            return
+
+        # Get current lunar phase
+        insights_service = DailyInsightsService()
+        lunar_info = insights_service.get_lunar_phase_info(datetime.now().date())
+
+        notification = FCMNotification(
+            title="🌙 Lunar Phase Update",
+            body=f"This week: {lunar_info.get('phase', 'Check the lunar calendar')}",
+            data={
+                "type": "lunar_phase",
+                "phase": lunar_info.get("phase", "unknown"),
+                "date": datetime.now().isoformat(),
+            }
+        )
+
+        entry_id = await _enqueue_topic_notification(
+            "lunar_phases", notification, f"lunar_update:{datetime.now().date().isoformat()}"
+        )
+
+        logger.info(f"Lunar phase update queued for {len(users_to_notify)} users (outbox #{entry_id})")
 
     async def _send_motivational_quote(self):
         """Send a motivational quote to subscribed users."""
-        try:
-            from app.services.firebase_admin_service import get_firebase_service, FCMNotification
-            from app.api.routes.notifications import _notification_preferences
-            
-            firebase = get_firebase_service()
-            
-            # Check if any users have motivational quotes enabled
-            users_to_notify = [
-                device_id for device_id, prefs in _notification_preferences.items()
-                if prefs.get("motivational_quotes", True) and not _check_quiet_hours(prefs)
-            ]
-            
-            if not users_to_notify:
-                logger.info("No users subscribed to motivational quotes or all in quiet hours")
-                return
-            
-            quotes = [
-                "Your life is a divine journey of discovery and growth.",
-                "Numbers reveal the hidden patterns of your destiny.",
-                "Every day brings new opportunities for transformation.",
-                "Trust the cosmic forces guiding your path.",
-                "Your numerology is the key to understanding your purpose.",
-                "Embrace the wisdom your numbers hold for you.",
-                "Today is a gift—live it with intention and gratitude.",
-                "Your journey is unique, your purpose is clear.",
-                "Let your numbers guide you to your highest self.",
-                "Every challenge is an opportunity for growth.",
-            ]
-            
-            import random
-            quote = random.choice(quotes)
-            
-            notification = FCMNotification(
-                title="💫 Daily Inspiration",
-                body=quote,
-                data={
-                    "type": "inspiration",
-                    "date": datetime.now().isoformat(),
-                }
-            )
-            
-            result = firebase.send_to_topic(
-                topic="inspirational",
-                notification=notification
-            )
-            
-            logger.info(f"Motivational quote sent to {len(users_to_notify)} users: {result}")
-        except Exception as e:
-            logger.error(f"Error sending motivational quote: {str(e)}")
+        from app.services.firebase_admin_service import FCMNotification
+
+        # Check if any users have motivational quotes enabled
+        users_to_notify = await asyncio.get_running_loop().run_in_executor(
+            None, _devices_to_notify, "motivational_quotes"
+        )
+
+        if not users_to_notify:
+            logger.info("No users subscribed to motivational quotes or all in quiet hours")
+            return
+
+        quotes = [
+            "Your life is a divine journey of discovery and growth.",
+            "Numbers reveal the hidden patterns of your destiny.",
+            "Every day brings new opportunities for transformation.",
+            "Trust the cosmic forces guiding your path.",
+            "Your numerology is the key to understanding your purpose.",
+            "Embrace the wisdom your numbers hold for you.",
+            "Today is a gift—live it with intention and gratitude.",
+            "Your journey is unique, your purpose is clear.",
+            "Let your numbers guide you to your highest self.",
+            "Every challenge is an opportunity for growth.",
+        ]
+
+        import random
+        quote = random.choice(quotes)
+
+        notification = FCMNotification(
+            title="💫 Daily Inspiration",
+            body=quote,
+            data={
+                "type": "inspiration",
+                "date": datetime.now().isoformat(),
+            }
+        )
+
+        entry_id = await _enqueue_topic_notification(
+            "inspirational", notification, f"motivational_quote:{datetime.now().date().isoformat()}"
+        )
+
+        logger.info(f"Motivational quote queued for {len(users_to_notify)} users (outbox #{entry_id})")
+
+    def _scheduled_jobs(self) -> list:
+        """The scheduled jobs: the leader's scheduler, or on a standby the shared job store."""
+        if self.is_leader or self.job_store != "database":
+            return self.scheduler.get_jobs()
+        store = self._create_job_store()
+        store.start(self.scheduler, "default")
+        return store.get_all_jobs()
 
     def get_job_status(self) -> dict:
-        """Get status of all scheduled jobs."""
+        """Get status of all scheduled jobs (the same on every worker)."""
         jobs = []
-        for job in self.scheduler.get_jobs():
+        for job in self._scheduled_jobs():
             jobs.append({
                 "id": job.id,
                 "name": job.name,
                 "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
                 "trigger": str(job.trigger),
+                "misfire_grace_seconds": job.misfire_grace_time,
             })
         
         return {
             "scheduler_running": self.is_running,
+            "role": "leader" if self.is_leader else "standby",
+            "worker_pid": os.getpid(),
             "total_jobs": len(jobs),
             "jobs": jobs,
         }
@@ -2,6 +2,7 @@
 
 from io import BytesIO
 from datetime import datetime
+from typing import Optional
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -9,6 +10,8 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak,
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.lib import colors
 
+from ..core.tracing import span, traced
+
 
 class PDFExportService:
     """Generate professional PDF reports for numerology readings."""
@@ -71,6 +74,7 @@ class PDFExportService:
             fontName='Helvetica-Bold',
         ))
 
+    @traced("pdf.generate", kind="reading")
     def generate_full_reading_pdf(self, decode_response: dict) -> BytesIO:
         """
         Generate a comprehensive PDF report from /decode/full response.
@@ -403,7 +407,20 @@ class PDFExportService:
         ))
         
         # Build PDF
-        doc.build(story)
+        with span("pdf.build"):
+            doc.build(story)
         buffer.seek(0)
         return buffer
 
+
+
+# Singleton instance, built on the first export (stylesheet setup isn't free)
+_pdf_export_service: Optional[PDFExportService] = None
+
+
+def get_pdf_export_service() -> PDFExportService:
+    """Get or create the PDF export service instance."""
+    global _pdf_export_service
+    if _pdf_export_service is None:
+        _pdf_export_service = PDFExportService()
+    return _pdf_export_service
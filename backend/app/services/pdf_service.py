@@ -10,7 +10,10 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, LongTable
 from reportlab.lib import colors
 
+from ..core.tracing import span, traced
 
+
+@traced("pdf.generate", kind="report")
 def generate_report_pdf(full_name: str, date_of_birth: str, report: dict) -> BytesIO:
     """
     Generate a PDF document from a report object.
@@ -298,7 +301,8 @@ def generate_report_pdf(full_name: str, date_of_birth: str, report: dict) -> Byt
         story.append(Paragraph("Generated by Destiny Decoder", subtitle_style))
     
     # Build the PDF
-    doc.build(story)
+    with span("pdf.build"):
+        doc.build(story)
     pdf_buffer.seek(0)
     
     return pdf_buffer
@@ -0,0 +1,230 @@
+"""
+Profile Service
+Derived numerology snapshot stored on UserProfile.
+
+The snapshot holds everything the dashboard derives from name and date of
+birth. It is recomputed only when those inputs change or when
+NUMEROLOGY_ENGINE_VERSION is bumped, so reads never re-derive it.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cycles import calculate_blessed_days
+from app.core.life_seal import calculate_life_seal
+from app.core.name_numbers import calculate_soul_number, calculate_personality_number
+from app.models.user_profile import UserProfile
+
+# Bump whenever a calculation feeding the snapshot changes so stored
+# snapshots are treated as stale and recomputed.
+NUMEROLOGY_ENGINE_VERSION = 1
+
+
+def parse_date_of_birth(date_of_birth: str) -> Tuple[int, int, int]:
+    """
+    Split a YYYY-MM-DD date of birth into (year, month, day).
+
+    Raises:
+        ValueError: If the string is not a valid date
+    """
+    date_parts = date_of_birth.split("-")
+    if len(date_parts) != 3:
+        raise ValueError(f"Expected YYYY-MM-DD, got {date_of_birth!r}")
+    year = int(date_parts[0])
+    month = int(date_parts[1])
+    day = int(date_parts[2])
+    return year, month, day
+
+
+def compute_profile_snapshot(first_name: str, date_of_birth: str) -> Dict:
+    """
+    Compute the derived numerology for a profile's name and date of birth.
+
+    Args:
+        first_name: Profile first name
+        date_of_birth: YYYY-MM-DD
+
+    Returns:
+        Snapshot dictionary (JSON-serializable), including the inputs it was built from
+    """
+    year, month, day = parse_date_of_birth(date_of_birth)
+    life_seal_data = calculate_life_seal(day, month, year)
+
+    return {
+        "inputs": {
+            "first_name": first_name,
+            "date_of_birth": date_of_birth,
+        },
+        "year_of_birth": year,
+        "month_of_birth": month,
+        "day_of_birth": day,
+        "life_seal": life_seal_data["number"],
+        "life_planet": life_seal_data["planet"],
+        "soul_number": calculate_soul_number(first_name),
+        "personality_number": calculate_personality_number(first_name),
+        "blessed_days": calculate_blessed_days(day),
+    }
+
+
+def is_snapshot_current(profile: UserProfile) -> bool:
+    """Check the stored snapshot matches the engine version and the profile's current inputs."""
+    snapshot = profile.calculations
+    if not snapshot or profile.calculations_version != NUMEROLOGY_ENGINE_VERSION:
+        return False
+    return snapshot.get("inputs") == {
+        "first_name": profile.first_name,
+        "date_of_birth": profile.date_of_birth,
+    }
+
+
+def refresh_profile_snapshot(profile: UserProfile) -> bool:
+    """
+    Recompute and store the snapshot on the profile if it is stale.
+    Call on write paths (create/update); the caller commits.
+
+    Returns:
+        True if the snapshot was recomputed
+    """
+    if is_snapshot_current(profile):
+        return False
+
+    snapshot = compute_profile_snapshot(profile.first_name, profile.date_of_birth)
+    profile.calculations = snapshot
+    profile.calculations_version = NUMEROLOGY_ENGINE_VERSION
+    profile.life_seal = snapshot["life_seal"]
+    return True
+
+
+def get_profile_snapshot(profile: UserProfile) -> Dict:
+    """
+    Get the profile's snapshot for reading.
+    Falls back to computing in memory (without touching the row) if it is stale.
+    """
+    if is_snapshot_current(profile):
+        return profile.calculations
+    return compute_profile_snapshot(profile.first_name, profile.date_of_birth)
+
+
+def current_pdf_month() -> str:
+    """Month key (YYYY-MM, UTC) that PDF export counts are tracked against."""
+    return datetime.utcnow().strftime("%Y-%m")
+
+
+def effective_pdf_exports(profile: UserProfile, month: Optional[str] = None) -> Tuple[int, str]:
+    """
+    PDF export count as of the given month, without modifying the profile.
+    A count stored against an earlier month reads as zero for the new month.
+
+    Returns:
+        (pdf_exports_count, pdf_exports_month)
+    """
+    month = month or current_pdf_month()
+    if profile.pdf_exports_month != month:
+        return 0, month
+    return profile.pdf_exports_count or 0, month
+
+
+def roll_over_pdf_exports(db: Session, month: Optional[str] = None) -> int:
+    """
+    Reset every PDF export counter still tracked against a previous month.
+    Runs as one bulk UPDATE from the monthly scheduler job.
+
+    Returns:
+        Number of profiles reset
+    """
+    month = month or current_pdf_month()
+    result = db.execute(
+        update(UserProfile)
+        .where(or_(UserProfile.pdf_exports_month.is_(None), UserProfile.pdf_exports_month != month))
+        .values(pdf_exports_count=0, pdf_exports_month=month)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _profile_filters(user_id: Optional[str], device_id: Optional[str]) -> list:
+    """WHERE clauses to try in order: the user's profile first, then the device's."""
+    filters = []
+    if user_id:
+        filters.append(UserProfile.user_id == user_id)
+    if device_id:
+        filters.append(UserProfile.device_id == device_id)
+    return filters
+
+
+def _atomic_profile_update(db: Session, user_id: Optional[str], device_id: Optional[str], values: dict, returning: tuple):
+    """
+    Run one UPDATE ... RETURNING against the first matching profile lookup and commit.
+    device_id isn't unique, so only one profile is updated: the oldest match.
+    """
+    for condition in _profile_filters(user_id, device_id):
+        target = (
+            select(UserProfile.id)
+            .where(condition)
+            .order_by(UserProfile.created_at, UserProfile.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        row = db.execute(
+            update(UserProfile)
+            .where(UserProfile.id == target)
+            .values(**values)
+            .returning(*returning)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is not None:
+            db.commit()
+            return row
+    db.rollback()
+    return None
+
+
+def increment_readings_count(db: Session, user_id: Optional[str] = None, device_id: Optional[str] = None) -> Optional[Dict]:
+    """
+    Atomically add one reading and stamp the last reading date.
+    A single UPDATE ... RETURNING, so concurrent calls never lose counts.
+
+    Returns:
+        {"readings_count", "last_reading_date"} or None if no profile matched
+    """
+    row = _atomic_profile_update(
+        db, user_id, device_id,
+        values={
+            "readings_count": func.coalesce(UserProfile.readings_count, 0) + 1,
+            "last_reading_date": datetime.utcnow(),
+        },
+        returning=(UserProfile.readings_count, UserProfile.last_reading_date),
+    )
+    if row is None:
+        return None
+    return {"readings_count": row.readings_count, "last_reading_date": row.last_reading_date}
+
+
+def increment_pdf_exports_count(db: Session, user_id: Optional[str] = None, device_id: Optional[str] = None) -> Optional[Dict]:
+    """
+    Atomically add one PDF export for the current month.
+    The monthly rollover is folded into the same statement: a count stored
+    against an earlier month restarts at 1.
+
+    Returns:
+        {"pdf_exports_count", "pdf_exports_month"} or None if no profile matched
+    """
+    month = current_pdf_month()
+    row = _atomic_profile_update(
+        db, user_id, device_id,
+        values={
+            "pdf_exports_count": case(
+                (UserProfile.pdf_exports_month == month, func.coalesce(UserProfile.pdf_exports_count, 0) + 1),
+                else_=1,
+            ),
+            "pdf_exports_month": month,
+        },
+        returning=(UserProfile.pdf_exports_count, UserProfile.pdf_exports_month),
+    )
+    if row is None:
+        return None
+    return {"pdf_exports_count": row.pdf_exports_count, "pdf_exports_month": row.pdf_exports_month}
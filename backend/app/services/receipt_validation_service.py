@@ -1,71 +1,309 @@
 """
 Receipt validation service for Apple App Store and Google Play Store.
+
+Validation is async over a shared httpx.AsyncClient, so the event loop is
+never blocked and connections to the store endpoints are kept alive across
+requests. Each endpoint sits behind a circuit breaker: after repeated
+failures calls fail fast with ReceiptValidationUnavailable instead of
+tying up request handlers on a store outage.
+
+Results are cached per receipt and concurrent identical validations share
+one upstream call, so client retries don't multiply store traffic.
 """
-import base64
+import asyncio
+import hashlib
 import json
-import requests
 import logging
-from typing import Dict, Optional
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
+import httpx
+
+from app.core.metrics import cache_lookup_counters
+
 logger = logging.getLogger(__name__)
 
+RECEIPT_HTTP_TIMEOUT = float(os.getenv("RECEIPT_HTTP_TIMEOUT", "10"))
+RECEIPT_HTTP_CONNECT_TIMEOUT = float(os.getenv("RECEIPT_HTTP_CONNECT_TIMEOUT", "3"))
+RECEIPT_HTTP_MAX_CONNECTIONS = int(os.getenv("RECEIPT_HTTP_MAX_CONNECTIONS", "20"))
+RECEIPT_HTTP_KEEPALIVE = int(os.getenv("RECEIPT_HTTP_KEEPALIVE", "10"))
+RECEIPT_BREAKER_FAILURES = int(os.getenv("RECEIPT_BREAKER_FAILURES", "5"))
+RECEIPT_BREAKER_RESET_SECONDS = float(os.getenv("RECEIPT_BREAKER_RESET_SECONDS", "30"))
+# verifyReceipt is read-only, so asking production and sandbox at once is safe;
+# it saves a round trip for sandbox (TestFlight/review) receipts
+APPLE_VERIFY_CONCURRENT = os.getenv("APPLE_VERIFY_CONCURRENT", "true").lower() in ("1", "true", "yes")
+
+RECEIPT_CACHE_MAX_ENTRIES = int(os.getenv("RECEIPT_CACHE_MAX_ENTRIES", "10000"))
+# Upper bound for a valid result; never cached past the subscription's expires_date
+RECEIPT_CACHE_TTL_SECONDS = float(os.getenv("RECEIPT_CACHE_TTL_SECONDS", "900"))
+# Invalid and inactive results are kept briefly to absorb retry storms
+RECEIPT_NEGATIVE_CACHE_SECONDS = float(os.getenv("RECEIPT_NEGATIVE_CACHE_SECONDS", "30"))
+
+# Apple status: sandbox receipt sent to the production endpoint
+APPLE_STATUS_SANDBOX_RECEIPT = 21007
+
+
+class ReceiptValidationUnavailable(Exception):
+    """The store could not be reached (timeout, 5xx or circuit open); the client should retry."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls pass through. After `failure_threshold` consecutive failures
+    the breaker opens and calls are rejected for `reset_timeout` seconds, then
+    one trial call is let through (half-open); success closes it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = RECEIPT_BREAKER_FAILURES,
+                 reset_timeout: float = RECEIPT_BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise ReceiptValidationUnavailable if the call should not be attempted."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise ReceiptValidationUnavailable(f"{self.name} circuit open")
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    def release(self) -> None:
+        """The call was abandoned (cancelled) without an outcome."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"⚠ {self.name} circuit opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class ReceiptValidationCache:
+    """
+    LRU table of validation results with a per-entry expiry.
+
+    Keys come from receipt_cache_key(); a valid result lives until the
+    earlier of the TTL and the subscription's expires_date, so a cached
+    "active" answer can never outlive the subscription it describes.
+    """
+
+    def __init__(self, max_entries: int = RECEIPT_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = RECEIPT_CACHE_TTL_SECONDS,
+                 negative_ttl_seconds: float = RECEIPT_NEGATIVE_CACHE_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter, self._miss_counter = cache_lookup_counters("receipt_validation")
+
+    def ttl_for(self, result: Dict) -> float:
+        """Seconds a result may be served from cache (0 = don't cache)."""
+        if not (result.get("valid") and result.get("is_active")):
+            return self.negative_ttl_seconds
+        expires_date = result.get("expires_date")
+        if expires_date is None:
+            return self.ttl_seconds
+        return max(0.0, min(self.ttl_seconds, (expires_date - datetime.utcnow()).total_seconds()))
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            self._miss_counter.inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._hit_counter.inc()
+        return entry[1]
+
+    def put(self, key: str, result: Dict) -> None:
+        ttl = self.ttl_for(result)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def receipt_cache_key(platform: str, receipt_data: str, product_id: str) -> str:
+    """
+    Cache key for a validation request.
+
+    Google purchases are keyed by their purchase token (stable across
+    re-encodings of the receipt JSON); anything else by a hash of the receipt.
+    """
+    if platform == "android":
+        try:
+            purchase_token = json.loads(receipt_data).get("purchaseToken")
+        except (ValueError, AttributeError):
+            purchase_token = None
+        if purchase_token:
+            return f"android:{product_id}:token:{purchase_token}"
+    digest = hashlib.sha256(receipt_data.encode("utf-8")).hexdigest()
+    return f"{platform}:{product_id}:sha256:{digest}"
+
 
 class ReceiptValidationService:
     """Service for validating purchase receipts from Apple and Google."""
-    
+
     # Apple Sandbox and Production URLs
     APPLE_SANDBOX_URL = "https://sandbox.itunes.apple.com/verifyReceipt"
     APPLE_PRODUCTION_URL = "https://buy.itunes.apple.com/verifyReceipt"
-    
+
     # Google Play Developer API
     GOOGLE_PLAY_URL = "https://androidpublisher.googleapis.com/androidpublisher/v3"
-    
-    @staticmethod
-    def validate_apple_receipt(receipt_data: str, shared_secret: Optional[str] = None) -> Dict:
+
+    def __init__(
+        self,
+        apple_production_url: str = APPLE_PRODUCTION_URL,
+        apple_sandbox_url: str = APPLE_SANDBOX_URL,
+        client: Optional[httpx.AsyncClient] = None,
+        concurrent_sandbox: bool = APPLE_VERIFY_CONCURRENT,
+        cache: Optional[ReceiptValidationCache] = None,
+    ):
+        """
+        Args:
+            apple_production_url: verifyReceipt production endpoint
+            apple_sandbox_url: verifyReceipt sandbox endpoint
+            client: Shared HTTP client (created lazily if omitted)
+            concurrent_sandbox: Query sandbox alongside production instead of after a 21007
+            cache: Result cache (a fresh one if omitted)
+        """
+        self.apple_production_url = apple_production_url
+        self.apple_sandbox_url = apple_sandbox_url
+        self.concurrent_sandbox = concurrent_sandbox
+        self._client = client
+        self.cache = cache if cache is not None else ReceiptValidationCache()
+        self._in_flight: Dict[str, "asyncio.Task"] = {}
+        self.deduplicated = 0
+        self.breakers = {
+            "apple_production": CircuitBreaker("apple_production"),
+            "apple_sandbox": CircuitBreaker("apple_sandbox"),
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client shared by every validation."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(RECEIPT_HTTP_TIMEOUT, connect=RECEIPT_HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=RECEIPT_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=RECEIPT_HTTP_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections (app shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def _post_json(self, breaker_name: str, url: str, payload: Dict) -> Dict:
+        """POST through a circuit breaker; transport errors and 5xx count as failures."""
+        breaker = self.breakers[breaker_name]
+        breaker.before_call()
+        try:
+            response = await self.client.post(url, json=payload)
+            if response.status_code >= 500:
+                raise ReceiptValidationUnavailable(f"{breaker_name} returned HTTP {response.status_code}")
+            result = response.json()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except (httpx.HTTPError, ValueError, ReceiptValidationUnavailable) as e:
+            breaker.record_failure()
+            if isinstance(e, ReceiptValidationUnavailable):
+                raise
+            raise ReceiptValidationUnavailable(f"{breaker_name} request failed: {str(e)}") from e
+        breaker.record_success()
+        return result
+
+    async def _verify_apple(self, payload: Dict) -> Dict:
+        """Production result, or the sandbox result for a sandbox receipt."""
+        if not self.concurrent_sandbox:
+            result = await self._post_json("apple_production", self.apple_production_url, payload)
+            if result.get("status") == APPLE_STATUS_SANDBOX_RECEIPT:
+                logger.info("Receipt is sandbox, retrying with sandbox URL")
+                result = await self._post_json("apple_sandbox", self.apple_sandbox_url, payload)
+            return result
+
+        sandbox = asyncio.create_task(self._post_json("apple_sandbox", self.apple_sandbox_url, payload))
+        # An unused sandbox answer may still fail; retrieve it so it isn't logged as unhandled
+        sandbox.add_done_callback(lambda task: task.cancelled() or task.exception())
+        try:
+            result = await self._post_json("apple_production", self.apple_production_url, payload)
+        except BaseException:
+            sandbox.cancel()
+            raise
+        if result.get("status") != APPLE_STATUS_SANDBOX_RECEIPT:
+            sandbox.cancel()
+            return result
+        logger.info("Receipt is sandbox, using sandbox response")
+        return await sandbox
+
+    async def validate_apple_receipt(self, receipt_data: str, shared_secret: Optional[str] = None) -> Dict:
         """
         Validate Apple App Store receipt.
-        
+
         Args:
             receipt_data: Base64 encoded receipt
             shared_secret: Optional shared secret for subscription auto-renew
-            
+
         Returns:
             Dict with validation result
+
+        Raises:
+            ReceiptValidationUnavailable: If Apple could not be reached
         """
         payload = {"receipt-data": receipt_data}
         if shared_secret:
             payload["password"] = shared_secret
-        
-        # Try production first
-        response = requests.post(
-            ReceiptValidationService.APPLE_PRODUCTION_URL,
-            json=payload,
-            timeout=10
-        )
-        
-        result = response.json()
-        
-        # If status is 21007 (sandbox receipt sent to production), retry with sandbox
-        if result.get("status") == 21007:
-            logger.info("Receipt is sandbox, retrying with sandbox URL")
-            response = requests.post(
-                ReceiptValidationService.APPLE_SANDBOX_URL,
-                json=payload,
-                timeout=10
-            )
-            result = response.json()
-        
+
+        result = await self._verify_apple(payload)
+
         if result.get("status") == 0:
             # Success
             latest_receipt_info = result.get("latest_receipt_info", [])
             if latest_receipt_info:
                 latest = latest_receipt_info[-1]
-                
+
                 # Parse expiration date
                 expires_ms = int(latest.get("expires_date_ms", 0))
                 expires_date = datetime.fromtimestamp(expires_ms / 1000) if expires_ms else None
-                
+
                 return {
                     "valid": True,
                     "platform": "ios",
@@ -78,7 +316,7 @@ class ReceiptValidationService:
                     "is_active": expires_date > datetime.utcnow() if expires_date else False,
                     "raw_response": result
                 }
-        
+
         # Validation failed
         logger.warning(f"Apple receipt validation failed: status={result.get('status')}")
         return {
@@ -86,28 +324,28 @@ class ReceiptValidationService:
             "error": f"Apple validation failed with status {result.get('status')}",
             "raw_response": result
         }
-    
-    @staticmethod
-    def validate_google_receipt(
+
+    async def validate_google_receipt(
+        self,
         receipt_data: str,
         product_id: str,
         package_name: str = "com.destinydecoder.app"
     ) -> Dict:
         """
         Validate Google Play Store receipt.
-        
+
         Note: This requires Google Play Developer API credentials.
         For production, you'll need:
         1. Enable Google Play Developer API
         2. Create service account
         3. Generate credentials JSON
         4. Grant service account access to your app
-        
+
         Args:
             receipt_data: Purchase token from Google Play
             product_id: Product ID (SKU)
             package_name: Android package name
-            
+
         Returns:
             Dict with validation result
         """
@@ -115,19 +353,20 @@ class ReceiptValidationService:
         try:
             receipt_json = json.loads(receipt_data)
             purchase_token = receipt_json.get("purchaseToken")
-            
+
             if not purchase_token:
                 return {"valid": False, "error": "Missing purchaseToken"}
-            
+
             # TODO: Implement Google Play API call
             # This requires:
             # - Service account credentials
             # - OAuth 2.0 token
             # - Google Play Developer API enabled
-            
+            # Use self.client (and a "google_play" breaker) so calls share the pool
+
             # For now, return a mock validation for development
             logger.warning("Google Play validation not yet implemented - using mock")
-            
+
             # Mock validation for development
             return {
                 "valid": True,
@@ -141,26 +380,65 @@ class ReceiptValidationService:
                 "is_active": True,
                 "raw_response": receipt_json
             }
-            
+
         except json.JSONDecodeError:
             return {"valid": False, "error": "Invalid receipt format"}
-    
-    @staticmethod
-    def validate_receipt(platform: str, receipt_data: str, product_id: str) -> Dict:
+
+    async def validate_receipt(self, platform: str, receipt_data: str, product_id: str) -> Dict:
         """
-        Validate receipt for any platform.
-        
+        Validate receipt for any platform, from cache when possible.
+
+        Concurrent calls for the same receipt wait on a single upstream
+        validation; a caller going away does not cancel it for the others.
+
         Args:
             platform: 'ios' or 'android'
             receipt_data: Receipt data from platform
             product_id: Product ID being purchased
-            
+
         Returns:
             Dict with validation result
+
+        Raises:
+            ReceiptValidationUnavailable: If the store could not be reached
         """
+        key = receipt_cache_key(platform, receipt_data, product_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.deduplicated += 1
+        else:
+            task = asyncio.create_task(self._validate_uncached(platform, receipt_data, product_id))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish_validation(key, done))
+        return dict(await asyncio.shield(task))
+
+    def _finish_validation(self, key: str, task: "asyncio.Task") -> None:
+        """Drop the in-flight entry and cache the outcome (store outages are not cached)."""
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self.cache.put(key, task.result())
+
+    async def _validate_uncached(self, platform: str, receipt_data: str, product_id: str) -> Dict:
         if platform == "ios":
-            return ReceiptValidationService.validate_apple_receipt(receipt_data)
+            return await self.validate_apple_receipt(receipt_data)
         elif platform == "android":
-            return ReceiptValidationService.validate_google_receipt(receipt_data, product_id)
+            return await self.validate_google_receipt(receipt_data, product_id)
         else:
             return {"valid": False, "error": f"Unsupported platform: {platform}"}
+
+
+# Global instance
+_receipt_validation_service: Optional[ReceiptValidationService] = None
+
+
+def get_receipt_validation_service() -> ReceiptValidationService:
+    """Get or create the shared receipt validation service."""
+    global _receipt_validation_service
+    if _receipt_validation_service is None:
+        _receipt_validation_service = ReceiptValidationService()
+    return _receipt_validation_service
@@ -0,0 +1,260 @@
+"""
+Leader election for the notification scheduler.
+
+Every gunicorn worker runs the app lifespan, but scheduled jobs must fire
+once, not once per worker. Workers campaign for a lock that is released
+automatically when its holder dies, and only the holder runs the jobs:
+
+- PostgreSQL: a session-level advisory lock (pg_try_advisory_lock) held
+  on a dedicated connection. If the leader crashes, its connection closes
+  and the lock frees, whichever host the workers run on.
+- SQLite and other databases: an exclusive flock on a lock file next to
+  the database. That is single-host, as SQLite is. The kernel drops the
+  lock when the process exits.
+
+Standbys retry every SCHEDULER_LEADER_RETRY_SECONDS, so a new leader takes
+over within that interval. The leader re-checks its lock on the same
+interval and steps down if it was lost, e.g. when the DB connection
+dropped.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from typing import Awaitable, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock; development runs a single process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Set to false only where a single process runs the app (every process would schedule)
+SCHEDULER_LEADER_ELECTION = os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() in ("1", "true", "yes")
+SCHEDULER_LEADER_RETRY_SECONDS = float(os.getenv("SCHEDULER_LEADER_RETRY_SECONDS", "15"))
+# Advisory lock id; deployments sharing one PostgreSQL database need distinct ids
+SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", "724531029"))
+SCHEDULER_LOCK_FILE = os.getenv("SCHEDULER_LOCK_FILE")
+
+
+class AdvisoryLock:
+    """PostgreSQL session advisory lock, held on one connection while leading."""
+
+    def __init__(self, db_engine, key: int = SCHEDULER_LOCK_KEY):
+        self.engine = db_engine
+        self.key = key
+        self._connection = None
+
+    @property
+    def description(self) -> str:
+        return f"advisory lock {self.key}"
+
+    def acquire(self) -> bool:
+        """Try to take the lock without waiting. True if this process holds it."""
+        from sqlalchemy import text
+
+        if self._connection is not None:
+            return self.is_held()
+        connection = self.engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar()
+            # Session locks outlive the transaction; don't sit idle in one
+            connection.commit()
+        except Exception:
+            connection.invalidate()
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def is_held(self) -> bool:
+        """Whether the lock's connection is still alive (the lock goes with it)."""
+        from sqlalchemy import text
+
+        if self._connection is None:
+            return False
+        try:
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠ Scheduler lock connection lost: {str(e)}")
+            self._discard()
+            return False
+
+    def release(self) -> None:
+        from sqlalchemy import text
+
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._connection.commit()
+            self._connection.close()
+        except Exception:
+            self._discard()
+        self._connection = None
+
+    def _discard(self) -> None:
+        # Never hand a connection that may still hold the lock back to the pool
+        try:
+            self._connection.invalidate()
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+class FileLock:
+    """Exclusive, non-blocking flock on a file, held while leading."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def description(self) -> str:
+        return f"lock file {self.path}"
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        # Holder's pid, for whoever inspects the file
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self._fd = fd
+        return True
+
+    def is_held(self) -> bool:
+        return self._fd is not None
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+
+
+def default_lock_file(database_url: str) -> str:
+    """Lock file beside a SQLite database file, else in the temp directory."""
+    from app.config.database import is_file_sqlite
+
+    if is_file_sqlite(database_url):
+        from sqlalchemy.engine import make_url
+
+        return f"{make_url(database_url).database}.scheduler.lock"
+    return os.path.join(tempfile.gettempdir(), "destiny-scheduler.lock")
+
+
+def create_leader_lock(db_engine=None):
+    """
+    The lock for this deployment's database.
+
+    Args:
+        db_engine: Primary engine (defaults to app.config.database.engine)
+
+    Returns:
+        AdvisoryLock on PostgreSQL, FileLock otherwise (SCHEDULER_LOCK_FILE
+        overrides the file's location)
+    """
+    if db_engine is None:
+        from app.config.database import engine as db_engine
+
+    if db_engine.dialect.name == "postgresql":
+        return AdvisoryLock(db_engine)
+    return FileLock(SCHEDULER_LOCK_FILE or default_lock_file(str(db_engine.url)))
+
+
+class LeaderElection:
+    """
+    Keeps campaigning for the lock in the background and calls on_elected
+    when this process becomes leader and on_deposed when it stops being one.
+    """
+
+    def __init__(
+        self,
+        lock,
+        on_elected: Callable[[], Awaitable[None]],
+        on_deposed: Callable[[], Awaitable[None]],
+        retry_seconds: float = SCHEDULER_LEADER_RETRY_SECONDS,
+    ):
+        self.lock = lock
+        self.on_elected = on_elected
+        self.on_deposed = on_deposed
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> bool:
+        """Campaign once now, then keep campaigning. Returns whether this process leads."""
+        await self.campaign()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self.is_leader
+
+    async def campaign(self) -> None:
+        """One round: standbys try to take the lock, the leader checks it still holds it."""
+        loop = asyncio.get_running_loop()
+        if self.is_leader:
+            if not await loop.run_in_executor(None, self.lock.is_held):
+                logger.warning(f"⚠ Lost scheduler leadership ({self.lock.description})")
+                self.is_leader = False
+                await self.on_deposed()
+            return
+
+        try:
+            acquired = await loop.run_in_executor(None, self.lock.acquire)
+        except Exception as e:
+            logger.error(f"Scheduler leader election failed: {str(e)}")
+            return
+        if not acquired:
+            return
+        logger.info(f"✓ Elected scheduler leader (pid {os.getpid()}, {self.lock.description})")
+        self.is_leader = True
+        try:
+            await self.on_elected()
+        except Exception as e:
+            # Leave the jobs to a worker that can run them
+            logger.error(f"Scheduler leader failed to start, stepping down: {str(e)}")
+            self.is_leader = False
+            await loop.run_in_executor(None, self.lock.release)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.retry_seconds)
+            try:
+                await self.campaign()
+            except Exception as e:
+                logger.error(f"Scheduler leader election failed: {str(e)}")
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand leadership over (the next standby takes it)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            self.is_leader = False
+            await self.on_deposed()
+        await asyncio.get_running_loop().run_in_executor(None, self.lock.release)
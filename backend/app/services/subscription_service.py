@@ -3,6 +3,7 @@ Subscription service for managing user subscriptions and feature access.
 """
 from datetime import datetime, timedelta
 from typing import Optional
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
 from app.models import User, SubscriptionHistory, SubscriptionStatus, SubscriptionTier
@@ -141,8 +142,10 @@ class SubscriptionService:
         # Update user's subscription status
         user = db.query(User).filter(User.id == user_id).first()
         if user:
-            user.subscription_tier = SubscriptionTier.PREMIUM if tier == "premium" else SubscriptionTier.PRO
-            user.subscription_expires = expires_at
+            user.set_subscription(
+                SubscriptionTier.PREMIUM if tier == "premium" else SubscriptionTier.PRO,
+                expires_at
+            )
         
         db.commit()
         db.refresh(subscription)
@@ -187,6 +190,68 @@ class SubscriptionService:
         
         return True
     
+    @staticmethod
+    def sweep_expired_subscriptions(
+        db: Session,
+        now: Optional[datetime] = None,
+        batch_size: int = 500
+    ) -> dict:
+        """
+        Move lapsed subscriptions to FREE in bulk.
+        
+        Each batch is one UPDATE on users (guarded so a renewal that lands
+        mid-sweep is left alone) and one UPDATE marking those users' lapsed
+        ACTIVE history rows EXPIRED, committed together.
+        
+        Args:
+            db: Database session
+            now: Cut-off time (default: utcnow)
+            batch_size: Users per batch
+            
+        Returns:
+            Dict with expired user and history row counts
+        """
+        now = now or datetime.utcnow()
+        lapsed = (
+            (User.effective_tier != SubscriptionTier.FREE)
+            & or_(User.subscription_expires.is_(None), User.subscription_expires <= now)
+        )
+        users_expired = 0
+        history_expired = 0
+        
+        while True:
+            user_ids = db.execute(
+                select(User.id).where(lapsed).limit(batch_size)
+            ).scalars().all()
+            if not user_ids:
+                break
+            
+            expired_ids = db.execute(
+                update(User)
+                .where(User.id.in_(user_ids), lapsed)
+                .values(effective_tier=SubscriptionTier.FREE, updated_at=now)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            if expired_ids:
+                history_expired += db.execute(
+                    update(SubscriptionHistory)
+                    .where(
+                        SubscriptionHistory.user_id.in_(expired_ids),
+                        SubscriptionHistory.status == SubscriptionStatus.ACTIVE,
+                        SubscriptionHistory.expires_at <= now
+                    )
+                    .values(status=SubscriptionStatus.EXPIRED, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+            db.commit()
+            users_expired += len(expired_ids)
+            
+            if len(user_ids) < batch_size:
+                break
+        
+        return {"users_expired": users_expired, "history_expired": history_expired}
+    
     @staticmethod
     def validate_receipt(platform: str, receipt_data: str) -> dict:
         """
@@ -0,0 +1,107 @@
+"""
+Production server configuration: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py            # from backend/ (main:app is the default app)
+    gunicorn -c backend/gunicorn.conf.py    # from the repository root (chdir is set below)
+
+Run scripts/migrate.py first; workers only verify the schema. Metrics
+from all workers are aggregated through PROMETHEUS_MULTIPROC_DIR, which
+this file sets (if unset) and empties when the master starts.
+
+With preload (the default) the master imports main, warms the shared
+read-only data (app.core.prefork) and freezes it before forking, so the
+workers share one copy-on-write copy instead of each building their own.
+Per-worker resources are created after the fork: each worker drops the
+pooled DB connections it inherited, and its lifespan starts the
+scheduler, the health checker and the HTTP clients.
+
+Environment:
+    PORT / GUNICORN_BIND    listen address (GUNICORN_BIND wins, default 0.0.0.0:$PORT or :8000)
+    WEB_CONCURRENCY         worker processes (default 2)
+    GUNICORN_PRELOAD        load and warm the app in the master (default true)
+    GUNICORN_TIMEOUT        seconds before a silent worker is restarted (default 60)
+    GUNICORN_ACCESS_LOG     access log file, "-" for stdout (default "-")
+    LOG_LEVEL               gunicorn log level (default info)
+    FORWARDED_ALLOW_IPS     exact proxy addresses trusted for X-Forwarded-For, comma
+                            separated (default 127.0.0.1; "*" lets clients pick their IP)
+    PROMETHEUS_MULTIPROC_DIR
+                            per-worker metrics files (default <tmp>/destiny-metrics)
+"""
+
+import gc
+import os
+import tempfile
+
+wsgi_app = "main:app"
+chdir = os.path.dirname(os.path.abspath(__file__))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+bind = os.getenv("GUNICORN_BIND") or f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+# Workers take the client address from X-Forwarded-For only when the peer
+# is one of these; otherwise every client behind the proxy shares its IP
+# (and its anonymous rate limit bucket)
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+# Every worker writes its metrics to files here and /metrics sums them.
+# prometheus_client picks its mode on import, so this must be in the
+# environment before the app loads. Emptied once per master: a reload
+# (HUP) reads this file again and keeps the running workers' files.
+multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "destiny-metrics")
+)
+if "DESTINY_METRICS_DIR_READY" not in os.environ:
+    os.makedirs(multiproc_dir, exist_ok=True)
+    for name in os.listdir(multiproc_dir):
+        if name.endswith(".db"):
+            os.remove(os.path.join(multiproc_dir, name))
+    os.environ["DESTINY_METRICS_DIR_READY"] = "1"
+
+
+# gunicorn reads this file before it preloads the app. Running no
+# collections in the master while the app loads keeps the heap compact,
+# without freed holes in the pages the workers will share. Workers turn
+# it back on after the fork; the master only supervises and leaves it off.
+if preload_app:
+    gc.disable()
+
+
+def when_ready(server):
+    if preload_app:
+        from app.core.prefork import warm_shared_state
+
+        warmed = warm_shared_state()
+        server.log.info(
+            f"Shared state warmed: {warmed['articles']} articles, "
+            f"{warmed['modules']} modules in {warmed['seconds']}s"
+        )
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        from app.core.prefork import freeze_shared_state
+
+        frozen = freeze_shared_state()
+        server.log.debug(f"Frozen {frozen} objects before forking")
+
+
+def post_fork(server, worker):
+    gc.enable()
+    if preload_app:
+        from app.config.database import reset_pools_after_fork
+
+        reset_pools_after_fork()
+
+
+def child_exit(server, worker):
+    from app.core.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
@@ -1,6 +1,6 @@
 """
 Database initialization and management script.
-Run this to set up the database for the first time.
+Run this to set up the database for the first time (runs all migrations).
 """
 import sys
 import os
@@ -9,8 +9,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.config.database import init_db, check_db_connection, engine, DATABASE_URL
-from app.models import Device, NotificationPreference
-from app.models.user_profile import UserProfile
+from sqlalchemy import inspect
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -37,16 +36,15 @@ def main():
     print()
     
     # Initialize database
-    print("Creating tables...")
+    print("Running migrations...")
     try:
         init_db()
         print()
         print("✅ Database initialized successfully!")
         print()
-        print("Tables created:")
-        print("  - devices")
-        print("  - notification_preferences")
-        print("  - user_profiles")
+        print("Tables:")
+        for table_name in sorted(inspect(engine).get_table_names()):
+            print(f"  - {table_name}")
         print()
         print("You can now start the server with: uvicorn backend.main:app --reload")
         return 0
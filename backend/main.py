@@ -1,9 +1,7 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from app.api.routes.auth import router as auth_router
 from app.api.routes.limits import router as limits_router
 from app.api.routes.destiny import router as destiny_router
@@ -17,8 +15,15 @@ from app.api.routes.analytics import router as analytics_router
 from app.api.routes.shares import router as shares_router
 from app.api.routes.subscriptions import router as subscriptions_router
 from app.api.routes.profile import router as profile_router
+from app.api.routes.profiling import router as profiling_router
 from app.services.notification_scheduler import get_notification_scheduler
+from app.core.health import get_health_monitor
+from app.core.metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.tracing import TRACING_ENABLED, TracingMiddleware, configure_tracing, shutdown_tracing
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
@@ -27,22 +32,26 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """
     Manage app startup and shutdown.
-    - Startup: Initialize database, Firebase, and notification scheduler
-    - Shutdown: Gracefully stop scheduler
+    - Startup: Verify database schema, Firebase, notification scheduler and
+      start the background health checker
+    - Shutdown: Gracefully stop the health checker and scheduler
+    
+    Migrations are not run here: scripts/migrate.py runs once per deploy
+    before workers start (set AUTO_MIGRATE=true to migrate in development).
     """
     # Startup
     try:
         from app.services.firebase_admin_service import get_firebase_service
-        from app.config.database import init_db, check_db_connection
+        from app.config.migrations import AUTO_MIGRATE, run_migrations, verify_schema
         
-        # Initialize database
-        init_db()
+        if TRACING_ENABLED:
+            configure_tracing()
         
-        # Check database connection
-        if check_db_connection():
-            logger.info("✓ Database connection verified")
-        else:
-            logger.warning("⚠ Database connection check failed")
+        # Verify the schema is at the migration head
+        if AUTO_MIGRATE:
+            run_migrations()
+        schema = verify_schema()
+        logger.info(f"✓ Database schema at revision {schema['current']}")
         
         # Initialize Firebase Admin SDK (optional for development)
         try:
@@ -60,6 +69,13 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠ Notification scheduler warning: {str(e)}")
         
+        # First component check now, then every HEALTH_CHECK_INTERVAL_SECONDS
+        components = await get_health_monitor().start()
+        if components["database"]["status"] == "ok":
+            logger.info("✓ Database connection verified")
+        else:
+            logger.warning("⚠ Database connection check failed")
+        
     except Exception as e:
         logger.error(f"Failed to initialize critical services: {str(e)}")
         raise
@@ -68,8 +84,14 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     try:
+        await get_health_monitor().stop()
         scheduler = get_notification_scheduler()
         await scheduler.stop()
+        # Only loaded (and only holding connections) once a receipt was validated
+        receipt_module = sys.modules.get("app.services.receipt_validation_service")
+        if receipt_module is not None:
+            await receipt_module.get_receipt_validation_service().aclose()
+        shutdown_tracing()
         logger.info("✓ All services shut down gracefully")
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
@@ -80,10 +102,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Token-bearing requests (X-Profile) run under cProfile; innermost so the
+# profile covers the route itself
+app.add_middleware(ProfilingMiddleware)
+
+# Per-tier token buckets shared by all workers (RATE_LIMIT_STORAGE); added
+# before CORS so 429 responses still carry CORS headers
+app.add_middleware(RateLimitMiddleware)
 
 # Configure CORS for Flutter web
 # IMPORTANT: In production, replace ["*"] with specific origins like:
@@ -96,6 +121,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost (request span, then metrics), so latency and status codes
+# include rate limiting and CORS
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
 
 app.include_router(auth_router)
 app.include_router(limits_router)
@@ -110,24 +140,58 @@ app.include_router(analytics_router)
 app.include_router(shares_router)
 app.include_router(subscriptions_router)
 app.include_router(profile_router)
+app.include_router(profiling_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (aggregated across workers in multi-process mode)."""
+    if not METRICS_ENABLED:
+        return Response(status_code=404)
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the worker is serving requests. No I/O."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe from the background checker's cached results.
+    503 until the first check, when the database is down, or when the
+    results have gone stale.
+    """
+    ready, report = get_health_monitor().readiness()
+    return JSONResponse(report, status_code=200 if ready else 503)
 
 
 @app.get("/health")
 async def health_check():
     """
-    Health check endpoint to verify service status.
-    Returns database connection status and service health.
+    Component status (database, pools, scheduler, Firebase) as last seen by
+    the background checker. Never queries the database itself.
     """
-    from app.config.database import check_db_connection
-    
-    db_status = check_db_connection()
-    
+    from app.config.database import get_pool_stats
+
+    ready, report = get_health_monitor().readiness()
+    components = report["components"]
+
+    def _state(name: str) -> str:
+        return components.get(name, {}).get("status", "unknown")
+
     return {
-        "status": "healthy" if db_status else "degraded",
-        "database": "connected" if db_status else "disconnected",
+        "status": report["status"],
+        "database": "connected" if _state("database") == "ok" else "disconnected",
+        "database_pools": get_pool_stats(),
         "services": {
             "api": "running",
-            "firebase": "initialized",
-            "scheduler": "running",
-        }
+            "firebase": "initialized" if _state("firebase") == "ok" else _state("firebase"),
+            "scheduler": "running" if _state("scheduler") == "ok" else _state("scheduler"),
+        },
+        "checked_at": report.get("checked_at"),
+        "components": components,
     }
@@ -1,56 +1,45 @@
 """
-Temporary backend server without Firebase initialization for testing
+Start the API server (main:app).
+
+    python run_server.py                    # gunicorn + gunicorn.conf.py: preloaded, forked workers
+    python run_server.py --workers 4 --port 8001
+    python run_server.py --reload           # development: one uvicorn process with autoreload
+
+Run from the backend directory after scripts/migrate.py (or with
+AUTO_MIGRATE=true in development). Where gunicorn is unavailable
+(Windows) a single uvicorn process is started instead.
 """
-import uvicorn
-import logging
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes.destiny import router as destiny_router
-from app.api.routes.interpretations import router as interpretations_router
-from app.api.routes.compatibility import router as compatibility_router
-from app.api.routes.daily_insights import router as daily_insights_router
-from app.api.routes.notifications import router as notifications_router
-from app.api.routes.export import router as export_router
-from app.api.routes.content import router as content_router
-from app.api.routes.analytics import router as analytics_router
-from app.api.routes.profile import router as profile_router
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Create FastAPI app without lifespan management
-app = FastAPI(title="Destiny Decoder API")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers (routers already define their own prefixes)
-app.include_router(destiny_router)
-app.include_router(interpretations_router)
-app.include_router(compatibility_router)
-app.include_router(daily_insights_router)
-app.include_router(notifications_router)
-app.include_router(export_router)
-app.include_router(content_router)
-app.include_router(analytics_router)
-app.include_router(profile_router)
-
-# Health check endpoint
-@app.get("/health")
-async def health():
-    return {"status": "ok", "service": "Destiny Decoder API"}
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+GUNICORN_CONFIG = os.path.join(BACKEND_DIR, "gunicorn.conf.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Destiny Decoder API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, help="Worker processes (default: WEB_CONCURRENCY or 2)")
+    parser.add_argument("--reload", action="store_true", help="Single process, restart on code changes")
+    args = parser.parse_args()
+
+    if args.reload or sys.platform == "win32":
+        import uvicorn
+
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=args.reload, app_dir=BACKEND_DIR)
+        return
+
+    command = [
+        sys.executable, "-m", "gunicorn",
+        "-c", GUNICORN_CONFIG,
+        "--bind", f"{args.host}:{args.port}",
+    ]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    os.execv(sys.executable, command)
+
 
 if __name__ == "__main__":
-    logger.info("Starting Destiny Decoder API server...")
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        log_level="info",
-    )
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Add the profile calculations snapshot columns (if missing) and backfill them.
+Re-run after bumping NUMEROLOGY_ENGINE_VERSION to refresh stale snapshots.
+Run from backend directory: python scripts/backfill_profile_snapshots.py [--chunk-size 500]
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text, or_
+from sqlalchemy.orm import load_only
+
+from app.config.database import SessionLocal, engine
+from app.models.user_profile import UserProfile
+from app.services.profile_service import NUMEROLOGY_ENGINE_VERSION, refresh_profile_snapshot
+
+SNAPSHOT_COLUMNS = {
+    "calculations": "JSON",
+    "calculations_version": "INTEGER",
+}
+
+
+def add_missing_columns() -> list:
+    """Add snapshot columns to an existing user_profiles table."""
+    existing = {column["name"] for column in inspect(engine).get_columns("user_profiles")}
+    added = []
+    with engine.begin() as conn:
+        for name, column_type in SNAPSHOT_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE user_profiles ADD COLUMN {name} {column_type}"))
+                added.append(name)
+    return added
+
+
+def backfill(chunk_size: int) -> tuple:
+    """Recompute stale snapshots in primary-key order, committing per chunk."""
+    db = SessionLocal()
+    refreshed = 0
+    failed = 0
+    last_id = ""
+    try:
+        while True:
+            profiles = (
+                db.query(UserProfile)
+                # Only the snapshot inputs/outputs, so older tables missing
+                # unrelated columns can still be backfilled.
+                .options(load_only(
+                    UserProfile.id,
+                    UserProfile.first_name,
+                    UserProfile.date_of_birth,
+                    UserProfile.life_seal,
+                    UserProfile.calculations,
+                    UserProfile.calculations_version,
+                ))
+                .filter(
+                    UserProfile.id > last_id,
+                    or_(
+                        UserProfile.calculations_version.is_(None),
+                        UserProfile.calculations_version != NUMEROLOGY_ENGINE_VERSION,
+                    ),
+                )
+                .order_by(UserProfile.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not profiles:
+                break
+            last_id = profiles[-1].id
+
+            for profile in profiles:
+                try:
+                    if refresh_profile_snapshot(profile):
+                        refreshed += 1
+                except ValueError as e:
+                    failed += 1
+                    print(f"  ⚠ Skipping profile {profile.id}: {e}")
+            db.commit()
+    finally:
+        db.close()
+    return refreshed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill profile calculation snapshots")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Profile snapshot backfill (engine version {NUMEROLOGY_ENGINE_VERSION})")
+    print("=" * 60)
+
+    added = add_missing_columns()
+    if added:
+        print(f"✓ Added columns: {', '.join(added)}")
+    else:
+        print("✓ Snapshot columns already present")
+
+    refreshed, failed = backfill(args.chunk_size)
+    print(f"✓ Refreshed {refreshed} snapshot(s), {failed} failed")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Compare concurrent read/write throughput of the SQLite profiles.
+"legacy" is the old single shared connection with a rollback journal;
+"tuned" is WAL with separate writer and query-only reader pools.
+Each profile runs in its own process.
+Run from backend directory: python scripts/benchmark_sqlite.py [--duration 5] [--readers 8] [--writers 2]
+"""
+
+import argparse
+import json
+import sys
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from app.config.database import (
+    Base,
+    RoutingSession,
+    create_db_engine,
+    SQLITE_WRITE_POOL_SIZE,
+    SQLITE_WRITE_MAX_OVERFLOW,
+    SQLITE_READ_POOL_SIZE,
+    SQLITE_READ_MAX_OVERFLOW,
+)
+import app.models  # noqa: F401
+from app.models.device import Device
+from app.models.share_log import ShareLog
+
+DEVICES = 500
+
+
+def _build_sessions(profile: str, database_url: str):
+    """Writer and reader session factories the app would use for a profile."""
+    writer = create_db_engine(
+        database_url, f"bench-{profile}-writer",
+        SQLITE_WRITE_POOL_SIZE, SQLITE_WRITE_MAX_OVERFLOW, sqlite_profile=profile,
+    )
+    if profile == "tuned":
+        reader = create_db_engine(
+            database_url, f"bench-{profile}-reader",
+            SQLITE_READ_POOL_SIZE, SQLITE_READ_MAX_OVERFLOW, sqlite_profile=profile, read_only=True,
+        )
+    else:
+        reader = writer
+    write_sessions = sessionmaker(autocommit=False, autoflush=False, bind=writer)
+    read_sessions = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False,
+                                 primary=writer, replica=reader)
+    return writer, reader, write_sessions, read_sessions
+
+
+def _seed(write_sessions, rows: int) -> None:
+    db = write_sessions()
+    try:
+        db.add_all(
+            Device(device_id=f"device-{i}", fcm_token=f"token-{i}")
+            for i in range(DEVICES)
+        )
+        db.flush()
+        now = datetime.utcnow()
+        db.add_all(
+            ShareLog(
+                device_id=f"device-{i % DEVICES}",
+                life_seal_number=i % 9 + 1,
+                platform=("whatsapp", "instagram", "twitter")[i % 3],
+                created_at=now - timedelta(minutes=i),
+            )
+            for i in range(rows)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_profile(profile: str, duration: float, readers: int, writers: int, seed_rows: int) -> dict:
+    """Run concurrent readers and writers against a fresh database and count operations."""
+    tmp_dir = tempfile.mkdtemp(prefix=f"sqlite-bench-{profile}-")
+    database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    writer, reader, write_sessions, read_sessions = _build_sessions(profile, database_url)
+    Base.metadata.create_all(bind=writer)
+    _seed(write_sessions, seed_rows)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+    since = datetime.utcnow() - timedelta(days=30)
+
+    def _run(operation):
+        # Errors include "database is locked" and, for legacy, threads
+        # tripping over each other's transaction on the shared connection
+        try:
+            operation()
+            return True
+        except Exception:
+            return False
+
+    def _read_once():
+        db = read_sessions()
+        try:
+            db.query(ShareLog.life_seal_number, func.count(ShareLog.id)).filter(
+                ShareLog.created_at >= since
+            ).group_by(ShareLog.life_seal_number).all()
+        finally:
+            db.close()
+
+    def _write_once(worker: int, i: int):
+        db = write_sessions()
+        try:
+            db.add(ShareLog(
+                device_id=f"device-{(worker * 7919 + i) % DEVICES}",
+                life_seal_number=i % 9 + 1,
+                platform="bench",
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def _reader():
+        while time.perf_counter() < stop_at:
+            key = "reads" if _run(_read_once) else "errors"
+            with lock:
+                counts[key] += 1
+
+    def _writer(worker: int):
+        i = 0
+        while time.perf_counter() < stop_at:
+            key = "writes" if _run(lambda: _write_once(worker, i)) else "errors"
+            i += 1
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=_reader) for _ in range(readers)]
+    threads += [threading.Thread(target=_writer, args=(w,)) for w in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    writer.dispose()
+    if reader is not writer:
+        reader.dispose()
+
+    return {
+        "profile": profile,
+        "reads_per_second": round(counts["reads"] / elapsed, 1),
+        "writes_per_second": round(counts["writes"] / elapsed, 1),
+        "errors": counts["errors"],
+    }
+
+
+def _run_isolated(profile: str, args) -> dict:
+    """Run one profile in a child process; the legacy shared connection can crash the interpreter."""
+    command = [
+        sys.executable, os.path.abspath(__file__), "--profile", profile,
+        "--duration", str(args.duration), "--readers", str(args.readers),
+        "--writers", str(args.writers), "--seed-rows", str(args.seed_rows),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"profile": profile, "crashed": completed.returncode}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite legacy vs tuned profiles")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    parser.add_argument("--profile", choices=("legacy", "tuned"), help="Run a single profile and print JSON")
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args.profile, args.duration, args.readers, args.writers, args.seed_rows)))
+        return 0
+
+    print("=" * 60)
+    print(f"SQLite benchmark: {args.readers} readers, {args.writers} writers, {args.duration}s each")
+    print("=" * 60)
+
+    results = [_run_isolated(profile, args) for profile in ("legacy", "tuned")]
+    for result in results:
+        if "crashed" in result:
+            print(f"  {result['profile']:<8} ✗ crashed (exit code {result['crashed']})")
+            continue
+        print(f"  {result['profile']:<8} reads/sec={result['reads_per_second']:<10} "
+              f"writes/sec={result['writes_per_second']:<10} errors={result['errors']}")
+
+    legacy, tuned = results
+    if "crashed" in legacy or "crashed" in tuned:
+        return 1
+    if legacy["reads_per_second"]:
+        print(f"✓ Read throughput x{tuned['reads_per_second'] / legacy['reads_per_second']:.2f} with tuned profile")
+    if legacy["writes_per_second"]:
+        print(f"✓ Write throughput x{tuned['writes_per_second'] / legacy['writes_per_second']:.2f} with tuned profile")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Apply database migrations once, before any API worker starts.
+Databases created by the old create_all() startup are adopted in place.
+Run from backend directory: python scripts/migrate.py [--check] [--revision head]
+"""
+
+import argparse
+import logging
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.database import DATABASE_URL
+from app.config.migrations import get_schema_status, run_migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Alembic migrations")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report whether the database is at head (exit 1 if not)")
+    parser.add_argument("--revision", default="head", help="Target revision")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    print(f"Database: {DATABASE_URL.split('@')[-1] if '@' in DATABASE_URL else DATABASE_URL}")
+
+    status = get_schema_status()
+    print(f"  current={status['current'] or 'none'} head={status['head']}")
+    if args.check:
+        if status["up_to_date"]:
+            print("✓ Schema is up to date")
+            return 0
+        print("⚠ Schema is behind; run without --check to migrate")
+        return 1
+
+    try:
+        run_migrations(args.revision)
+    except Exception as e:
+        print(f"✗ Migration failed: {str(e)}")
+        return 1
+
+    status = get_schema_status()
+    print(f"✓ Database at revision {status['current']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,4 +5,4 @@ echo.
 echo Press Ctrl+C to stop the server
 echo.
 cd /d "%~dp0"
-python -m uvicorn run_server:app --host 0.0.0.0 --port 8001 --reload
+python run_server.py --host 0.0.0.0 --port 8001 --reload
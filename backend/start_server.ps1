@@ -10,4 +10,4 @@ Write-Host "Press Ctrl+C to stop the server" -ForegroundColor Gray
 Write-Host ""
 
 Set-Location $PSScriptRoot
-python -m uvicorn run_server:app --host 0.0.0.0 --port 8001 --reload
+python run_server.py --host 0.0.0.0 --port 8001 --reload
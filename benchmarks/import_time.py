@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Measure what a fresh worker pays before it can answer its first request.
+
+    # import-time profile of main (python -X importtime), top packages by self time
+    python benchmarks/import_time.py
+
+    # median of 5 runs; exit 1 if importing main takes longer than 900ms
+    python benchmarks/import_time.py --runs 5 --budget-ms 900 --output import-time.json
+
+Every run is a fresh interpreter started in backend/, like a gunicorn
+worker: the `-X importtime` pass attributes import cost to packages, and a
+second, uninstrumented pass times `import main` plus one GET /health/live
+sent straight to the ASGI app (no server, no lifespan, no HTTP client).
+Wall-clock numbers are only comparable on the same machine.
+
+Run from the repository root.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "backend")
+
+# Imports the app and sends one request through it, printing timings as JSON
+FIRST_REQUEST_SCRIPT = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+module = __import__(sys.argv[1])
+imported = time.perf_counter()
+path = sys.argv[2]
+
+async def first_request():
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"import-time")],
+        "client": ("127.0.0.1", 0), "server": ("import-time", 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await module.app(scope, receive, send)
+    return statuses[0]
+
+status = asyncio.run(first_request())
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (done - imported) * 1000,
+    "status": status,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def parse_importtime(output: str) -> list[dict]:
+    """
+    Parse `python -X importtime` stderr.
+
+    Returns:
+        One dict per imported module: name, self_us, cumulative_us and depth
+        (0 for the measured module itself)
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # One space after the bar, then two per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append({
+            "name": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": depth,
+        })
+    return entries
+
+
+def summarize_imports(entries: list[dict], top: int = 15) -> dict:
+    """
+    Attribute self time to top-level packages and pick the slowest modules.
+
+    Args:
+        entries: Output of parse_importtime()
+        top: How many packages/modules to keep
+
+    Returns:
+        total_ms (sum of self time), packages (top-level package -> ms),
+        modules (slowest by cumulative time, with their self time)
+    """
+    packages = defaultdict(int)
+    for entry in entries:
+        packages[entry["name"].split(".", 1)[0]] += entry["self_us"]
+    slowest = sorted(entries, key=lambda e: e["cumulative_us"], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(e["self_us"] for e in entries) / 1000, 1),
+        "packages": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        "modules": [
+            {
+                "name": e["name"],
+                "cumulative_ms": round(e["cumulative_us"] / 1000, 1),
+                "self_ms": round(e["self_us"] / 1000, 1),
+            }
+            for e in slowest
+        ],
+    }
+
+
+def profile_imports(module: str) -> list[dict]:
+    """Import `module` in a fresh interpreter under -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_first_request(module: str, path: str) -> dict:
+    """
+    Time a fresh interpreter importing `module` and serving one request.
+
+    Returns:
+        import_ms and first_request_ms (measured inside the child),
+        process_ms (spawn to exit, including interpreter startup),
+        status of the response and the number of loaded modules
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_SCRIPT, module, path],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = process_ms
+    return timings
+
+
+def run(module: str = "main", path: str = "/health/live", runs: int = 3, top: int = 15) -> dict:
+    """Profile once, then take the median of `runs` cold starts."""
+    summary = summarize_imports(profile_imports(module), top)
+    starts = [measure_first_request(module, path) for _ in range(runs)]
+    cold_start = {
+        key: round(statistics.median(s[key] for s in starts), 1)
+        for key in ("import_ms", "first_request_ms", "process_ms")
+    }
+    cold_start["status"] = starts[-1]["status"]
+    cold_start["modules"] = starts[-1]["modules"]
+    return {
+        "meta": {
+            "module": module,
+            "path": path,
+            "runs": runs,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "recorded_at": datetime.utcnow().isoformat() + "Z",
+        },
+        "cold_start": cold_start,
+        "importtime": summary,
+    }
+
+
+def _print_report(report: dict) -> None:
+    importtime, cold_start = report["importtime"], report["cold_start"]
+    print(f"-X importtime total (self): {importtime['total_ms']} ms\n")
+    print(f"{'package':<32}{'self ms':>10}")
+    print("-" * 42)
+    for name, ms in importtime["packages"].items():
+        print(f"{name:<32}{ms:>10}")
+    print(f"\n{'module':<48}{'cum ms':>10}{'self ms':>10}")
+    print("-" * 68)
+    for entry in importtime["modules"]:
+        print(f"{entry['name']:<48}{entry['cumulative_ms']:>10}{entry['self_ms']:>10}")
+    print(
+        f"\nCold start (median of {report['meta']['runs']}): "
+        f"import {cold_start['import_ms']} ms, "
+        f"first request {cold_start['first_request_ms']} ms, "
+        f"process {cold_start['process_ms']} ms, "
+        f"{cold_start['modules']} modules loaded"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time profile and cold-start budget")
+    parser.add_argument("--module", default="main", help="Module to import from backend/ (default main)")
+    parser.add_argument("--path", default="/health/live", help="Path of the first request (default /health/live)")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to take the median of (default 3)")
+    parser.add_argument("--top", type=int, default=15, help="Packages/modules to list (default 15)")
+    parser.add_argument("--budget-ms", type=float, help="Exit 1 if the median import takes longer")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = run(args.module, args.path, args.runs, args.top)
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if report["cold_start"]["status"] >= 400:
+        print(f"✗ First request to {args.path} returned {report['cold_start']['status']}")
+        return 1
+    if args.budget_ms is not None:
+        import_ms = report["cold_start"]["import_ms"]
+        if import_ms > args.budget_ms:
+            print(f"✗ import {args.module} took {import_ms} ms, budget is {args.budget_ms} ms")
+            return 1
+        print(f"✓ import {args.module} within budget ({import_ms} / {args.budget_ms} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Replay a realistic traffic mix against the API and record latency percentiles.
+
+    # against a running server (start it with RATE_LIMIT_ENABLED=false)
+    python benchmarks/loadtest.py run --base-url http://127.0.0.1:8000 --duration 60 --output current.json
+
+    # in-process against main.app, no server needed
+    python benchmarks/loadtest.py run --duration 20 --output current.json
+
+    # fail (exit 1) if p95/p99 regressed more than 15% or RPS dropped more than 15%
+    python benchmarks/loadtest.py compare benchmarks/baseline.json current.json --tolerance 0.15
+
+Run from the repository root.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "backend")
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import httpx
+
+from traffic import parse_mix, pick
+
+PERCENTILES = (50, 95, 99)
+# Metrics compared by `compare`; latencies must not grow, throughput must not shrink
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    if not latencies:
+        return {f"p{p}_ms": None for p in PERCENTILES}
+    if len(latencies) == 1:
+        return {f"p{p}_ms": round(latencies[0], 2) for p in PERCENTILES}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {f"p{p}_ms": round(cuts[p - 1], 2) for p in PERCENTILES}
+
+
+def summarize(samples: dict[str, list[float]], errors: dict[str, int], elapsed: float) -> dict:
+    """
+    Reduce raw per-endpoint latencies (ms) to the stats stored in a baseline.
+
+    Args:
+        samples: endpoint name -> latencies of successful requests, in ms
+        errors: endpoint name -> count of failed requests (non-2xx or transport errors)
+        elapsed: wall-clock duration of the measured window, in seconds
+
+    Returns:
+        Dict with "endpoints" (per endpoint) and "overall" stats
+    """
+    def _stats(latencies: list[float], error_count: int) -> dict:
+        return {
+            "requests": len(latencies) + error_count,
+            "errors": error_count,
+            "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+            "max_ms": round(max(latencies), 2) if latencies else None,
+            **_percentiles(latencies),
+        }
+
+    names = sorted(set(samples) | set(errors))
+    endpoints = {name: _stats(samples.get(name, []), errors.get(name, 0)) for name in names}
+    everything = [latency for latencies in samples.values() for latency in latencies]
+    return {"endpoints": endpoints, "overall": _stats(everything, sum(errors.values()))}
+
+
+def _client(base_url: Optional[str], timeout: float) -> httpx.AsyncClient:
+    if base_url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits)
+
+    # In-process: the app under test shares this event loop, so absolute numbers
+    # are lower than against uvicorn but relative changes still show up
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    from main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout)
+
+
+async def run_load(
+    base_url: Optional[str],
+    duration: float,
+    concurrency: int,
+    mix_spec: Optional[str] = None,
+    warmup: float = 2.0,
+    seed: int = 42,
+    timeout: float = 30.0,
+) -> dict:
+    """
+    Drive `concurrency` closed-loop virtual users through the traffic mix.
+
+    Args:
+        base_url: Server to hit; None runs in-process against main.app
+        duration: Measured window in seconds (after warmup)
+        concurrency: Number of concurrent virtual users
+        mix_spec: Optional "name=weight,..." override of the default mix
+        warmup: Seconds of traffic sent before measuring starts
+        seed: Seed for the request generator, so runs replay the same mix
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Summary dict (see summarize) plus run metadata
+    """
+    mix = parse_mix(mix_spec)
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    status_codes: dict[str, int] = defaultdict(int)
+
+    async with _client(base_url, timeout) as client:
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + warmup
+        stop_at = measure_from + duration
+
+        async def _user(user_id: int) -> None:
+            rng = random.Random(seed + user_id)
+            while loop.time() < stop_at:
+                endpoint = pick(rng, mix)
+                kwargs = endpoint.build(rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(endpoint.method, endpoint.path, **kwargs)
+                    ok = response.is_success
+                    status = str(response.status_code)
+                except httpx.HTTPError as exc:
+                    ok, status = False, type(exc).__name__
+                latency_ms = (time.perf_counter() - started) * 1000
+                if loop.time() < measure_from:
+                    continue
+                status_codes[status] += 1
+                if ok:
+                    samples[endpoint.name].append(latency_ms)
+                else:
+                    errors[endpoint.name] += 1
+
+        await asyncio.gather(*(_user(i) for i in range(concurrency)))
+
+    summary = summarize(samples, errors, duration)
+    summary["meta"] = {
+        "recorded_at": datetime.utcnow().isoformat() + "Z",
+        "target": base_url or "in-process",
+        "duration_s": duration,
+        "warmup_s": warmup,
+        "concurrency": concurrency,
+        "seed": seed,
+        "mix": {endpoint.name: endpoint.weight for endpoint in mix},
+        "status_codes": dict(status_codes),
+        "python": platform.python_version(),
+        "host": platform.node(),
+    }
+    return summary
+
+
+def compare(baseline: dict, current: dict, tolerance: float, rps_tolerance: float) -> list[str]:
+    """
+    Find regressions of `current` against `baseline`.
+
+    Args:
+        baseline: Summary recorded earlier (e.g. benchmarks/baseline.json)
+        current: Summary of the run under test
+        tolerance: Allowed relative growth of p50/p95/p99 (0.10 = 10%)
+        rps_tolerance: Allowed relative drop in RPS
+
+    Returns:
+        Human-readable regression descriptions; empty when within tolerance
+    """
+    regressions = []
+    sections = [("overall", baseline.get("overall"), current.get("overall"))]
+    sections += [
+        (name, stats, current.get("endpoints", {}).get(name))
+        for name, stats in baseline.get("endpoints", {}).items()
+    ]
+
+    for name, before, after in sections:
+        if not before:
+            continue
+        if not after:
+            regressions.append(f"{name}: missing from current run")
+            continue
+        for metric in LATENCY_METRICS:
+            old, new = before.get(metric), after.get(metric)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {old} -> {new} (+{(new / old - 1) * 100:.1f}%)")
+        old_rps, new_rps = before.get("rps"), after.get("rps")
+        if old_rps and new_rps is not None and new_rps < old_rps * (1 - rps_tolerance):
+            regressions.append(f"{name}.rps: {old_rps} -> {new_rps} ({(new_rps / old_rps - 1) * 100:.1f}%)")
+        if after.get("errors", 0) > before.get("errors", 0):
+            regressions.append(f"{name}.errors: {before.get('errors', 0)} -> {after['errors']}")
+    return regressions
+
+
+def _print_summary(summary: dict) -> None:
+    header = f"{'endpoint':<20}{'reqs':>8}{'errs':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["endpoints"].items()) + [("overall", summary["overall"])]
+    for name, stats in rows:
+        print(
+            f"{name:<20}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9}"
+            + "".join(f"{stats[m] if stats[m] is not None else '-':>9}" for m in LATENCY_METRICS)
+        )
+
+
+def _cmd_run(args) -> int:
+    summary = asyncio.run(run_load(
+        args.base_url, args.duration, args.concurrency,
+        mix_spec=args.mix, warmup=args.warmup, seed=args.seed, timeout=args.timeout,
+    ))
+    _print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+    if summary["overall"]["errors"]:
+        print(f"⚠ {summary['overall']['errors']} failed requests: {summary['meta']['status_codes']}")
+    return 0
+
+
+def _cmd_compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    for key in ("concurrency", "duration_s", "target"):
+        if baseline.get("meta", {}).get(key) != current.get("meta", {}).get(key):
+            print(f"⚠ {key} differs: {baseline.get('meta', {}).get(key)} vs {current.get('meta', {}).get(key)}")
+
+    regressions = compare(baseline, current, args.tolerance, args.rps_tolerance)
+    if regressions:
+        print(f"✗ {len(regressions)} regression(s) beyond tolerance:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("✓ No regressions beyond tolerance")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API load profile and regression check")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Replay the traffic mix and record latency/RPS")
+    run.add_argument("--base-url", help="Server to load (default: in-process main.app)")
+    run.add_argument("--duration", type=float, default=30.0, help="Measured seconds (default 30)")
+    run.add_argument("--warmup", type=float, default=2.0, help="Unmeasured warmup seconds (default 2)")
+    run.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users (default 20)")
+    run.add_argument("--mix", help='Weights override, e.g. "decode_full=3,export_pdf=1"')
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    run.add_argument("--output", help="Write the JSON summary here (e.g. benchmarks/baseline.json)")
+    run.set_defaults(func=_cmd_run)
+
+    check = subparsers.add_parser("compare", help="Compare a run against a baseline; exit 1 on regression")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--tolerance", type=float, default=0.10, help="Allowed latency growth (default 0.10)")
+    check.add_argument("--rps-tolerance", type=float, default=0.10, help="Allowed RPS drop (default 0.10)")
+    check.set_defaults(func=_cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Locust profile replaying the same traffic mix as loadtest.py.
+
+    pip install -r benchmarks/requirements.txt
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 \
+        --headless -u 50 -r 10 -t 2m --csv current
+
+Locust reports its own percentiles and RPS; loadtest.py is the one that
+writes the JSON baseline used for regression comparison.
+"""
+
+import os
+import random
+import sys
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS_DIR), "backend"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from locust import HttpUser, between, task
+
+from traffic import parse_mix, pick
+
+MIX = parse_mix(os.getenv("LOADTEST_MIX"))
+
+
+class DestinyUser(HttpUser):
+    wait_time = between(0.5, 2.0)
+
+    def on_start(self):
+        self.rng = random.Random()
+
+    @task
+    def browse(self):
+        endpoint = pick(self.rng, MIX)
+        self.client.request(endpoint.method, endpoint.path, name=endpoint.name, **endpoint.build(self.rng))
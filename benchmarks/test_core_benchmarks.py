@@ -0,0 +1,112 @@
+"""
+pytest-benchmark microbenchmarks for the CPU-bound core of a reading.
+
+    pip install -r benchmarks/requirements.txt
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Skipped entirely when pytest-benchmark is not installed.
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.core.compatibility import evaluate_compatibility
+from app.core.reduction import excel_reduce, reduce_to_single_digit
+from app.services.compatibility_pdf_service import generate_compatibility_pdf
+from app.services.destiny_service import calculate_destiny
+from app.services.pdf_export import PDFExportService
+from app.services.pdf_service import generate_report_pdf
+from app.services.report_service import build_report
+
+PERSON = {
+    "first_name": "Ada",
+    "other_names": "Lovelace",
+    "day_of_birth": 9,
+    "month_of_birth": 5,
+    "year_of_birth": 1990,
+    "current_year": 2026,
+}
+PARTNER = {**PERSON, "first_name": "Charles", "other_names": "Babbage", "day_of_birth": 26, "month_of_birth": 12}
+
+
+@pytest.fixture(scope="module")
+def reading():
+    return calculate_destiny(PERSON)
+
+
+def _decode_response(person, core):
+    return {
+        "input": {
+            "full_name": f"{person['first_name']} {person['other_names']}",
+            "date_of_birth": f"{person['year_of_birth']}-{person['month_of_birth']:02d}-{person['day_of_birth']:02d}",
+        },
+        "core": core,
+    }
+
+
+def test_reductions(benchmark):
+    def _reduce_all():
+        for n in range(1, 10_000):
+            reduce_to_single_digit(n)
+            excel_reduce(n)
+
+    benchmark(_reduce_all)
+
+
+def test_calculate_destiny(benchmark):
+    result = benchmark(calculate_destiny, PERSON)
+    assert 1 <= result["life_seal"] <= 9
+
+
+def test_build_report(benchmark, reading):
+    result = benchmark(
+        build_report,
+        reading["life_cycles"],
+        reading["turning_points"],
+        reading["narrative"],
+        reading["life_seal"],
+        reading["life_planet"],
+        reading["soul_number"],
+        reading["personality_number"],
+        reading["personal_year"],
+    )
+    assert "overview" in result
+
+
+def test_generate_report_pdf(benchmark, reading):
+    pdf = benchmark(generate_report_pdf, "Ada Lovelace", "1990-05-09", reading["report"])
+    assert pdf.getvalue().startswith(b"%PDF")
+
+
+def test_generate_full_reading_pdf(benchmark, reading):
+    service = PDFExportService()
+    pdf = benchmark(service.generate_full_reading_pdf, _decode_response(PERSON, reading))
+    assert pdf.getvalue().startswith(b"%PDF")
+
+
+def test_generate_compatibility_pdf(benchmark, reading):
+    partner = calculate_destiny(PARTNER)
+    compatibility = {
+        "overall": "Compatible",
+        "life_seal": evaluate_compatibility(reading["life_seal"], partner["life_seal"]),
+        "soul_number": evaluate_compatibility(reading["soul_number"], partner["soul_number"]),
+        "personality_number": evaluate_compatibility(reading["personality_number"], partner["personality_number"]),
+        "score": 8,
+        "max_score": 12,
+    }
+    pdf = benchmark(
+        generate_compatibility_pdf,
+        _decode_response(PERSON, reading),
+        _decode_response(PARTNER, partner),
+        compatibility,
+    )
+    assert pdf.getvalue().startswith(b"%PDF")
@@ -0,0 +1,106 @@
+"""
+Realistic request mix replayed by the load profiles (loadtest.py, locustfile.py).
+
+Weights follow production traffic: the daily insight screen is opened far
+more often than a full decode, and PDF export is rare but expensive.
+"""
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
+
+NAMES = [
+    ("Ada", "Lovelace"), ("Grace", "Hopper"), ("Alan", "Turing"), ("Chinua", "Achebe"),
+    ("Wangari", "Maathai"), ("Kofi", "Annan"), ("Frida", "Kahlo"), ("Nelson", "Mandela"),
+]
+ARTICLE_QUERIES = [{}, {"featured": "true"}, {"category": "basics"}, {"category": "life-seals"}]
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    weight: int
+    build: Callable[[random.Random], dict]
+
+
+def _person(rng: random.Random) -> dict:
+    first_name, other_names = rng.choice(NAMES)
+    return {
+        "first_name": first_name,
+        "other_names": other_names,
+        "day_of_birth": rng.randint(1, 28),
+        "month_of_birth": rng.randint(1, 12),
+        "year_of_birth": rng.randint(1950, 2005),
+    }
+
+
+def _decode_full(rng: random.Random) -> dict:
+    return {"json": _person(rng)}
+
+
+def _daily_insight(rng: random.Random) -> dict:
+    return {"json": {"life_seal": rng.randint(1, 9), "day_of_birth": rng.randint(1, 28)}}
+
+
+def _content_articles(rng: random.Random) -> dict:
+    return {"params": rng.choice(ARTICLE_QUERIES)}
+
+
+@lru_cache(maxsize=None)
+def _export_payload(index: int) -> dict:
+    # A decode response is part of the export body; build a fixed pool once so
+    # the client is not computing readings while it should be sending requests
+    from app.services.destiny_service import calculate_destiny
+
+    person = _person(random.Random(index))
+    full_name = f"{person['first_name']} {person['other_names']}"
+    date_of_birth = f"{person['year_of_birth']}-{person['month_of_birth']:02d}-{person['day_of_birth']:02d}"
+    decode_data = {
+        "input": {"full_name": full_name, "date_of_birth": date_of_birth},
+        "core": calculate_destiny(person),
+    }
+    return {"json": {"full_name": full_name, "date_of_birth": date_of_birth, "decode_data": decode_data}}
+
+
+def _export_pdf(rng: random.Random) -> dict:
+    return _export_payload(rng.randrange(len(NAMES)))
+
+
+ENDPOINTS = [
+    Endpoint("daily_insight", "POST", "/daily/insight", 50, _daily_insight),
+    Endpoint("content_articles", "GET", "/content/articles", 25, _content_articles),
+    Endpoint("decode_full", "POST", "/decode/full", 20, _decode_full),
+    Endpoint("export_pdf", "POST", "/export/pdf", 5, _export_pdf),
+]
+
+
+def parse_mix(value: Optional[str]) -> list[Endpoint]:
+    """
+    Override endpoint weights from a "name=weight,..." string.
+
+    Args:
+        value: e.g. "decode_full=1,export_pdf=1"; endpoints not listed are dropped.
+               None keeps the default mix.
+
+    Returns:
+        Endpoints with the requested weights
+    """
+    if not value:
+        return list(ENDPOINTS)
+    by_name = {endpoint.name: endpoint for endpoint in ENDPOINTS}
+    mix = []
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in by_name:
+            raise ValueError(f"Unknown endpoint {name!r}; expected one of {', '.join(by_name)}")
+        endpoint = by_name[name]
+        mix.append(Endpoint(endpoint.name, endpoint.method, endpoint.path, int(weight or 1), endpoint.build))
+    return mix
+
+
+def pick(rng: random.Random, mix: list[Endpoint]) -> Endpoint:
+    return rng.choices(mix, weights=[endpoint.weight for endpoint in mix])[0]
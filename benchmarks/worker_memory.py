@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Measure memory per gunicorn worker, with and without preload.
+
+    # 4 workers, 20s of the traffic mix, preload vs. no preload
+    python benchmarks/worker_memory.py --workers 4 --duration 20
+
+    # one configuration only
+    python benchmarks/worker_memory.py --mode preload --output memory.json
+
+Starts backend/gunicorn.conf.py on a local port against a freshly migrated
+temporary SQLite database, replays the traffic mix from traffic.py so
+every worker has served real requests, then reads /proc/<pid>/smaps_rollup
+for the master and each worker:
+
+- RSS  resident pages, shared ones counted in full (overstates the total)
+- PSS  shared pages split between the processes sharing them (sums to real usage)
+- USS  pages private to the process (what another worker would add)
+
+Linux only. Run from the repository root.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "backend")
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import httpx
+
+from loadtest import run_load
+
+MODES = {"preload": "true", "no-preload": "false"}
+
+
+def read_memory(pid: int) -> dict:
+    """RSS, PSS and USS of a process in MiB, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_mib": round(fields["Rss"] / 1024, 1),
+        "pss_mib": round(fields["Pss"] / 1024, 1),
+        "uss_mib": round((fields["Private_Clean"] + fields["Private_Dirty"]) / 1024, 1),
+    }
+
+
+def child_pids(pid: int) -> list[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after it are fixed
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_serving(base_url: str, master, workers: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if master.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {master.returncode}")
+        try:
+            ready = httpx.get(f"{base_url}/health/ready", timeout=2).status_code == 200
+        except httpx.HTTPError:
+            ready = False
+        if ready and len(child_pids(master.pid)) >= workers:
+            return
+        time.sleep(0.5)
+    raise RuntimeError(f"gunicorn not ready within {timeout}s")
+
+
+def measure(mode: str, workers: int, duration: float, concurrency: int, database_url: str) -> dict:
+    """Start gunicorn in `mode`, drive traffic, and snapshot every process's memory."""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "GUNICORN_PRELOAD": MODES[mode],
+        "RATE_LIMIT_ENABLED": "false",
+        "LOG_LEVEL": "warning",
+    }
+    master = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn",
+            "-c", os.path.join(BACKEND_DIR, "gunicorn.conf.py"),
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--access-logfile", os.devnull,
+        ],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_serving(base_url, master, workers)
+        load = asyncio.run(run_load(base_url, duration, concurrency, warmup=1.0))
+        worker_memory = {pid: read_memory(pid) for pid in child_pids(master.pid)}
+        master_memory = read_memory(master.pid)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+    per_worker = list(worker_memory.values())
+    return {
+        "mode": mode,
+        "requests": load["overall"]["requests"],
+        "errors": load["overall"]["errors"],
+        "master": master_memory,
+        "workers": per_worker,
+        "mean_worker": {
+            key: round(sum(w[key] for w in per_worker) / len(per_worker), 1)
+            for key in ("rss_mib", "pss_mib", "uss_mib")
+        },
+        "total_pss_mib": round(master_memory["pss_mib"] + sum(w["pss_mib"] for w in per_worker), 1),
+    }
+
+
+def _prepare_database(directory: str) -> str:
+    database_url = f"sqlite:///{os.path.join(directory, 'worker-memory.db')}"
+    subprocess.run(
+        [sys.executable, "scripts/migrate.py"],
+        cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": database_url},
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    return database_url
+
+
+def _print_results(results: list[dict]) -> None:
+    header = f"{'mode':<12}{'requests':>10}{'worker RSS':>12}{'worker PSS':>12}{'worker USS':>12}{'total PSS':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        mean = r["mean_worker"]
+        print(
+            f"{r['mode']:<12}{r['requests']:>10}{mean['rss_mib']:>12}{mean['pss_mib']:>12}"
+            f"{mean['uss_mib']:>12}{r['total_pss_mib']:>12}"
+        )
+    print("\nMiB; worker columns are the mean over workers, total PSS includes the master")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-worker memory with and without gunicorn preload")
+    parser.add_argument("--mode", choices=["both", *MODES], default="both")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes (default 4)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of traffic before measuring")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users (default 8)")
+    parser.add_argument("--database-url", help="Migrated database to use (default: a temporary SQLite file)")
+    parser.add_argument("--output", help="Write the JSON results here")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("✗ /proc/<pid>/smaps_rollup is not available (Linux only)")
+        return 1
+
+    modes = list(MODES) if args.mode == "both" else [args.mode]
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or _prepare_database(directory)
+        results = [
+            measure(mode, args.workers, args.duration, args.concurrency, database_url)
+            for mode in modes
+        ]
+
+    _print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "workers": args.workers,
+                    "duration_s": args.duration,
+                    "concurrency": args.concurrency,
+                    "python": platform.python_version(),
+                    "recorded_at": datetime.utcnow().isoformat() + "Z",
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+    if any(r["errors"] for r in results):
+        print(f"⚠ Failed requests during the load: {[r['errors'] for r in results]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
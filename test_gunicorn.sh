@@ -14,9 +14,8 @@ echo "Starting gunicorn on 127.0.0.1:8000..."
 echo "Press Ctrl+C after verifying it starts successfully"
 echo ""
 
-gunicorn main:app \
+gunicorn -c gunicorn.conf.py \
     --workers 2 \
-    --worker-class uvicorn.workers.UvicornWorker \
     --bind 127.0.0.1:8000 \
     --access-logfile - \
     --error-logfile -
@@ -0,0 +1,100 @@
+"""
+Shared fixtures for tests that need the backend's `app` package and a database.
+The database URL is pointed at a throwaway SQLite file before `app` is imported.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='destiny-tests-'), 'test.db')}",
+)
+
+
+@pytest.fixture
+def db_session():
+    """Fresh schema per test, yielding a session on the app's engine."""
+    import app.models  # noqa: F401
+    from app.config.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+# Tables on request hot paths; a full scan of any of these fails the audit
+HOT_TABLES = {
+    "readings",
+    "share_logs",
+    "user_profiles",
+    "devices",
+    "notification_preferences",
+    "subscription_history",
+}
+
+
+class QueryPlanAuditor:
+    """Records SELECTs issued on an engine and EXPLAINs them for full table scans."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.engine = engine
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            self.statements.append((statement, parameters))
+
+    def stop(self):
+        from sqlalchemy import event
+
+        event.remove(self.engine, "before_cursor_execute", self._capture)
+
+    def full_scans(self):
+        """(statement, plan detail) for every captured query that scans a hot table."""
+        scans = []
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            for statement, parameters in self.statements:
+                cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    words = detail.split()
+                    if len(words) >= 2 and words[0] == "SCAN" and words[1] in HOT_TABLES:
+                        scans.append((statement, detail))
+            cursor.close()
+        finally:
+            connection.close()
+        return scans
+
+
+@pytest.fixture
+def query_plan_audit(db_session):
+    """Fail the test if any query it issued does a full scan of a hot table (SQLite EXPLAIN)."""
+    from app.config.database import engine
+
+    auditor = QueryPlanAuditor(engine)
+    try:
+        yield auditor
+    finally:
+        auditor.stop()
+
+    scans = auditor.full_scans()
+    assert not scans, "Full table scans on hot tables:\n" + "\n".join(
+        f"  {detail}\n    {' '.join(statement.split())}" for statement, detail in scans
+    )
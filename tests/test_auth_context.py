@@ -0,0 +1,108 @@
+"""
+Tests for the per-request auth context and subscription gate dependencies
+in app.core.feature_gates.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.routes.auth import create_jwt_token
+from app.api.routes.limits import router as limits_router
+from app.api.routes.profile import router as profile_router
+from app.config.database import engine
+from app.core.feature_gates import get_auth_context, require_premium, require_user
+from app.models.user import SubscriptionTier, User
+from app.models.user_profile import UserProfile
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(limits_router)
+    app.include_router(profile_router)
+
+    @app.get("/premium")
+    async def premium_only(user: User = Depends(require_premium)):
+        return {"user": user.id}
+
+    @app.get("/twice")
+    async def twice(first=Depends(get_auth_context), user: User = Depends(require_user)):
+        return {"same_user": first.user is user}
+
+    return TestClient(app)
+
+
+def _user(db, user_id, tier=SubscriptionTier.FREE, expires=None):
+    user = User(id=user_id, email=f"{user_id}@example.com", password_hash="x")
+    user.set_subscription(tier, expires)
+    db.add(user)
+    db.commit()
+    return {"Authorization": f"Bearer {create_jwt_token(user_id, user.email)}"}
+
+
+@pytest.fixture
+def user_queries():
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def test_user_resolved_once_per_request(db_session, client, user_queries):
+    headers = _user(db_session, "u1")
+    user_queries.clear()
+
+    response = client.get("/twice", headers=headers)
+
+    assert response.json() == {"same_user": True}
+    assert len(user_queries) == 1
+
+
+def test_limits_status_uses_auth_context(db_session, client):
+    headers = _user(db_session, "u1", SubscriptionTier.PREMIUM, datetime.utcnow() + timedelta(days=5))
+
+    response = client.get("/api/limits/status", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["is_premium"] is True
+
+
+def test_missing_or_invalid_token_is_401(db_session, client):
+    assert client.get("/api/limits/status").json()["detail"] == "Not authenticated"
+
+    response = client.get("/api/limits/status", headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid token"
+
+
+def test_premium_gate(db_session, client):
+    free = _user(db_session, "free")
+    lapsed = _user(db_session, "lapsed", SubscriptionTier.PREMIUM, datetime.utcnow() - timedelta(days=1))
+    premium = _user(db_session, "premium", SubscriptionTier.PREMIUM, datetime.utcnow() + timedelta(days=5))
+
+    assert client.get("/premium", headers=free).headers["X-Subscription-Tier"] == "free"
+    assert client.get("/premium", headers=lapsed).headers["X-Subscription-Expired"] == "true"
+    assert client.get("/premium", headers=premium).json() == {"user": "premium"}
+
+
+def test_profile_routes_scope_to_token_user(db_session, client, user_queries):
+    headers = _user(db_session, "u1")
+    db_session.add(UserProfile(id="p1", device_id="d1", user_id="u1", first_name="Ada", date_of_birth="1990-05-09"))
+    db_session.commit()
+    user_queries.clear()
+
+    response = client.get("/api/profile/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == "p1"
+    assert user_queries == []  # only the token's user id is needed
+
+    assert client.get("/api/profile/me?user_id=someone-else", headers=headers).status_code == 403
@@ -3,6 +3,7 @@ Unit Tests for Daily Insights Service
 Tests all calculation logic, blessed day checking, and edge cases.
 """
 
+import json
 import pytest
 from datetime import date, timedelta
 from backend.app.services.daily_insights_service import (
@@ -11,7 +12,11 @@ from backend.app.services.daily_insights_service import (
     get_daily_insight_full,
     get_weekly_power_numbers,
     get_monthly_blessed_days,
-    get_personal_month_guidance
+    get_personal_month_guidance,
+    calculate_calendar_range,
+    get_calendar_year,
+    MAX_CALENDAR_RANGE_DAYS,
+    DailyInsightPayloadCache
 )
 
 
@@ -375,3 +380,132 @@ class TestEdgeCases:
         # Should not include Feb 29 in non-leap year (Feb only has 28 days)
         # Just verify no date with day 29 exists in result
         assert all(d.day != 29 for d in result)
+
+
+
+class TestCalendarRange:
+    """Test the range calendar engine against the per-day functions"""
+    
+    def test_matches_per_day_calculations(self):
+        """Test every day in a multi-year range matches the single-day functions"""
+        start = date(2023, 11, 15)
+        end = date(2026, 3, 10)
+        result = calculate_calendar_range(
+            life_seal=7,
+            day_of_birth=17,
+            start_date=start,
+            end_date=end
+        )
+        
+        assert result["days"] == (end - start).days + 1
+        for offset in range(result["days"]):
+            current = start + timedelta(days=offset)
+            assert result["power_numbers"][offset] == calculate_daily_power_number(current, 7)
+            assert result["blessed"][offset] == check_blessed_day(current, 17)
+    
+    def test_personal_months_match_guidance(self):
+        """Test per-month personal month values match get_personal_month_guidance"""
+        result = calculate_calendar_range(
+            life_seal=3,
+            day_of_birth=9,
+            month_of_birth=5,
+            start_date=date(2025, 12, 20),
+            end_date=date(2026, 2, 3)
+        )
+        
+        assert result["months"] == ["2025-12", "2026-01", "2026-02"]
+        for month_key, personal_year, personal_month in zip(
+            result["months"], result["personal_years"], result["personal_months"]
+        ):
+            year, month = map(int, month_key.split("-"))
+            guidance = get_personal_month_guidance(9, 5, 1990, month, year)
+            assert personal_year == guidance["personal_year"]
+            assert personal_month == guidance["personal_month"]
+    
+    def test_personal_months_omitted_without_birth_month(self):
+        """Test personal arrays are None when month_of_birth is not given"""
+        result = calculate_calendar_range(5, 12, date(2026, 1, 1), date(2026, 1, 7))
+        assert result["personal_years"] is None
+        assert result["personal_months"] is None
+    
+    def test_calendar_year_leap_year(self):
+        """Test full-year calendar covers 366 days and 12 months in a leap year"""
+        result = get_calendar_year(life_seal=5, day_of_birth=11, year=2024)
+        assert result["year"] == 2024
+        assert result["days"] == 366
+        assert len(result["months"]) == 12
+        # Feb 29 is day index 59 and is blessed for birth day 11 (reduces to 2)
+        assert result["blessed"][59] is True
+    
+    def test_range_validation(self):
+        """Test reversed and oversized ranges are rejected"""
+        with pytest.raises(ValueError, match="on or after"):
+            calculate_calendar_range(5, 12, date(2026, 1, 2), date(2026, 1, 1))
+        
+        too_far = date(2026, 1, 1) + timedelta(days=MAX_CALENDAR_RANGE_DAYS)
+        with pytest.raises(ValueError, match="too large"):
+            calculate_calendar_range(5, 12, date(2026, 1, 1), too_far)
+
+
+class TestDailyInsightPayloadCache:
+    """Test the day-keyed table of serialized daily insight payloads"""
+    
+    def test_payload_matches_full_insight(self):
+        """Test cached bytes decode to exactly get_daily_insight_full()"""
+        cache = DailyInsightPayloadCache()
+        target = date(2026, 1, 9)
+        
+        for life_seal in range(1, 10):
+            for day_of_birth in (1, 9, 10, 31):
+                payload = cache.get_payload(life_seal, day_of_birth, target)
+                expected = get_daily_insight_full(life_seal, day_of_birth, target)
+                assert json.loads(payload) == expected
+    
+    def test_one_table_per_day(self):
+        """Test repeated lookups for the same day reuse a single table"""
+        cache = DailyInsightPayloadCache()
+        target = date(2026, 3, 1)
+        
+        first = cache.get_payload(7, 9, target)
+        second = cache.get_payload(7, 9, target)
+        cache.get_payload(3, 12, target)
+        
+        assert first is second
+        assert cache.misses == 1
+        assert cache.hits == 2
+    
+    def test_lru_bound(self):
+        """Test older date tables are evicted beyond max_days"""
+        cache = DailyInsightPayloadCache(max_days=2)
+        for offset in range(3):
+            cache.get_payload(5, 5, date(2026, 1, 1) + timedelta(days=offset))
+        
+        cache.get_payload(5, 5, date(2026, 1, 1))
+        assert cache.misses == 4
+    
+    def test_hits_refresh_recency(self):
+        """Test a table read recently outlives one built later but not read since"""
+        cache = DailyInsightPayloadCache(max_days=2)
+        first, second, third = (date(2026, 1, 1) + timedelta(days=offset) for offset in range(3))
+        cache.get_payload(5, 5, first)
+        cache.get_payload(5, 5, second)
+        cache.get_payload(5, 5, first)  # hit: first is now the most recent
+        
+        cache.get_payload(5, 5, third)  # evicts second
+        cache.get_payload(5, 5, first)
+        assert cache.misses == 3 and cache.hits == 2
+        
+        cache.get_payload(5, 5, second)
+        assert cache.misses == 4
+    
+    def test_rollover_drops_past_days(self):
+        """Test rollover prebuilds today and discards earlier dates"""
+        cache = DailyInsightPayloadCache()
+        cache.get_payload(5, 5, date(2026, 1, 1))
+        
+        cache.rollover(today=date(2026, 1, 2))
+        cache.get_payload(5, 5, date(2026, 1, 2))
+        assert cache.hits == 1
+        
+        cache.get_payload(5, 5, date(2026, 1, 1))
+        assert cache.misses == 2
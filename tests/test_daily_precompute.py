@@ -0,0 +1,81 @@
+"""
+Tests for the nightly per-user daily precompute job.
+"""
+
+from datetime import date, timedelta
+
+from app.models.daily_precompute import DailyPrecompute
+from app.models.user_profile import UserProfile
+from app.core.personal_year import calculate_personal_year
+from app.core.reduction import reduce_to_single_digit
+from app.services.daily_insights_service import calculate_daily_power_number, check_blessed_day
+from app.services.daily_precompute_service import (
+    run_daily_precompute,
+    get_precomputed_day,
+    get_blessed_profile_ids,
+)
+
+
+def _add_profile(db, profile_id, date_of_birth, life_seal=None):
+    db.add(UserProfile(
+        id=profile_id,
+        device_id=f"device-{profile_id}",
+        first_name="Test",
+        date_of_birth=date_of_birth,
+        life_seal=life_seal,
+    ))
+
+
+def test_rows_match_single_day_calculations(db_session):
+    _add_profile(db_session, "a", "1990-05-09", life_seal=7)
+    _add_profile(db_session, "b", "1985-12-31")  # life seal computed from DOB
+    db_session.commit()
+
+    start = date(2026, 12, 29)
+    stats = run_daily_precompute(db_session, start_date=start, days=5, chunk_size=1)
+
+    assert stats["profiles"] == 2
+    assert stats["rows"] == 10
+    assert stats["rows_per_second"] > 0
+
+    row = get_precomputed_day(db_session, "a", date(2027, 1, 2))
+    assert row.power_number == calculate_daily_power_number(date(2027, 1, 2), 7)
+    assert row.is_blessed_day == check_blessed_day(date(2027, 1, 2), 9)
+    assert row.personal_year == calculate_personal_year(9, 5, 2027)
+    assert row.personal_month == reduce_to_single_digit(row.personal_year + 1)
+
+    # 1985-12-31 → 4 + 3 + 5 = 12 → 3
+    row = get_precomputed_day(db_session, "b", date(2026, 12, 31))
+    assert row.power_number == calculate_daily_power_number(date(2026, 12, 31), 3)
+
+
+def test_rerun_replaces_window_and_drops_past_days(db_session):
+    _add_profile(db_session, "a", "1990-05-09", life_seal=7)
+    db_session.commit()
+
+    run_daily_precompute(db_session, start_date=date(2026, 1, 1), days=3)
+    run_daily_precompute(db_session, start_date=date(2026, 1, 2), days=3)
+
+    dates = sorted(r.target_date for r in db_session.query(DailyPrecompute).all())
+    assert dates == [date(2026, 1, 2) + timedelta(days=i) for i in range(3)]
+
+
+def test_invalid_date_of_birth_is_skipped(db_session):
+    _add_profile(db_session, "bad", "not-a-date")
+    _add_profile(db_session, "good", "1990-05-09", life_seal=7)
+    db_session.commit()
+
+    stats = run_daily_precompute(db_session, start_date=date(2026, 1, 1), days=1)
+
+    assert stats["skipped"] == 1
+    assert stats["profiles"] == 1
+
+
+def test_blessed_profile_lookup(db_session):
+    _add_profile(db_session, "nine", "1990-05-09", life_seal=7)
+    _add_profile(db_session, "one", "1990-05-10", life_seal=8)
+    db_session.commit()
+
+    run_daily_precompute(db_session, start_date=date(2026, 1, 18), days=1)
+
+    assert get_blessed_profile_ids(db_session, date(2026, 1, 18)) == ["nine"]
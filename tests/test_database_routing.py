@@ -0,0 +1,114 @@
+"""
+Tests for read-replica routing, pool checkout metrics and SQLite profiles
+in app.config.database.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import StaticPool
+
+from app.config.database import (
+    Base,
+    InstrumentedQueuePool,
+    ReadSessionLocal,
+    RoutingSession,
+    _pool_metrics,
+    create_db_engine,
+    get_pool_stats,
+    is_file_sqlite,
+)
+from app.models.share_log import ShareLog
+
+
+@pytest.fixture
+def primary_and_replica(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for db_engine, marker in ((primary, "primary"), (replica, "replica")):
+        Base.metadata.create_all(bind=db_engine)
+        with db_engine.begin() as conn:
+            conn.execute(text("CREATE TABLE marker (name TEXT)"))
+            conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": marker})
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def test_reads_go_to_replica_and_writes_to_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+    db = RoutingSession(primary=primary, replica=replica)
+    try:
+        assert db.execute(text("SELECT name FROM marker")).scalar() == "replica"
+
+        db.add(ShareLog(device_id="d1", life_seal_number=3, platform="x"))
+        db.commit()
+    finally:
+        db.close()
+
+    with primary.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM share_logs")).scalar() == 1
+    with replica.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM share_logs")).scalar() == 0
+
+
+def test_read_session_defaults_to_primary_without_replicas():
+    db = ReadSessionLocal()
+    try:
+        assert db.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        db.close()
+
+    assert "primary" in get_pool_stats()
+
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path):
+    db_engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_logging_name="test-pool",
+    )
+    metrics = _pool_metrics["test-pool"]
+
+    held = db_engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        db_engine.connect()
+    held.close()
+    db_engine.dispose()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["waits"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_seconds_max"] >= 0.05
+
+
+def test_tuned_sqlite_profile_pragmas(tmp_path):
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    writer = create_db_engine(url, "test-tuned-writer", 2, 0, sqlite_profile="tuned")
+    reader = create_db_engine(url, "test-tuned-reader", 2, 0, sqlite_profile="tuned", read_only=True)
+    try:
+        with writer.begin() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 1
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        writer.dispose()
+        reader.dispose()
+
+
+def test_legacy_and_memory_sqlite_keep_static_pool(tmp_path):
+    legacy = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}", "test-legacy", sqlite_profile="legacy")
+    memory = create_db_engine("sqlite://", "test-memory", sqlite_profile="tuned")
+    assert isinstance(legacy.pool, StaticPool)
+    assert isinstance(memory.pool, StaticPool)
+    assert not is_file_sqlite("sqlite:///:memory:")
@@ -0,0 +1,148 @@
+"""
+Tests for the devices-table NotificationDispatcher: indexed, cached token
+lookups, batched multicasts and deactivation of invalid tokens.
+"""
+
+import asyncio
+
+from app.models.device import Device
+from app.models.user import User
+from firebase_admin import exceptions, messaging
+
+from app.services.fcm_dispatcher import ActiveTokenCache, NotificationDispatcher, invalid_tokens
+from app.services.firebase_admin_service import _token_invalid
+
+
+class FakeFirebase:
+    """send_multicast double; tokens listed in `invalid` fail as unregistered."""
+
+    def __init__(self, invalid=()):
+        self.invalid = set(invalid)
+        self.batches = []
+
+    def send_multicast(self, tokens, notification):
+        self.batches.append(list(tokens))
+        errors = [
+            {"token": token, "error": "Requested entity was not found.", "error_code": "NOT_FOUND", "token_invalid": True}
+            for token in tokens if token in self.invalid
+        ]
+        return {
+            "success": not errors,
+            "successful": len(tokens) - len(errors),
+            "failed": len(errors),
+            "errors": errors,
+        }
+
+
+def _user(db, user_id="u1", devices=0):
+    db.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x"))
+    db.add_all(
+        Device(device_id=f"{user_id}-d{i}", user_id=user_id, fcm_token=f"{user_id}-token-{i}")
+        for i in range(devices)
+    )
+    db.commit()
+
+
+def test_active_tokens_come_from_index_then_cache(db_session, query_plan_audit):
+    _user(db_session, devices=2)
+    dispatcher = NotificationDispatcher(firebase=FakeFirebase(), token_cache=ActiveTokenCache())
+    dispatcher.register_device_token(db_session, "u1", "u1-token-new", "ios")
+    query_plan_audit.statements.clear()
+
+    assert sorted(dispatcher.get_active_tokens(db_session, "u1")) == ["u1-token-0", "u1-token-1", "u1-token-new"]
+    queries = len(query_plan_audit.statements)
+    assert dispatcher.get_active_tokens(db_session, "u1")
+    assert len(query_plan_audit.statements) == queries  # served from the cache
+
+    assert dispatcher.unregister_device_token(db_session, "u1", "u1-token-0")
+    assert "u1-token-0" not in dispatcher.get_active_tokens(db_session, "u1")
+    assert not dispatcher.unregister_device_token(db_session, "u2", "u1-token-1")
+
+
+def test_send_batches_multicasts(db_session):
+    _user(db_session, devices=1201)
+    firebase = FakeFirebase()
+    dispatcher = NotificationDispatcher(firebase=firebase, token_cache=ActiveTokenCache())
+
+    result = asyncio.run(dispatcher.send_notification(db_session, "u1", "🌟 Blessed Day", "Today", {"day": 9}))
+
+    assert [len(batch) for batch in firebase.batches] == [500, 500, 201]
+    assert result["success"] and result["sent_count"] == 1201 and result["deactivated"] == 0
+
+
+def test_invalid_tokens_are_deactivated(db_session):
+    _user(db_session, devices=3)
+    dispatcher = NotificationDispatcher(firebase=FakeFirebase(invalid={"u1-token-1"}), token_cache=ActiveTokenCache())
+
+    result = asyncio.run(dispatcher.send_notification(db_session, "u1", "Title", "Body"))
+
+    assert result["sent_count"] == 2 and result["failed_count"] == 1 and result["deactivated"] == 1
+    assert db_session.get(Device, "u1-d1").active is False
+    assert sorted(dispatcher.get_active_tokens(db_session, "u1")) == ["u1-token-0", "u1-token-2"]
+
+
+def test_only_token_specific_errors_invalidate_tokens():
+    assert _token_invalid(messaging.UnregisteredError("Requested entity was not found."))
+    assert _token_invalid(messaging.SenderIdMismatchError("SenderId mismatch"))
+    assert _token_invalid(exceptions.InvalidArgumentError(
+        "The registration token is not a valid FCM registration token"
+    ))
+    assert not _token_invalid(exceptions.InvalidArgumentError("Invalid JSON payload received."))
+    assert not _token_invalid(exceptions.PermissionDeniedError("Permission 'cloudmessaging.messages.create' denied"))
+
+
+def test_only_flagged_tokens_are_reported_invalid():
+    def _error(token, code, token_invalid):
+        return {"token": token, "error": code, "error_code": code, "token_invalid": token_invalid}
+
+    # Every device of the user uninstalled: all deactivated
+    unregistered = [_error("a", "NOT_FOUND", True), _error("b", "NOT_FOUND", True)]
+    assert invalid_tokens({"successful": 0, "errors": unregistered}) == ["a", "b"]
+
+    # A bad payload or missing IAM permission fails every token, but none is dead
+    denied = [_error("a", "PERMISSION_DENIED", False), _error("b", "PERMISSION_DENIED", False)]
+    assert invalid_tokens({"successful": 0, "errors": denied}) == []
+
+    mixed = [_error("a", "NOT_FOUND", True), _error("b", "UNAVAILABLE", False)]
+    assert invalid_tokens({"successful": 0, "errors": mixed}) == ["a"]
+
+
+def test_no_devices():
+    dispatcher = NotificationDispatcher(firebase=FakeFirebase(), token_cache=ActiveTokenCache())
+    dispatcher.token_cache.put("u1", [])
+
+    result = asyncio.run(dispatcher.send_notification(None, "u1", "Title", "Body"))
+    assert not result["success"] and result["sent_count"] == 0
+
+
+def test_token_cache_is_lru_with_ttl():
+    cache = ActiveTokenCache(max_users=2, ttl_seconds=60)
+    cache.put("a", ["t1"])
+    cache.put("b", ["t2"])
+    assert cache.get("a") == ("t1",)
+    cache.put("c", ["t3"])
+
+    assert cache.get("b") is None  # least recently used
+    assert cache.get("a") == ("t1",) and cache.get("c") == ("t3",)
+
+    expired = ActiveTokenCache(ttl_seconds=0)
+    expired.put("a", ["t1"])
+    assert expired.get("a") is None
+
+
+def test_outbox_multicast_deactivates_invalid_tokens(db_session, monkeypatch):
+    from app.services.firebase_admin_service import FCMNotification
+    from app.services.notification_outbox import FCMTransport, OutboxWorker, ProviderRateLimiter, enqueue_notification
+
+    _user(db_session, devices=2)
+    monkeypatch.setattr(
+        "app.services.firebase_admin_service.get_firebase_service",
+        lambda: FakeFirebase(invalid={"u1-token-0"}),
+    )
+    enqueue_notification(db_session, FCMNotification(title="Title", body="Body"), tokens=["u1-token-0", "u1-token-1"])
+    worker = OutboxWorker(transport_for=lambda provider: FCMTransport(), rate_limiter=ProviderRateLimiter({}))
+
+    assert asyncio.run(worker.drain_once()) == {"sent": 1}
+    db_session.expire_all()
+    assert db_session.get(Device, "u1-d0").active is False
+    assert db_session.get(Device, "u1-d1").active is True
@@ -0,0 +1,78 @@
+"""
+Tests for the cached component health behind /health, /health/live and /health/ready.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.config.database import engine
+from app.core import health
+from app.core.health import HealthMonitor
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def test_not_ready_before_first_check():
+    ready, report = HealthMonitor().readiness()
+    assert not ready and report["status"] == "starting"
+
+
+def test_readiness_reports_components(db_session):
+    monitor = HealthMonitor()
+    components = asyncio.run(monitor.refresh())
+
+    assert components["database"]["status"] == "ok"
+    assert components["scheduler"]["status"] == "stopped"
+    assert components["firebase"]["status"] in ("ok", "not_configured", "error")
+
+    ready, report = monitor.readiness()
+    assert ready
+    assert report["status"] == "degraded"  # scheduler not running in tests
+
+
+def test_database_down_or_stale_is_not_ready(db_session, monkeypatch):
+    monitor = HealthMonitor(interval=10)
+    monkeypatch.setattr(health, "_check_database", lambda: {"status": "down", "error": "boom"})
+    asyncio.run(monitor.refresh())
+    ready, report = monitor.readiness()
+    assert not ready and report["status"] == "unavailable"
+
+    monkeypatch.setattr(health, "_check_database", lambda: {"status": "ok"})
+    asyncio.run(monitor.refresh())
+    assert monitor.readiness()[0]
+    monitor.checked_at -= 31  # three missed intervals
+    ready, report = monitor.readiness()
+    assert not ready and report["stale"]
+
+
+def test_probes_do_no_database_io(db_session, statements, monkeypatch):
+    import main
+
+    monitor = HealthMonitor()
+    asyncio.run(monitor.refresh())
+    monkeypatch.setattr(main, "get_health_monitor", lambda: monitor)
+    client = TestClient(main.app)
+    statements.clear()
+
+    assert client.get("/health/live").json() == {"status": "alive"}
+    ready = client.get("/health/ready")
+    assert ready.status_code == 200
+    assert ready.json()["components"]["database"]["status"] == "ok"
+    body = client.get("/health").json()
+    assert body["database"] == "connected"
+    assert body["services"]["scheduler"] == "stopped"
+
+    assert statements == []
@@ -0,0 +1,57 @@
+"""
+Tests for the cold-start import budget: heavy dependencies stay out of
+`import main` and benchmarks/import_time.py reads -X importtime output.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from import_time import BACKEND_DIR, measure_first_request, parse_importtime, summarize_imports
+
+# Only needed by the endpoints that use them; imported there on first use
+DEFERRED_MODULES = ("reportlab", "httpx", "jinja2", "firebase_admin")
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       225 |        225 |   _io
+import time:       300 |        300 |     reportlab.lib
+import time:      1000 |       1300 |   reportlab
+import time:       500 |        500 |   sqlalchemy.orm
+import time:       200 |       3000 | main
+"""
+
+
+def test_parse_importtime_reads_times_and_nesting():
+    entries = {e["name"]: e for e in parse_importtime(SAMPLE)}
+
+    assert entries["main"] == {"name": "main", "self_us": 200, "cumulative_us": 3000, "depth": 0}
+    assert entries["reportlab"]["depth"] == 1
+    assert entries["reportlab.lib"]["depth"] == 2
+
+
+def test_summarize_imports_groups_by_top_level_package():
+    summary = summarize_imports(parse_importtime(SAMPLE), top=2)
+
+    assert summary["total_ms"] == 2.2
+    assert summary["packages"] == {"reportlab": 1.3, "sqlalchemy": 0.5}
+    assert [m["name"] for m in summary["modules"]] == ["main", "reportlab"]
+
+
+def test_importing_main_defers_heavy_dependencies():
+    script = f"import json, sys, main; print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_first_request_served_by_fresh_interpreter():
+    timings = measure_first_request("main", "/health/live")
+
+    assert timings["status"] == 200
+    assert timings["import_ms"] > 0 and timings["process_ms"] >= timings["import_ms"]
@@ -0,0 +1,42 @@
+"""
+Tests for the load-test summary and regression comparison in benchmarks/loadtest.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import pytest
+
+from loadtest import compare, summarize
+from traffic import parse_mix
+
+
+def test_summarize_percentiles_and_rps():
+    summary = summarize({"decode_full": [float(ms) for ms in range(1, 101)]}, {"decode_full": 2}, elapsed=10)
+
+    stats = summary["endpoints"]["decode_full"]
+    assert stats["requests"] == 102 and stats["errors"] == 2
+    assert stats["rps"] == 10.0
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+    assert summary["overall"]["max_ms"] == 100.0
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    baseline = summarize({"daily_insight": [10.0] * 100, "export_pdf": [500.0] * 10}, {}, elapsed=10)
+    same = summarize({"daily_insight": [10.5] * 100, "export_pdf": [510.0] * 10}, {}, elapsed=10)
+    slower = summarize({"daily_insight": [10.0] * 100, "export_pdf": [700.0] * 5}, {}, elapsed=10)
+
+    assert compare(baseline, same, tolerance=0.10, rps_tolerance=0.10) == []
+    regressions = compare(baseline, slower, tolerance=0.10, rps_tolerance=0.10)
+    assert any(line.startswith("export_pdf.p95_ms") for line in regressions)
+    assert any(line.startswith("export_pdf.rps") for line in regressions)
+    assert not any(line.startswith("daily_insight") for line in regressions)
+
+
+def test_parse_mix():
+    assert [e.name for e in parse_mix("export_pdf=3")] == ["export_pdf"]
+    with pytest.raises(ValueError):
+        parse_mix("nope=1")
@@ -0,0 +1,110 @@
+"""
+Tests for the Prometheus metrics in app.core.metrics.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware, render_metrics, track_pdf_render
+from app.services.daily_insights_service import DailyInsightPayloadCache
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/metrics")
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+    app.add_middleware(MetricsMiddleware, enabled=True)
+    return app
+
+
+def test_requests_labelled_by_route_template():
+    client = TestClient(_app())
+    before = _sample("http_request_duration_seconds_count", method="GET", route="/items/{item_id}")
+
+    for item_id in ("a", "b", "c"):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/nope").status_code == 404
+
+    assert _sample("http_request_duration_seconds_count", method="GET", route="/items/{item_id}") == before + 3
+    assert _sample("http_requests_total", method="GET", route="<unmatched>", status="404") >= 1
+    assert _sample("http_requests_in_progress", method="GET") == 0
+
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/items/{item_id}"}' in body
+    assert 'route="/items/a"' not in body
+
+
+def test_cache_and_pdf_metrics():
+    cache = DailyInsightPayloadCache()
+    hits = _sample("cache_requests_total", cache="daily_insight", result="hit")
+    misses = _sample("cache_requests_total", cache="daily_insight", result="miss")
+
+    cache.get_payload(life_seal=3, day_of_birth=9)
+    cache.get_payload(life_seal=5, day_of_birth=9)
+
+    assert _sample("cache_requests_total", cache="daily_insight", result="miss") == misses + 1
+    assert _sample("cache_requests_total", cache="daily_insight", result="hit") == hits + 1
+
+    with track_pdf_render("test"):
+        assert _sample("pdf_renders_in_progress", kind="test") == 1
+    assert _sample("pdf_renders_in_progress", kind="test") == 0
+    assert _sample("pdf_render_duration_seconds_count", kind="test") == 1
+
+
+def test_middleware_overhead_under_50us():
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _noop_send(message):
+        pass
+
+    def _scope():
+        return {"type": "http", "method": "GET", "path": "/bench"}
+
+    async def _time(app, n=5000):
+        started = time.perf_counter()
+        for _ in range(n):
+            await app(_scope(), None, _noop_send)
+        return (time.perf_counter() - started) / n
+
+    instrumented = MetricsMiddleware(endpoint, enabled=True)
+    bare, measured = asyncio.run(_time(endpoint)), asyncio.run(_time(instrumented))
+
+    assert measured - bare < 50e-6
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": BACKEND_DIR}
+    worker = "from app.core.metrics import record_fcm_result; record_fcm_result('single', 2, 1)"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+    scrape = "from app.core.metrics import render_metrics; print(render_metrics()[0].decode())"
+    output = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert 'fcm_messages_total{kind="single",result="success"} 4.0' in output
+    assert 'fcm_messages_total{kind="single",result="failure"} 2.0' in output
@@ -0,0 +1,57 @@
+"""
+Tests for the Alembic migration tree and startup schema verification
+in app.config.migrations.
+"""
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.config.database import Base
+from app.config.migrations import (
+    SchemaOutOfDateError,
+    get_head_revision,
+    run_migrations,
+    verify_schema,
+)
+import app.models  # noqa: F401
+
+
+@pytest.fixture
+def scratch_engine(tmp_path):
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield db_engine
+    db_engine.dispose()
+
+
+def test_upgrade_head_matches_models(scratch_engine):
+    with pytest.raises(SchemaOutOfDateError):
+        verify_schema(scratch_engine)
+
+    run_migrations(db_engine=scratch_engine)
+
+    with scratch_engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+    assert verify_schema(scratch_engine)["current"] == get_head_revision()
+
+
+def test_upgrade_adopts_create_all_database(scratch_engine):
+    # A pre-Alembic database: tables from create_all, minus later columns
+    Base.metadata.create_all(bind=scratch_engine)
+    with scratch_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_user_profiles_life_seal"))
+        connection.execute(text("ALTER TABLE user_profiles DROP COLUMN calculations_version"))
+        connection.execute(text(
+            "INSERT INTO users (id, email, password_hash, subscription_tier, created_at) "
+            "VALUES ('u1', 'u1@example.com', 'x', 'FREE', CURRENT_TIMESTAMP)"
+        ))
+
+    run_migrations(db_engine=scratch_engine)
+
+    inspector = inspect(scratch_engine)
+    assert "calculations_version" in {c["name"] for c in inspector.get_columns("user_profiles")}
+    assert "ix_user_profiles_life_seal" in {i["name"] for i in inspector.get_indexes("user_profiles")}
+    with scratch_engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM users")).scalar() == 1
+    verify_schema(scratch_engine)
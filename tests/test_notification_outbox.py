@@ -0,0 +1,219 @@
+"""
+Tests for the outbound notification queue: dedupe, delivery through a fake
+transport, retries with backoff, dead-lettering, lease recovery and the
+per-provider rate limit.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from app.core.rate_limit import RateLimit
+from app.models.notification_outbox import NotificationOutbox
+from app.services import notification_outbox
+from app.services.firebase_admin_service import FCMNotification
+from app.services.notification_outbox import (
+    DeliveryResult,
+    FakeTransport,
+    OutboxWorker,
+    ProviderRateLimiter,
+    _fcm_outcome,
+    enqueue_notification,
+    get_outbox_stats,
+    requeue_dead_notifications,
+)
+from app.services.notification_scheduler import NotificationScheduler
+
+NOTIFICATION = FCMNotification(title="✨ Your Daily Insight", body="Today is a 7 day", data={"type": "daily_insight"})
+
+
+def _worker(transport):
+    return OutboxWorker(transport_for=lambda provider: transport, rate_limiter=ProviderRateLimiter({}))
+
+
+def _entry(db, entry_id):
+    db.expire_all()
+    return db.get(NotificationOutbox, entry_id)
+
+
+def test_dedupe_key_queues_once(db_session):
+    first = enqueue_notification(db_session, NOTIFICATION, topic="daily_insights", dedupe_key="daily_insights:2026-10-19")
+    second = enqueue_notification(db_session, NOTIFICATION, topic="daily_insights", dedupe_key="daily_insights:2026-10-19")
+
+    assert first == second
+    assert db_session.query(NotificationOutbox).count() == 1
+
+
+def test_drain_delivers_through_fake_transport(db_session):
+    transport = FakeTransport()
+    entry_id = enqueue_notification(db_session, NOTIFICATION, tokens=["token-a", "token-b"])
+
+    assert asyncio.run(_worker(transport).drain_once()) == {"sent": 1}
+
+    [message] = transport.sent
+    assert message.targets == ["token-a", "token-b"]
+    assert message.data == {"type": "daily_insight"}
+    entry = _entry(db_session, entry_id)
+    assert entry.status == "sent" and entry.attempts == 1 and entry.sent_at is not None
+
+
+def test_transient_failure_is_retried_with_backoff(db_session):
+    transport = FakeTransport([DeliveryResult("retry", error="UNAVAILABLE")])
+    entry_id = enqueue_notification(db_session, NOTIFICATION, topic="blessed_days")
+    worker = _worker(transport)
+
+    assert asyncio.run(worker.drain_once()) == {"retry": 1}
+    entry = _entry(db_session, entry_id)
+    assert entry.status == "pending" and entry.last_error == "UNAVAILABLE"
+    assert entry.next_attempt_at > datetime.utcnow()
+    # Not due yet
+    assert asyncio.run(worker.drain_once()) == {}
+
+    entry.next_attempt_at = datetime.utcnow()
+    db_session.commit()
+    assert asyncio.run(worker.drain_once()) == {"sent": 1}
+    assert _entry(db_session, entry_id).attempts == 2
+
+
+def test_exhausted_and_permanent_failures_are_dead_lettered(db_session):
+    transport = FakeTransport([
+        DeliveryResult("retry", error="UNAVAILABLE"),
+        DeliveryResult("failed", error="NOT_FOUND"),
+    ])
+    exhausted = enqueue_notification(db_session, NOTIFICATION, token="token-a", max_attempts=1)
+    invalid = enqueue_notification(db_session, NOTIFICATION, token="token-b")
+
+    assert asyncio.run(_worker(transport).drain_once()) == {"dead": 2}
+
+    stats = get_outbox_stats(db_session)
+    assert stats["counts"]["dead"] == 2
+    assert {entry["id"] for entry in stats["dead_letters"]} == {exhausted, invalid}
+
+    assert requeue_dead_notifications(db_session, [invalid]) == 1
+    entry = _entry(db_session, invalid)
+    assert entry.status == "pending" and entry.attempts == 0
+
+
+def test_expired_lease_is_taken_again(db_session):
+    transport = FakeTransport()
+    entry_id = enqueue_notification(db_session, NOTIFICATION, topic="lunar_phases")
+    entry = _entry(db_session, entry_id)
+    entry.status, entry.attempts = "sending", 1
+    entry.locked_at = datetime.utcnow() - timedelta(hours=1)
+    db_session.commit()
+
+    assert asyncio.run(_worker(transport).drain_once()) == {"sent": 1}
+    assert _entry(db_session, entry_id).attempts == 2
+
+
+def test_fcm_multicast_retries_only_transient_failures():
+    result = _fcm_outcome({
+        "success": False,
+        "successful": 1,
+        "failed": 2,
+        "errors": [
+            {"token": "gone", "error": "Requested entity was not found.", "error_code": "NOT_FOUND", "token_invalid": True},
+            {"token": "busy", "error": "Service unavailable", "error_code": "UNAVAILABLE", "token_invalid": False},
+        ],
+    })
+    assert result.status == "retry" and result.retry_tokens == ["busy"]
+
+    all_dead = _fcm_outcome({
+        "success": False,
+        "successful": 0,
+        "failed": 2,
+        "errors": [
+            {"token": token, "error": "Requested entity was not found.", "error_code": "NOT_FOUND", "token_invalid": True}
+            for token in ("gone-1", "gone-2")
+        ],
+    })
+    assert all_dead.status == "failed" and all_dead.retry_tokens is None
+
+    dead_token = {"success": False, "error": "not found", "error_code": "NOT_FOUND", "token_invalid": True}
+    assert _fcm_outcome(dead_token).status == "failed"
+    denied = {"success": False, "error": "denied", "error_code": "PERMISSION_DENIED", "token_invalid": False}
+    assert _fcm_outcome(denied).status == "retry"
+    assert _fcm_outcome({"success": False, "error": "connection reset"}).status == "retry"
+
+
+def test_provider_rate_limit_spaces_sends():
+    limiter = ProviderRateLimiter({"fcm": RateLimit(capacity=5, period=1)})
+
+    async def _run():
+        start = time.monotonic()
+        for _ in range(7):
+            await limiter.acquire("fcm")
+        await limiter.acquire("unlimited")
+        return time.monotonic() - start
+
+    # The burst of 5 is free, the next two wait ~0.2s each
+    assert 0.3 <= asyncio.run(_run()) < 1.0
+
+
+def test_scheduled_notifications_are_queued_once(db_session):
+    from app.models.device import Device
+
+    db_session.add(Device(device_id="device-1", fcm_token="token-1"))
+    db_session.commit()
+    scheduler = NotificationScheduler(leader_election=False)
+
+    asyncio.run(scheduler._send_motivational_quote())
+    asyncio.run(scheduler._send_motivational_quote())
+
+    [entry] = db_session.query(NotificationOutbox).all()
+    assert entry.target_type == "topic" and entry.target == "inspirational"
+    assert entry.dedupe_key == f"motivational_quote:{datetime.now().date().isoformat()}"
+
+
+def test_blessed_day_alert_targets_blessed_profiles_devices(db_session, monkeypatch):
+    from datetime import date
+
+    from app.models.daily_precompute import DailyPrecompute
+    from app.models.device import Device
+    from app.models.notification_preference import NotificationPreference
+    from app.models.user import User
+    from app.models.user_profile import UserProfile
+    from app.services import notification_scheduler
+
+    db_session.add(User(id="u-blessed", email="blessed@example.com", password_hash="x"))
+    db_session.add_all([
+        Device(device_id="dev-blessed", fcm_token="token-blessed"),
+        Device(device_id="dev-blessed-phone", user_id="u-blessed", fcm_token="token-blessed-phone"),
+        Device(device_id="dev-opted-out", user_id="u-blessed", fcm_token="token-opted-out"),
+        Device(device_id="dev-plain", fcm_token="token-plain"),
+    ])
+    db_session.add(NotificationPreference(device_id="dev-opted-out", blessed_day_alerts=False))
+    for profile_id, device_id, user_id, blessed in (
+        ("blessed", "dev-blessed", "u-blessed", True),
+        ("plain", "dev-plain", None, False),
+    ):
+        db_session.add(UserProfile(
+            id=profile_id, device_id=device_id, user_id=user_id, first_name="Ada", date_of_birth="1990-05-09",
+        ))
+        db_session.flush()
+        db_session.add(DailyPrecompute(
+            profile_id=profile_id, target_date=date.today(), power_number=9,
+            is_blessed_day=blessed, personal_year=1, personal_month=2,
+        ))
+    db_session.commit()
+    monkeypatch.setattr(notification_scheduler, "MULTICAST_TOKEN_LIMIT", 1)
+    scheduler = NotificationScheduler(leader_election=False)
+
+    asyncio.run(scheduler._send_blessed_day_alert())
+    asyncio.run(scheduler._send_blessed_day_alert())
+
+    entries = db_session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+    assert [(entry.target_type, entry.target) for entry in entries] == [
+        ("tokens", '["token-blessed"]'),
+        ("tokens", '["token-blessed-phone"]'),
+    ]
+    today = datetime.now().date().isoformat()
+    assert [entry.dedupe_key for entry in entries] == [f"blessed_day_alert:{today}:0", f"blessed_day_alert:{today}:1"]
+
+
+def test_fake_transport_setting(monkeypatch):
+    monkeypatch.setattr(notification_outbox, "OUTBOX_TRANSPORT", "fake")
+    monkeypatch.setattr(notification_outbox, "_fake_transport", None)
+
+    assert isinstance(notification_outbox.get_transport("fcm"), FakeTransport)
+    assert notification_outbox.get_transport("fcm") is notification_outbox.get_transport("apns")
@@ -0,0 +1,127 @@
+"""
+Tests for the gunicorn preload setup: warm shared state in the master,
+per-worker resources reset after fork.
+"""
+
+import gc
+import os
+import runpy
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.config import database
+from app.config.database import engine, get_pool_stats, reset_pools_after_fork
+from app.core.prefork import freeze_shared_state, warm_shared_state
+from app.services.content_service import ContentService
+
+GUNICORN_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "gunicorn.conf.py")
+
+
+def _load_config(monkeypatch, **env):
+    # The config exports PROMETHEUS_MULTIPROC_DIR; keep that out of this process
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    monkeypatch.setattr(tempfile, "tempdir", tempfile.mkdtemp())
+    monkeypatch.delenv("DESTINY_METRICS_DIR_READY", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    try:
+        return runpy.run_path(GUNICORN_CONFIG)
+    finally:
+        gc.enable()
+
+
+def test_preloaded_articles_do_not_expire():
+    service = ContentService()
+    count = service.preload()
+    cached = service._articles_cache
+    service._last_load_time = datetime.now() - timedelta(hours=1)
+
+    assert count > 0
+    assert service._load_articles() is cached
+
+
+def test_warm_shared_state_loads_pdf_and_content():
+    warmed = warm_shared_state()
+
+    assert warmed["articles"] > 0
+    assert "reportlab" in sys.modules and "jinja2" in sys.modules
+
+
+def test_freeze_shared_state_moves_objects_to_permanent_generation():
+    try:
+        assert freeze_shared_state() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_reset_pools_after_fork_keeps_pool_metrics(db_session):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    pool = engine.pool
+    checkouts = get_pool_stats()["primary"]["checkouts"]
+
+    reset_pools_after_fork()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert engine.pool is not pool
+    assert get_pool_stats()["primary"]["checkouts"] == checkouts + 1
+
+
+def test_gunicorn_config_defaults(monkeypatch):
+    config = _load_config(monkeypatch, WEB_CONCURRENCY="3", PORT="9001")
+
+    assert config["wsgi_app"] == "main:app"
+    assert config["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert config["preload_app"] is True
+    assert config["workers"] == 3
+    assert config["bind"] == "0.0.0.0:9001"
+    assert config["forwarded_allow_ips"] == "127.0.0.1"
+
+    config = _load_config(monkeypatch, FORWARDED_ALLOW_IPS="*")
+    assert config["forwarded_allow_ips"] == "*"
+
+
+def test_gunicorn_config_empties_metrics_dir_once(monkeypatch, tmp_path):
+    metrics_dir = tmp_path / "metrics"
+    metrics_dir.mkdir()
+    (metrics_dir / "counter_123.db").write_bytes(b"stale")
+
+    config = _load_config(monkeypatch, PROMETHEUS_MULTIPROC_DIR=str(metrics_dir))
+    assert config["multiproc_dir"] == str(metrics_dir)
+    assert list(metrics_dir.iterdir()) == []
+
+    # A reload (HUP) reads the config again but keeps the live workers' files
+    (metrics_dir / "counter_456.db").write_bytes(b"live")
+    runpy.run_path(GUNICORN_CONFIG)
+    gc.enable()
+    assert [path.name for path in metrics_dir.iterdir()] == ["counter_456.db"]
+
+
+def test_gunicorn_config_defaults_metrics_dir(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    config = _load_config(monkeypatch)
+
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == config["multiproc_dir"]
+    assert config["multiproc_dir"] == os.path.join(tempfile.gettempdir(), "destiny-metrics")
+    assert os.path.isdir(config["multiproc_dir"])
+
+
+def test_gunicorn_hooks_reset_pools_and_report_dead_workers(monkeypatch):
+    config = _load_config(monkeypatch, GUNICORN_PRELOAD="true")
+    calls = []
+    monkeypatch.setattr(database, "reset_pools_after_fork", lambda: calls.append("reset"))
+    monkeypatch.setattr("app.core.metrics.mark_worker_dead", lambda pid: calls.append(pid))
+
+    class Worker:
+        pid = 4242
+
+    gc.disable()
+    config["post_fork"](None, Worker())
+    config["child_exit"](None, Worker())
+
+    assert gc.isenabled()
+    assert calls == ["reset", 4242]
@@ -0,0 +1,140 @@
+"""
+Tests for the atomic readings / PDF export counters.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config.database import Base
+from app.models.user_profile import UserProfile
+from app.services.profile_service import (
+    current_pdf_month,
+    increment_pdf_exports_count,
+    increment_readings_count,
+)
+
+
+def _add_profile(db, profile_id, user_id=None, **fields):
+    db.add(UserProfile(
+        id=profile_id,
+        device_id=f"device-{profile_id}",
+        user_id=user_id,
+        first_name="Ada",
+        date_of_birth="1990-05-09",
+        **fields,
+    ))
+    db.commit()
+
+
+def test_pdf_increment_rolls_over_stale_month(db_session):
+    _add_profile(db_session, "p1", pdf_exports_count=5, pdf_exports_month="2000-01")
+
+    result = increment_pdf_exports_count(db_session, device_id="device-p1")
+    assert result == {"pdf_exports_count": 1, "pdf_exports_month": current_pdf_month()}
+
+    result = increment_pdf_exports_count(db_session, device_id="device-p1")
+    assert result["pdf_exports_count"] == 2
+
+
+def test_increment_prefers_user_profile_and_reports_missing(db_session):
+    _add_profile(db_session, "device-only", readings_count=0)
+    _add_profile(db_session, "account", user_id="user-1", readings_count=7)
+
+    result = increment_readings_count(db_session, user_id="user-1", device_id="device-device-only")
+    assert result["readings_count"] == 8
+    assert result["last_reading_date"] is not None
+
+    assert increment_readings_count(db_session, user_id="missing", device_id="missing") is None
+
+
+def test_increment_updates_one_profile_per_device(db_session):
+    _add_profile(db_session, "anonymous", readings_count=2)
+    db_session.add(UserProfile(
+        id="signed-in",
+        device_id="device-anonymous",
+        user_id="user-2",
+        first_name="Ada",
+        date_of_birth="1990-05-09",
+        readings_count=10,
+    ))
+    db_session.commit()
+
+    result = increment_readings_count(db_session, device_id="device-anonymous")
+    assert result["readings_count"] == 3
+
+    counts = dict(db_session.query(UserProfile.id, UserProfile.readings_count).all())
+    assert counts == {"anonymous": 3, "signed-in": 10}
+
+
+def test_profile_reads_and_increments_hit_the_same_row(db_session):
+    import asyncio
+    from datetime import datetime, timedelta
+
+    from app.api.routes.profile import get_profile
+    from app.core.feature_gates import AuthContext
+
+    # The newer profile is stored first, so insertion order would pick it
+    for profile_id, age_days in (("newer", 1), ("older", 30)):
+        db_session.add(UserProfile(
+            id=profile_id,
+            device_id="shared-device",
+            first_name="Ada",
+            date_of_birth="1990-05-09",
+            readings_count=0,
+            created_at=datetime.utcnow() - timedelta(days=age_days),
+        ))
+        db_session.commit()
+
+    assert increment_readings_count(db_session, device_id="shared-device")["readings_count"] == 1
+    db_session.expire_all()
+
+    profile = asyncio.run(get_profile(device_id="shared-device", db=db_session, auth=AuthContext.anonymous()))
+    assert profile.id == "older" and profile.readings_count == 1
+
+
+@pytest.fixture
+def concurrent_sessions(tmp_path):
+    """Separate connections per thread against a file database, as in production."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'counters.db'}",
+        poolclass=NullPool,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def test_parallel_increments_are_exact(concurrent_sessions):
+    calls = 200
+    db = concurrent_sessions()
+    _add_profile(db, "p1", readings_count=0, pdf_exports_count=0, pdf_exports_month=current_pdf_month())
+    db.close()
+
+    def _increment(i):
+        session = concurrent_sessions()
+        try:
+            if i % 2:
+                return increment_readings_count(session, device_id="device-p1")
+            return increment_pdf_exports_count(session, device_id="device-p1")
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(_increment, range(calls)))
+
+    # Every call saw a distinct post-increment value
+    readings = sorted(r["readings_count"] for r in results if "readings_count" in r)
+    exports = sorted(r["pdf_exports_count"] for r in results if "pdf_exports_count" in r)
+    assert readings == list(range(1, calls // 2 + 1))
+    assert exports == list(range(1, calls // 2 + 1))
+
+    db = concurrent_sessions()
+    profile = db.get(UserProfile, "p1")
+    assert profile.readings_count == calls // 2
+    assert profile.pdf_exports_count == calls // 2
+    db.close()
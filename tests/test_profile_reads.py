@@ -0,0 +1,67 @@
+"""
+Tests that profile reads never write, and for the PDF export counter rollover.
+"""
+
+import asyncio
+
+from app.api.routes.profile import get_profile, get_profile_with_calculations
+from app.core.feature_gates import AuthContext
+from app.models.user_profile import UserProfile
+from app.services.profile_service import (
+    current_pdf_month,
+    effective_pdf_exports,
+    roll_over_pdf_exports,
+)
+
+
+def _add_profile(db, profile_id, pdf_exports_count, pdf_exports_month):
+    db.add(UserProfile(
+        id=profile_id,
+        device_id=f"device-{profile_id}",
+        first_name="Ada",
+        date_of_birth="1990-05-09",
+        pdf_exports_count=pdf_exports_count,
+        pdf_exports_month=pdf_exports_month,
+    ))
+    db.commit()
+
+
+def test_effective_pdf_exports():
+    profile = UserProfile(pdf_exports_count=3, pdf_exports_month="2026-01")
+
+    assert effective_pdf_exports(profile, "2026-01") == (3, "2026-01")
+    assert effective_pdf_exports(profile, "2026-02") == (0, "2026-02")
+    assert profile.pdf_exports_count == 3
+
+
+def test_get_endpoints_leave_stale_month_untouched(db_session):
+    _add_profile(db_session, "p1", 4, "2000-01")
+
+    profile = asyncio.run(get_profile(device_id="device-p1", db=db_session, auth=AuthContext.anonymous()))
+    assert profile.pdf_exports_count == 0
+    assert profile.pdf_exports_month == current_pdf_month()
+
+    dashboard = asyncio.run(get_profile_with_calculations(device_id="device-p1", db=db_session, auth=AuthContext.anonymous()))
+    assert dashboard.pdf_exports_count == 0
+    assert dashboard.soul_number is not None
+
+    assert not db_session.dirty
+    db_session.expire_all()
+    stored = db_session.get(UserProfile, "p1")
+    assert (stored.pdf_exports_count, stored.pdf_exports_month) == (4, "2000-01")
+
+
+def test_roll_over_pdf_exports_resets_only_stale_rows(db_session):
+    _add_profile(db_session, "old", 4, "2026-01")
+    _add_profile(db_session, "current", 2, "2026-02")
+    _add_profile(db_session, "never", 0, None)
+
+    assert roll_over_pdf_exports(db_session, "2026-02") == 2
+
+    db_session.expire_all()
+    counts = {p.id: (p.pdf_exports_count, p.pdf_exports_month) for p in db_session.query(UserProfile)}
+    assert counts == {
+        "old": (0, "2026-02"),
+        "current": (2, "2026-02"),
+        "never": (0, "2026-02"),
+    }
@@ -0,0 +1,80 @@
+"""
+Tests for the versioned numerology snapshot stored on UserProfile.
+"""
+
+import pytest
+
+import app.services.profile_service as profile_service
+from app.core.cycles import calculate_blessed_days
+from app.core.life_seal import calculate_life_seal
+from app.core.name_numbers import calculate_soul_number, calculate_personality_number
+from app.models.user_profile import UserProfile
+from app.services.profile_service import (
+    compute_profile_snapshot,
+    refresh_profile_snapshot,
+    get_profile_snapshot,
+    is_snapshot_current,
+)
+
+
+def _profile(first_name="Ada", date_of_birth="1990-05-09"):
+    return UserProfile(
+        id="p1",
+        device_id="device-p1",
+        first_name=first_name,
+        date_of_birth=date_of_birth,
+    )
+
+
+def test_snapshot_matches_core_calculations():
+    snapshot = compute_profile_snapshot("Ada", "1990-05-09")
+
+    assert snapshot["life_seal"] == calculate_life_seal(9, 5, 1990)["number"]
+    assert snapshot["life_planet"] == calculate_life_seal(9, 5, 1990)["planet"]
+    assert snapshot["soul_number"] == calculate_soul_number("Ada")
+    assert snapshot["personality_number"] == calculate_personality_number("Ada")
+    assert snapshot["blessed_days"] == calculate_blessed_days(9)
+    assert (snapshot["year_of_birth"], snapshot["month_of_birth"], snapshot["day_of_birth"]) == (1990, 5, 9)
+
+
+def test_invalid_date_of_birth_raises():
+    with pytest.raises(ValueError):
+        compute_profile_snapshot("Ada", "09/05/1990")
+
+
+def test_refresh_persists_and_is_idempotent(db_session):
+    profile = _profile()
+    assert refresh_profile_snapshot(profile) is True
+    db_session.add(profile)
+    db_session.commit()
+
+    stored = db_session.get(UserProfile, "p1")
+    assert stored.calculations_version == profile_service.NUMEROLOGY_ENGINE_VERSION
+    assert stored.life_seal == stored.calculations["life_seal"]
+    assert refresh_profile_snapshot(stored) is False
+
+
+def test_changed_inputs_make_snapshot_stale():
+    profile = _profile()
+    refresh_profile_snapshot(profile)
+
+    profile.first_name = "Grace"
+    assert not is_snapshot_current(profile)
+    assert get_profile_snapshot(profile)["soul_number"] == calculate_soul_number("Grace")
+    assert profile.calculations["inputs"]["first_name"] == "Ada"  # reads never write
+
+    assert refresh_profile_snapshot(profile) is True
+    assert profile.calculations["inputs"]["first_name"] == "Grace"
+
+
+def test_engine_version_bump_makes_snapshot_stale(monkeypatch):
+    profile = _profile()
+    refresh_profile_snapshot(profile)
+
+    monkeypatch.setattr(
+        profile_service, "NUMEROLOGY_ENGINE_VERSION", profile_service.NUMEROLOGY_ENGINE_VERSION + 1
+    )
+
+    assert not is_snapshot_current(profile)
+    assert refresh_profile_snapshot(profile) is True
+    assert profile.calculations_version == profile_service.NUMEROLOGY_ENGINE_VERSION
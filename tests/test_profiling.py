@@ -0,0 +1,107 @@
+"""
+Tests for opt-in request profiling (app.core.profiling) and tracing spans
+(app.core.tracing).
+"""
+
+import asyncio
+import pstats
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import profiling as profiling_routes
+from app.core import profiling, tracing
+from app.core.profiling import ProfilingMiddleware, StackSampler
+
+TOKEN = "s3cret"
+
+
+def _busy_work():
+    return sum(i * i for i in range(20_000))
+
+
+@pytest.fixture
+def profiled_app(tmp_path):
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"total": _busy_work()}
+
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, sample_rate=1.0, output_dir=str(tmp_path))
+    return app
+
+
+def test_only_token_bearing_requests_are_profiled(profiled_app, tmp_path):
+    client = TestClient(profiled_app)
+
+    assert "x-profile-id" not in client.get("/work").headers
+    assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "wrong"}).headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get("/work", headers={"X-Profile": TOKEN})
+    profile_path = tmp_path / f"{response.headers['x-profile-id']}.prof"
+    stats = pstats.Stats(str(profile_path))
+    assert any(func[2] == "_busy_work" for func in stats.stats)
+
+
+def test_stack_sampler_folds_stacks(tmp_path):
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    deadline = time.perf_counter() + 0.2
+    while time.perf_counter() < deadline:
+        _busy_work()
+    sampler.stop()
+
+    path = tmp_path / "out.folded"
+    sampler.dump(str(path))
+    lines = path.read_text().splitlines()
+    assert sampler.samples > 0
+    assert any("test_profiling.py:_busy_work" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.startswith("MainThread;") and int(count) > 0
+
+
+def test_admin_routes_require_token(monkeypatch, tmp_path):
+    app = FastAPI()
+    app.include_router(profiling_routes.router)
+    client = TestClient(app)
+
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", None)
+    assert client.get("/admin/profiling/dumps").status_code == 404
+
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", TOKEN)
+    assert client.get("/admin/profiling/dumps", headers={"X-Profile": "nope"}).status_code == 403
+
+    path, samples = asyncio.run(profiling.capture_flame_graph(0.05, 0.001, output_dir=str(tmp_path)))
+    assert path.endswith(".folded") and samples > 0
+
+
+def test_spans_cover_hot_paths(monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry import trace
+
+    from app.api.routes.destiny import router as destiny_router
+
+    monkeypatch.setattr(tracing, "_enabled", False)
+    exporter = InMemorySpanExporter()
+    assert tracing.configure_tracing(exporter=exporter)
+
+    app = FastAPI()
+    app.include_router(destiny_router)
+    app.add_middleware(tracing.TracingMiddleware)
+    response = TestClient(app).post("/decode/full", json={
+        "first_name": "Ada", "other_names": "Lovelace",
+        "day_of_birth": 9, "month_of_birth": 5, "year_of_birth": 1990,
+    })
+    assert response.status_code == 200
+    trace.get_tracer_provider().force_flush()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    request_span = spans["POST /decode/full"]
+    assert request_span.attributes["http.status_code"] == 200
+    assert spans["calculate_destiny"].parent.span_id == request_span.context.span_id
+    assert spans["interpretation_lookup"].parent.span_id == request_span.context.span_id
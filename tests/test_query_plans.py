@@ -0,0 +1,65 @@
+"""
+Query-plan audit for hot routes: every query these handlers issue is run
+through EXPLAIN and the test fails on a full scan of a hot table.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.api.routes.notifications import get_notification_preferences, unregister_device_token
+from app.api.routes.profile import get_profile
+from app.api.routes.shares import get_share_stats, get_top_shared
+from app.api.routes.subscriptions import get_subscription_history
+from app.core.feature_gates import AuthContext, check_reading_limit
+from app.models.device import Device
+from app.models.notification_preference import NotificationPreference
+from app.models.reading import Reading
+from app.models.share_log import ShareLog
+from app.models.subscription_history import SubscriptionHistory, SubscriptionStatus
+from app.models.user import User
+from app.models.user_profile import UserProfile
+
+
+def _seed(db):
+    now = datetime.utcnow()
+    user = User(id="u1", email="u1@example.com", password_hash="x")
+    db.add(user)
+    db.add(Device(device_id="d1", user_id="u1", fcm_token="token-1"))
+    db.add(NotificationPreference(device_id="d1"))
+    db.add(UserProfile(id="p1", device_id="d1", user_id="u1", first_name="Ada", date_of_birth="1990-05-09"))
+    db.add(Reading(user_id="u1", full_data={}, created_at=now - timedelta(days=1)))
+    db.add(SubscriptionHistory(
+        user_id="u1", tier="premium", status=SubscriptionStatus.ACTIVE,
+        started_at=now, expires_at=now + timedelta(days=30), platform="android",
+    ))
+    db.add_all(
+        ShareLog(device_id="d1", life_seal_number=i % 9 + 1, platform="whatsapp", created_at=now - timedelta(days=i))
+        for i in range(20)
+    )
+    db.commit()
+    return user
+
+
+def test_hot_route_queries_use_indexes(db_session, query_plan_audit):
+    user = _seed(db_session)
+    query_plan_audit.statements.clear()  # only audit what the handlers issue
+
+    asyncio.run(get_share_stats(life_seal_number=None, days=30, db=db_session))
+    asyncio.run(get_share_stats(life_seal_number=3, days=30, db=db_session))
+    asyncio.run(get_top_shared(limit=10, days=30, db=db_session))
+    asyncio.run(get_profile(device_id="d1", db=db_session, auth=AuthContext.anonymous()))
+    asyncio.run(get_profile(user_id="u1", db=db_session, auth=AuthContext.anonymous()))
+    asyncio.run(get_subscription_history(db=db_session, current_user=user))
+    asyncio.run(get_notification_preferences(device_id="d1", db=db_session))
+    asyncio.run(unregister_device_token(fcm_token="token-1", db=db_session))
+    assert check_reading_limit(user, db_session) == (True, 2)
+
+    assert query_plan_audit.statements
+
+
+def test_auditor_flags_full_scans(db_session, query_plan_audit):
+    db_session.query(ShareLog).filter(ShareLog.platform.like("%app")).all()
+
+    scans = query_plan_audit.full_scans()
+    assert [detail for _statement, detail in scans] == ["SCAN share_logs"]
+    query_plan_audit.statements.clear()
@@ -0,0 +1,232 @@
+"""
+Tests for token-bucket rate limiting in app.core.rate_limit.
+"""
+
+import gc
+import os
+import runpy
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.api.routes.auth import create_jwt_token
+from app.core.rate_limit import (
+    MemoryTokenBucketStorage,
+    RateLimitMiddleware,
+    RedisTokenBucketStorage,
+    SQLiteTokenBucketStorage,
+    TokenBucketStorage,
+    parse_rate_limit,
+)
+from app.models.user import SubscriptionTier
+
+GUNICORN_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "gunicorn.conf.py")
+LIMITS = {"anonymous": "2/minute", "free": "3/minute", "premium": "5/minute", "pro": "10/minute"}
+
+
+def _storages(tmp_path):
+    yield MemoryTokenBucketStorage()
+    yield SQLiteTokenBucketStorage(str(tmp_path / "buckets.db"))
+    if os.getenv("REDIS_URL"):
+        pytest.importorskip("redis")
+        storage = RedisTokenBucketStorage(os.environ["REDIS_URL"], prefix="test-ratelimit:")
+        storage.reset()
+        yield storage
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit("100/minute").refill_rate == pytest.approx(100 / 60)
+    assert parse_rate_limit("5 per second").capacity == 5
+    with pytest.raises(ValueError):
+        parse_rate_limit("lots")
+
+
+def test_token_bucket_semantics(tmp_path):
+    limit = parse_rate_limit("3/second")
+    for storage in _storages(tmp_path):
+        now = 1_000.0
+        results = [storage.consume("k", limit, now=now) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert results[3].retry_after == pytest.approx(1 / 3)
+
+        # A third of a second refills exactly one token
+        assert storage.consume("k", limit, now=now + 1 / 3).allowed
+        assert not storage.consume("k", limit, now=now + 1 / 3).allowed
+        # Refill never exceeds capacity
+        assert storage.consume("k", limit, now=now + 60).remaining == 2
+
+
+def test_sqlite_buckets_are_shared_and_atomic(tmp_path):
+    path = str(tmp_path / "shared.db")
+    workers = [SQLiteTokenBucketStorage(path, timeout_ms=5000) for _ in range(4)]  # one per "worker"
+    limit = parse_rate_limit("100/hour")
+    allowed = []
+
+    def _hammer(storage):
+        for _ in range(50):
+            allowed.append(storage.consume("shared", limit, now=1_000.0).allowed)
+
+    threads = [threading.Thread(target=_hammer, args=(storage,)) for storage in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert allowed.count(True) == 100
+
+
+def test_sqlite_consume_latency(tmp_path):
+    storage = SQLiteTokenBucketStorage(str(tmp_path / "latency.db"))
+    limit = parse_rate_limit("1000/minute")
+
+    started = time.perf_counter()
+    for i in range(200):
+        storage.consume(f"k{i % 20}", limit)
+    assert (time.perf_counter() - started) / 200 < 0.005
+
+
+@pytest.fixture
+def limited_app():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    def _tier(user_id):
+        return SubscriptionTier.PREMIUM if user_id == "premium" else SubscriptionTier.FREE
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        storage=MemoryTokenBucketStorage(),
+        limits=LIMITS,
+        tier_resolver=_tier,
+        exempt_paths=("/health",),
+        enabled=True,
+    )
+    return app
+
+
+def _statuses(client, count, headers=None):
+    return [client.get("/ping", headers=headers).status_code for _ in range(count)]
+
+
+def test_limits_follow_subscription_tier(limited_app):
+    client = TestClient(limited_app)
+    premium = {"Authorization": f"Bearer {create_jwt_token('premium', 'p@example.com')}"}
+    free = {"Authorization": f"Bearer {create_jwt_token('free', 'f@example.com')}"}
+
+    assert _statuses(client, 3) == [200, 200, 429]
+    assert _statuses(client, 4, free) == [200, 200, 200, 429]
+    assert _statuses(client, 6, premium) == [200] * 5 + [429]
+
+
+def test_rate_limit_headers(limited_app):
+    client = TestClient(limited_app)
+
+    ok = client.get("/ping")
+    assert ok.headers["X-RateLimit-Limit"] == "2"
+    assert ok.headers["X-RateLimit-Remaining"] == "1"
+
+    client.get("/ping")
+    limited = client.get("/ping")
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) == 30
+    assert limited.headers["X-RateLimit-Remaining"] == "0"
+
+    assert client.get("/health").status_code == 200  # exempt
+
+
+def test_anonymous_clients_behind_a_trusted_proxy_get_their_own_buckets(limited_app):
+    # What UvicornWorker wraps the app in, with gunicorn's forwarded_allow_ips
+    behind_proxy = TestClient(ProxyHeadersMiddleware(limited_app, trusted_hosts="testclient"))
+
+    assert _statuses(behind_proxy, 3, {"X-Forwarded-For": "203.0.113.1"}) == [200, 200, 429]
+    assert _statuses(behind_proxy, 2, {"X-Forwarded-For": "203.0.113.2"}) == [200, 200]
+
+    # An untrusted peer's header is ignored: it is limited by its own address
+    untrusted = TestClient(ProxyHeadersMiddleware(limited_app, trusted_hosts="10.0.0.1"))
+    assert _statuses(untrusted, 1, {"X-Forwarded-For": "203.0.113.3"}) == [200]
+    assert _statuses(untrusted, 2, {"X-Forwarded-For": "203.0.113.4"}) == [200, 429]
+
+
+def _from_peer(app, host):
+    """The app as reached from `host` (TestClient always connects as "testclient")."""
+    async def _app(scope, receive, send):
+        await app({**scope, "client": (host, 50000)}, receive, send)
+
+    return _app
+
+
+def test_spoofed_forwarded_for_stays_in_one_bucket_with_default_config(limited_app, monkeypatch):
+    # The config exports PROMETHEUS_MULTIPROC_DIR; keep that out of this process
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    monkeypatch.delenv("FORWARDED_ALLOW_IPS", raising=False)
+    monkeypatch.setenv("DESTINY_METRICS_DIR_READY", "1")  # leave the metrics dir alone
+    try:
+        trusted = runpy.run_path(GUNICORN_CONFIG)["forwarded_allow_ips"]
+    finally:
+        gc.enable()
+
+    # Through a local proxy appending the real address after whatever the client sent
+    via_local_proxy = TestClient(_from_peer(ProxyHeadersMiddleware(limited_app, trusted_hosts=trusted), "127.0.0.1"))
+    spoofed = [{"X-Forwarded-For": f"10.0.0.{i}, 198.51.100.7"} for i in range(3)]
+    assert [via_local_proxy.get("/ping", headers=headers).status_code for headers in spoofed] == [200, 200, 429]
+
+    # Straight from the client: the header is ignored
+    direct = TestClient(_from_peer(ProxyHeadersMiddleware(limited_app, trusted_hosts=trusted), "198.51.100.8"))
+    spoofed = [{"X-Forwarded-For": f"10.0.1.{i}"} for i in range(3)]
+    assert [direct.get("/ping", headers=headers).status_code for headers in spoofed] == [200, 200, 429]
+
+
+def test_proxy_hops_use_the_address_the_proxy_appended():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware, storage=MemoryTokenBucketStorage(), limits=LIMITS, enabled=True, proxy_hops=1,
+    )
+    # Even if every peer is trusted, the leftmost (client-written) entries never pick the bucket
+    client = TestClient(ProxyHeadersMiddleware(app, trusted_hosts="*"))
+
+    spoofed = [{"X-Forwarded-For": f"10.0.0.{i}, 198.51.100.7"} for i in range(3)]
+    assert [client.get("/ping", headers=headers).status_code for headers in spoofed] == [200, 200, 429]
+    assert _statuses(client, 1, {"X-Forwarded-For": "198.51.100.9"}) == [200]
+
+
+def test_storage_missing_a_method_fails_on_creation():
+    class NoReset(TokenBucketStorage):
+        def consume(self, key, limit, cost=1, now=None):
+            return None
+
+    with pytest.raises(TypeError):
+        NoReset()
+
+
+def test_storage_errors_fail_open():
+    class BrokenStorage(MemoryTokenBucketStorage):
+        def consume(self, *args, **kwargs):
+            raise RuntimeError("storage down")
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, storage=BrokenStorage(), limits=LIMITS, enabled=True)
+    client = TestClient(app)
+
+    assert _statuses(client, 5) == [200] * 5
@@ -0,0 +1,268 @@
+"""
+Tests for async receipt validation against a local stub of Apple's
+verifyReceipt endpoints.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.services.receipt_validation_service import (
+    CircuitBreaker,
+    ReceiptValidationCache,
+    ReceiptValidationService,
+    ReceiptValidationUnavailable,
+    receipt_cache_key,
+)
+
+FUTURE_MS = str(int((time.time() + 30 * 86400) * 1000))
+VALID_RECEIPT = {
+    "status": 0,
+    "latest_receipt_info": [{
+        "transaction_id": "t1",
+        "original_transaction_id": "t1",
+        "product_id": "destiny_decoder_premium_monthly",
+        "purchase_date_ms": str(int(time.time() * 1000)),
+        "expires_date_ms": FUTURE_MS,
+    }],
+}
+
+
+class StubStore:
+    """Serves canned responses per path and records which client ports connected."""
+
+    def __init__(self):
+        self.responses = {}  # path -> (http status, body, delay seconds)
+        self.requests = []
+        self.client_ports = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append(self.path)
+                stub.client_ports.add(self.client_address[1])
+                code, body, delay = stub.responses[self.path]
+                time.sleep(delay)
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            def handle_error(self, request, client_address):
+                pass  # clients hang up on timed-out and cancelled requests
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def respond(self, path, body, code=200, delay=0.0):
+        self.responses[path] = (code, body, delay)
+
+
+@pytest.fixture
+def stub_store():
+    stub = StubStore()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def _validate(stub, receipt="abc", timeout=2.0, **kwargs):
+    async def _run():
+        service = ReceiptValidationService(
+            apple_production_url=f"{stub.url}/production",
+            apple_sandbox_url=f"{stub.url}/sandbox",
+            client=httpx.AsyncClient(timeout=timeout),
+            **kwargs,
+        )
+        try:
+            return await service.validate_apple_receipt(receipt)
+        finally:
+            await service.aclose()
+    return asyncio.run(_run())
+
+
+def test_production_receipt(stub_store):
+    stub_store.respond("/production", VALID_RECEIPT)
+    stub_store.respond("/sandbox", {"status": 21008}, delay=1.0)
+
+    started = time.perf_counter()
+    result = _validate(stub_store)
+
+    assert result["valid"] and result["is_active"]
+    assert result["transaction_id"] == "t1"
+    # The slower sandbox request is cancelled, not waited for
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_sandbox_receipt_uses_sandbox_response(stub_store, concurrent):
+    stub_store.respond("/production", {"status": 21007}, delay=0.3)
+    stub_store.respond("/sandbox", VALID_RECEIPT, delay=0.3)
+
+    started = time.perf_counter()
+    result = _validate(stub_store, concurrent_sandbox=concurrent)
+    elapsed = time.perf_counter() - started
+
+    assert result["valid"]
+    assert sorted(stub_store.requests) == ["/production", "/sandbox"]
+    if concurrent:
+        assert elapsed < 0.55  # one round trip, not two
+
+
+def test_connections_are_reused(stub_store):
+    stub_store.respond("/production", VALID_RECEIPT)
+
+    async def _run():
+        service = ReceiptValidationService(
+            apple_production_url=f"{stub_store.url}/production",
+            apple_sandbox_url=f"{stub_store.url}/sandbox",
+            concurrent_sandbox=False,
+        )
+        try:
+            for _ in range(5):
+                assert (await service.validate_apple_receipt("abc"))["valid"]
+        finally:
+            await service.aclose()
+
+    asyncio.run(_run())
+    assert len(stub_store.requests) == 5
+    assert len(stub_store.client_ports) == 1
+
+
+def test_timeout_raises_unavailable(stub_store):
+    stub_store.respond("/production", VALID_RECEIPT, delay=0.5)
+
+    with pytest.raises(ReceiptValidationUnavailable):
+        _validate(stub_store, timeout=0.1, concurrent_sandbox=False)
+
+
+def test_circuit_opens_after_repeated_failures(stub_store):
+    stub_store.respond("/production", {"error": "down"}, code=503)
+
+    async def _run():
+        service = ReceiptValidationService(
+            apple_production_url=f"{stub_store.url}/production",
+            apple_sandbox_url=f"{stub_store.url}/sandbox",
+            client=httpx.AsyncClient(),
+            concurrent_sandbox=False,
+        )
+        service.breakers["apple_production"] = CircuitBreaker("apple_production", failure_threshold=2, reset_timeout=60)
+        try:
+            for _ in range(4):
+                with pytest.raises(ReceiptValidationUnavailable):
+                    await service.validate_apple_receipt("abc")
+        finally:
+            await service.aclose()
+        return service.breakers["apple_production"].state
+
+    assert asyncio.run(_run()) == "open"
+    assert len(stub_store.requests) == 2  # later calls failed fast
+
+
+def test_half_open_breaker_closes_on_success():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+
+    breaker.before_call()
+    with pytest.raises(ReceiptValidationUnavailable):
+        breaker.before_call()  # only one trial call at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def _service(stub):
+    return ReceiptValidationService(
+        apple_production_url=f"{stub.url}/production",
+        apple_sandbox_url=f"{stub.url}/sandbox",
+        client=httpx.AsyncClient(timeout=2.0),
+        concurrent_sandbox=False,
+    )
+
+
+def test_repeat_validations_are_cached(stub_store):
+    stub_store.respond("/production", VALID_RECEIPT)
+
+    async def _run():
+        service = _service(stub_store)
+        try:
+            results = [await service.validate_receipt("ios", "abc", "premium") for _ in range(3)]
+        finally:
+            await service.aclose()
+        return service, results
+
+    service, results = asyncio.run(_run())
+    assert all(result["valid"] for result in results)
+    assert stub_store.requests == ["/production"]
+    assert service.cache.hits == 2
+
+
+def test_concurrent_identical_validations_share_one_call(stub_store):
+    stub_store.respond("/production", VALID_RECEIPT, delay=0.2)
+
+    async def _run():
+        service = _service(stub_store)
+        try:
+            results = await asyncio.gather(*(
+                service.validate_receipt("ios", "abc", "premium") for _ in range(10)
+            ))
+        finally:
+            await service.aclose()
+        return service, results
+
+    service, results = asyncio.run(_run())
+    assert all(result["transaction_id"] == "t1" for result in results)
+    assert stub_store.requests == ["/production"]
+    assert service.deduplicated == 9
+
+
+def test_store_outages_are_not_cached(stub_store):
+    stub_store.respond("/production", {"error": "down"}, code=503)
+
+    async def _run():
+        service = _service(stub_store)
+        try:
+            with pytest.raises(ReceiptValidationUnavailable):
+                await service.validate_receipt("ios", "abc", "premium")
+            stub_store.respond("/production", VALID_RECEIPT)
+            return await service.validate_receipt("ios", "abc", "premium")
+        finally:
+            await service.aclose()
+
+    assert asyncio.run(_run())["valid"]
+    assert len(stub_store.requests) == 2
+
+
+def test_cache_ttl_bounded_by_expiry():
+    cache = ReceiptValidationCache(ttl_seconds=900, negative_ttl_seconds=30)
+    soon = {"valid": True, "is_active": True, "expires_date": datetime.utcnow() + timedelta(seconds=60)}
+    later = {"valid": True, "is_active": True, "expires_date": datetime.utcnow() + timedelta(days=30)}
+
+    assert 0 < cache.ttl_for(soon) <= 60
+    assert cache.ttl_for(later) == 900
+    assert cache.ttl_for({"valid": False}) == 30
+    assert cache.ttl_for({"valid": True, "is_active": False}) == 30
+
+
+def test_google_receipts_keyed_by_purchase_token():
+    compact = json.dumps({"purchaseToken": "tok", "orderId": "o1"})
+    spaced = json.dumps({"orderId": "o1", "purchaseToken": "tok"}, indent=2)
+
+    assert receipt_cache_key("android", compact, "p") == receipt_cache_key("android", spaced, "p")
+    assert receipt_cache_key("ios", "abc", "p") != receipt_cache_key("ios", "abd", "p")
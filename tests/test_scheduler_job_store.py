@@ -0,0 +1,183 @@
+"""
+Tests for the persistent scheduler job store: run history, (job, date)
+run keys, and catching up a run that fell due while no leader was up.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import notification_scheduler
+from app.services.job_run_service import get_recent_job_runs, start_job_run
+from app.services.notification_scheduler import NotificationScheduler
+
+
+def _scheduler():
+    return NotificationScheduler(leader_election=False, job_store="database")
+
+
+async def _wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+def test_run_key_is_claimed_once(db_session):
+    assert start_job_run("daily_insights", run_key="daily_insights:2026-10-19") is not None
+    assert start_job_run("daily_insights", run_key="daily_insights:2026-10-19") is None
+    # Jobs without a key may always run again
+    assert start_job_run("daily_precompute") is not None
+    assert start_job_run("daily_precompute") is not None
+
+
+def test_jobs_persist_across_restarts(db_session):
+    async def _run():
+        first = _scheduler()
+        await first.start()
+        first.scheduler.modify_job("daily_insights", next_run_time=datetime.now().astimezone() + timedelta(days=3))
+        await first.stop()
+
+        second = _scheduler()
+        await second.start()
+        job = second.scheduler.get_job("daily_insights")
+        status = second.get_job_status()
+        await second.stop()
+        return job, status
+
+    job, status = asyncio.run(_run())
+    # Kept as stored, not rescheduled from now
+    assert job.next_run_time - datetime.now().astimezone() > timedelta(days=2)
+    assert job.misfire_grace_time == 3 * 3600
+    assert status["total_jobs"] == 8
+
+
+def test_missed_run_is_caught_up_once(db_session, monkeypatch):
+    sent = []
+
+    async def _send_daily_insights(self):
+        sent.append(self)
+
+    monkeypatch.setattr(NotificationScheduler, "_send_daily_insights", _send_daily_insights)
+
+    async def _down_through_six():
+        scheduler = _scheduler()
+        await scheduler.start()
+        # The 06:00 run fell due half an hour ago, while this leader was down
+        scheduler.scheduler.pause()
+        scheduler.scheduler.modify_job("daily_insights", next_run_time=datetime.now().astimezone() - timedelta(minutes=30))
+        await scheduler.stop()
+
+    async def _restart():
+        scheduler = _scheduler()
+        await scheduler.start()
+        await _wait_for(lambda: any(
+            run["status"] != "running" for run in get_recent_job_runs(db_session, job_id="daily_insights")
+        ))
+        await scheduler.stop()
+
+    asyncio.run(_down_through_six())
+    asyncio.run(_restart())
+    assert len(sent) == 1
+
+    # Another leader catching up the same run finds its key claimed
+    asyncio.run(_down_through_six())
+    asyncio.run(_restart())
+    assert len(sent) == 1
+
+    runs = get_recent_job_runs(db_session, job_id="daily_insights")
+    assert [run["status"] for run in runs] == ["success"]
+    assert runs[0]["run_key"].startswith("daily_insights:")
+    assert runs[0]["duration_ms"] is not None and runs[0]["worker"]
+
+
+def test_run_outside_misfire_grace_is_recorded_missed(db_session, monkeypatch):
+    sent = []
+
+    async def _send_daily_insights(self):
+        sent.append(self)
+
+    monkeypatch.setattr(NotificationScheduler, "_send_daily_insights", _send_daily_insights)
+
+    async def _run():
+        scheduler = _scheduler()
+        await scheduler.start()
+        scheduler.scheduler.pause()
+        scheduler.scheduler.modify_job("daily_insights", next_run_time=datetime.now().astimezone() - timedelta(hours=5))
+        await scheduler.stop()
+
+        scheduler = _scheduler()
+        await scheduler.start()
+        await _wait_for(lambda: get_recent_job_runs(db_session, job_id="daily_insights"))
+        await scheduler.stop()
+
+    asyncio.run(_run())
+    assert sent == []
+    assert [run["status"] for run in get_recent_job_runs(db_session, job_id="daily_insights")] == ["missed"]
+
+
+def test_failed_run_is_recorded(db_session, monkeypatch):
+    async def _run_daily_precompute(self):
+        raise RuntimeError("store unavailable")
+
+    monkeypatch.setattr(NotificationScheduler, "_run_daily_precompute", _run_daily_precompute)
+
+    async def _run():
+        scheduler = _scheduler()
+        await scheduler.start()
+        scheduler.scheduler.modify_job("daily_precompute", next_run_time=datetime.now().astimezone())
+        await _wait_for(lambda: any(
+            run["status"] != "running" for run in get_recent_job_runs(db_session, job_id="daily_precompute")
+        ))
+        await scheduler.stop()
+
+    asyncio.run(_run())
+    run = get_recent_job_runs(db_session, job_id="daily_precompute")[0]
+    assert run["status"] == "error" and "store unavailable" in run["error"]
+    assert run["run_key"] is None
+
+
+def test_failed_notification_run_releases_its_key(db_session, monkeypatch):
+    attempts = []
+
+    async def _send_daily_insights(self):
+        attempts.append(self)
+        if len(attempts) == 1:
+            raise RuntimeError("outbox unavailable")
+
+    monkeypatch.setattr(NotificationScheduler, "_send_daily_insights", _send_daily_insights)
+
+    async def _run():
+        scheduler = _scheduler()
+        await scheduler.start()
+        try:
+            with pytest.raises(RuntimeError):
+                await scheduler._run_job("daily_insights", scheduler._send_daily_insights, once_per_day=True)
+            # The key is free again: a later catch-up retries the run
+            await scheduler._run_job("daily_insights", scheduler._send_daily_insights, once_per_day=True)
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(_run())
+    runs = get_recent_job_runs(db_session, job_id="daily_insights")
+    assert [run["status"] for run in runs] == ["success", "error"]
+    assert runs[0]["run_key"].startswith("daily_insights:") and runs[1]["run_key"] is None
+    assert len(attempts) == 2
+
+
+def test_status_endpoint_includes_run_history(db_session, monkeypatch):
+    import main
+
+    start_job_run("daily_insights", run_key="daily_insights:2026-10-19")
+    start_job_run("daily_precompute")
+    monkeypatch.setattr(notification_scheduler, "_scheduler_instance", _scheduler())
+    client = TestClient(main.app)
+
+    body = client.get("/notifications/scheduler/status").json()
+    assert body["scheduler"]["role"] == "standby"
+    assert [run["job_id"] for run in body["recent_runs"]] == ["daily_precompute", "daily_insights"]
+
+    body = client.get("/notifications/scheduler/status", params={"job_id": "daily_insights", "limit": 5}).json()
+    assert [run["run_key"] for run in body["recent_runs"]] == ["daily_insights:2026-10-19"]
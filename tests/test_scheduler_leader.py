@@ -0,0 +1,105 @@
+"""
+Tests for scheduler leader election: one worker runs the jobs, another
+takes over when it dies.
+"""
+
+import asyncio
+import subprocess
+import sys
+import textwrap
+
+from app.services import notification_scheduler
+from app.services.notification_scheduler import NotificationScheduler
+from app.services.scheduler_leader import FileLock, LeaderElection
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "scheduler.lock")
+    first, second = FileLock(path), FileLock(path)
+
+    assert first.acquire()
+    assert not second.acquire()
+
+    first.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_lock_freed_when_holder_process_dies(tmp_path):
+    path = str(tmp_path / "scheduler.lock")
+    holder = subprocess.Popen(
+        [sys.executable, "-c", textwrap.dedent(f"""
+            import fcntl, os, sys, time
+            fd = os.open({path!r}, os.O_RDWR | os.O_CREAT)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            print("locked", flush=True)
+            time.sleep(60)
+        """)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        lock = FileLock(path)
+        assert not lock.acquire()
+    finally:
+        holder.kill()
+        holder.wait()
+
+    assert lock.acquire()
+    lock.release()
+
+
+def test_standby_takes_over_when_leader_stops(tmp_path):
+    path = str(tmp_path / "scheduler.lock")
+    events = []
+
+    def _election(name):
+        async def _elected():
+            events.append((name, "elected"))
+
+        async def _deposed():
+            events.append((name, "deposed"))
+
+        return LeaderElection(FileLock(path), _elected, _deposed, retry_seconds=60)
+
+    async def _run():
+        first, second = _election("first"), _election("second")
+        assert await first.start()
+        assert not await second.start()
+
+        await first.stop()
+        await second.campaign()
+        assert second.is_leader
+        await second.stop()
+
+    asyncio.run(_run())
+    assert events == [
+        ("first", "elected"),
+        ("first", "deposed"),
+        ("second", "elected"),
+        ("second", "deposed"),
+    ]
+
+
+def test_only_the_leader_schedules_jobs(tmp_path, monkeypatch):
+    path = str(tmp_path / "scheduler.lock")
+    monkeypatch.setattr(notification_scheduler, "create_leader_lock", lambda: FileLock(path))
+
+    async def _run():
+        leader, standby = NotificationScheduler(), NotificationScheduler()
+        await leader.start()
+        await standby.start()
+
+        assert leader.is_leader and leader.get_job_status()["total_jobs"] > 0
+        assert standby.is_running and not standby.is_leader
+        status = standby.get_job_status()
+        # Standbys report the leader's jobs from the shared job store
+        assert status["role"] == "standby"
+        assert status["jobs"] == leader.get_job_status()["jobs"]
+
+        await leader.stop()
+        await standby.election.campaign()
+        assert standby.is_leader and standby.get_job_status()["total_jobs"] > 0
+        await standby.stop()
+
+    asyncio.run(_run())
@@ -0,0 +1,62 @@
+"""
+Tests for users.effective_tier and the bulk subscription expiry sweeper.
+"""
+
+from datetime import datetime, timedelta
+
+from app.models.subscription_history import SubscriptionHistory, SubscriptionStatus
+from app.models.user import SubscriptionTier, User
+from app.services.subscription_service import SubscriptionService
+
+
+def _user(db, user_id, tier, expires):
+    user = User(id=user_id, email=f"{user_id}@example.com", password_hash="x")
+    user.set_subscription(tier, expires)
+    db.add(user)
+    db.add(SubscriptionHistory(
+        user_id=user_id, tier=tier.value, status=SubscriptionStatus.ACTIVE,
+        started_at=datetime.utcnow() - timedelta(days=30),
+        expires_at=expires or datetime.utcnow(), platform="ios",
+    ))
+    return user
+
+
+def test_set_subscription_tracks_effective_tier():
+    user = User(id="u", email="u@example.com", password_hash="x")
+
+    user.set_subscription(SubscriptionTier.PRO, datetime.utcnow() + timedelta(days=1))
+    assert user.effective_tier == SubscriptionTier.PRO
+    assert user.is_pro and user.is_premium
+
+    user.set_subscription(SubscriptionTier.PREMIUM, datetime.utcnow() - timedelta(days=1))
+    assert user.effective_tier == SubscriptionTier.FREE
+    assert not user.is_premium
+
+
+def test_sweeper_expires_lapsed_subscriptions_in_batches(db_session):
+    now = datetime.utcnow()
+    for i in range(5):
+        _user(db_session, f"lapsed-{i}", SubscriptionTier.PREMIUM, now + timedelta(days=1))
+    _user(db_session, "active", SubscriptionTier.PRO, now + timedelta(days=10))
+    db_session.commit()
+
+    stats = SubscriptionService.sweep_expired_subscriptions(
+        db_session, now=now + timedelta(days=2), batch_size=2
+    )
+
+    assert stats == {"users_expired": 5, "history_expired": 5}
+    db_session.expire_all()
+    tiers = dict(db_session.query(User.id, User.effective_tier).all())
+    assert tiers.pop("active") == SubscriptionTier.PRO
+    assert set(tiers.values()) == {SubscriptionTier.FREE}
+    statuses = dict(db_session.query(SubscriptionHistory.user_id, SubscriptionHistory.status).all())
+    assert statuses["active"] == SubscriptionStatus.ACTIVE
+    assert statuses["lapsed-0"] == SubscriptionStatus.EXPIRED
+
+    # Purchased tier is kept so gates can say "expired" rather than "upgrade"
+    lapsed = db_session.get(User, "lapsed-0")
+    assert lapsed.subscription_tier == SubscriptionTier.PREMIUM and not lapsed.is_premium
+
+    assert SubscriptionService.sweep_expired_subscriptions(db_session, now=now + timedelta(days=2)) == {
+        "users_expired": 0, "history_expired": 0,
+    }